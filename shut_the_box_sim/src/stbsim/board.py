@@ -1,6 +1,47 @@
+from collections.abc import Iterable
+from itertools import combinations
+
+# Tuple of tile numbers for each rack bitmask (bit n-1 set means tile n is up).
+_MASK_NUMBERS: dict[int, tuple[int, ...]] = {}
+# Valid combos per (rack bitmask, roll total), keyed by mask * 64 + total.
+_MASK_COMBOS: dict[int, tuple[tuple[int, ...], ...]] = {}
+
+
+def mask_numbers(mask: int) -> tuple[int, ...]:
+    """Return the (cached) ascending tile numbers encoded by a rack bitmask."""
+    numbers = _MASK_NUMBERS.get(mask)
+    if numbers is None:
+        numbers = tuple(n + 1 for n in range(mask.bit_length()) if mask >> n & 1)
+        _MASK_NUMBERS[mask] = numbers
+    return numbers
+
+
+def mask_combos(mask: int, total: int) -> tuple[tuple[int, ...], ...]:
+    """
+    Return the (cached) tile combos of a rack bitmask that sum to ``total``.
+
+    Combos are ordered by size, then lexicographically, as produced by
+    itertools.combinations over the ascending upright tiles.
+    """
+    key = mask * 64 + total
+    combos = _MASK_COMBOS.get(key)
+    if combos is None:
+        tiles = mask_numbers(mask)
+        combos = tuple(
+            combo
+            for r in range(1, len(tiles) + 1)
+            for combo in combinations(tiles, r)
+            if sum(combo) == total
+        )
+        _MASK_COMBOS[key] = combos
+    return combos
+
+
 class Tile:
     """One numbered tile, which can be upright (up) or flipped (down)."""
 
+    __slots__ = ("number", "is_upright")
+
     def __init__(self, number: int):
         self.number = number
         self.is_upright = True
@@ -16,30 +57,48 @@ class Tile:
 
 
 class Board:
-    """Holds all tiles for a single Shut the Box game."""
+    """
+    Holds all tiles for a single Shut the Box game.
+
+    Alongside the Tile objects the board keeps ``up_mask``, a bitmask of the
+    upright tiles (bit n-1 for tile n), so hot loops can read the rack state
+    without building lists. flip_tiles() and reset() keep both in sync.
+    """
+
+    __slots__ = ("tiles", "full_mask", "up_mask", "_tile_by_number")
 
     def __init__(self, max_tile_number: int = 9):
         self.tiles: list[Tile] = [Tile(n) for n in range(1, max_tile_number + 1)]
+        self._tile_by_number = {tile.number: tile for tile in self.tiles}
+        self.full_mask = (1 << max_tile_number) - 1
+        self.up_mask = self.full_mask
 
     def reset(self) -> None:
         for t in self.tiles:
             t.reset()
+        self.up_mask = self.full_mask
 
     def get_upright_tiles(self) -> list[Tile]:
         """Return a list of currently-up (unflipped) tiles."""
         return [t for t in self.tiles if t.is_upright]
 
+    def upright_numbers(self) -> tuple[int, ...]:
+        """Ascending numbers of the upright tiles (shared cached tuple)."""
+        return mask_numbers(self.up_mask)
+
     def are_all_tiles_down(self) -> bool:
         """True if all tiles have been flipped (shut)."""
-        return all(not t.is_upright for t in self.tiles)
+        return self.up_mask == 0
 
     def calculate_remaining_sum(self) -> int:
         """Sum of all upright (unflipped) tile numbers."""
-        return sum(t.number for t in self.get_upright_tiles())
+        return sum(mask_numbers(self.up_mask))
 
-    def flip_tiles(self, numbers: list[int]) -> None:
+    def flip_tiles(self, numbers: Iterable[int]) -> None:
         """Flips specified tiles by number, if currently upright (does not check validity here)."""
-        tile_dict = {tile.number: tile for tile in self.tiles}
+        tile_dict = self._tile_by_number
         for num in numbers:
-            if tile_dict[num].is_upright:
-                tile_dict[num].flip()
+            tile = tile_dict[num]
+            if tile.is_upright:
+                tile.flip()
+                self.up_mask &= ~(1 << (num - 1))
@@ -0,0 +1,252 @@
+"""
+Persistent, memory-mapped cache for precomputed artifacts.
+
+Precomputed tables (move tables, solver value tables, compiled policies) are
+stored once per machine under a user cache directory, keyed by artifact name,
+rule variant, board size, the artifact's format version (bumped by its builder
+whenever the stored arrays change meaning) and library version. Each entry is a directory of
+``.npy`` arrays plus a small ``meta.json``. Readers open the arrays with
+``np.load(mmap_mode="r")``, so every process maps the same physical pages
+read-only instead of rebuilding or copying them.
+
+The cache root is ``$STBSIM_CACHE_DIR`` if set, else ``$XDG_CACHE_HOME/stbsim``
+(``~/.cache/stbsim``), or ``%LOCALAPPDATA%\\stbsim\\Cache`` on Windows. Set
+``STBSIM_CACHE_DIR`` to an empty string to disable the cache.
+
+Example:
+    cache = ArtifactCache()
+    arrays = cache.get_or_build("solver", 9, partial(build_solver_arrays, 9))
+"""
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+from collections.abc import Callable
+from functools import partial
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, TypedDict
+
+import numpy as np
+
+from .rules import RuleVariant, rule_variant
+
+CACHE_ENV_VAR = "STBSIM_CACHE_DIR"
+DEFAULT_VARIANT = "standard"
+
+Arrays = dict[str, np.ndarray[Any, Any]]
+
+# ``builder(tiles, variant) -> arrays`` for a registered artifact.
+ArtifactBuilder = Callable[[int, RuleVariant | str | None], Arrays]
+
+
+def library_version() -> str:
+    """Installed stbsim version (part of every cache key)."""
+    try:
+        return version("stbsim")
+    except PackageNotFoundError:
+        return "0+unknown"
+
+
+def default_cache_dir() -> Path | None:
+    """Resolve the cache root from the environment (None if disabled)."""
+    configured = os.environ.get(CACHE_ENV_VAR)
+    if configured is not None:
+        return Path(configured) if configured else None
+    if sys.platform == "win32" and os.environ.get("LOCALAPPDATA"):
+        return Path(os.environ["LOCALAPPDATA"]) / "stbsim" / "Cache"
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    base = Path(xdg) if xdg else Path.home() / ".cache"
+    return base / "stbsim"
+
+
+class EntryInfo(TypedDict):
+    """Metadata stored with each cache entry.
+
+    Fields:
+        - key: Directory name of the entry
+        - name: Artifact name (e.g. "solver")
+        - variant: Rule variant name
+        - tiles: Board size
+        - format: Format version of the artifact (see register_artifact())
+        - version: stbsim version that built the entry
+        - arrays: Names of the stored arrays
+        - nbytes: Total size of the stored arrays
+    """
+
+    key: str
+    name: str
+    variant: str
+    tiles: int
+    format: int
+    version: str
+    arrays: list[str]
+    nbytes: int
+
+
+class ArtifactCache:
+    """
+    Versioned on-disk store of named array bundles.
+
+    Args:
+        root: Cache directory; defaults to default_cache_dir(). None disables
+            persistence (get() misses and put() is a no-op).
+    """
+
+    def __init__(self, root: str | os.PathLike[str] | None = None):
+        self.root = Path(root) if root is not None else default_cache_dir()
+
+    @staticmethod
+    def key(name: str, tiles: int, variant: str = DEFAULT_VARIANT) -> str:
+        """Directory name for an artifact of this format and library version."""
+        return f"{name}-{variant}-{tiles}-f{artifact_format(name)}-v{library_version()}"
+
+    def path(self, name: str, tiles: int, variant: str = DEFAULT_VARIANT) -> Path:
+        if self.root is None:
+            raise ValueError("Artifact cache is disabled")
+        return self.root / self.key(name, tiles, variant)
+
+    def get(
+        self, name: str, tiles: int, variant: str = DEFAULT_VARIANT
+    ) -> Arrays | None:
+        """Memory-map a cached artifact read-only, or None on a miss."""
+        if self.root is None:
+            return None
+        entry = self.path(name, tiles, variant)
+        meta_path = entry / "meta.json"
+        if not meta_path.exists():
+            return None
+        meta: EntryInfo = json.loads(meta_path.read_text())
+        if meta.get("format") != artifact_format(name):
+            return None
+        return {a: np.load(entry / f"{a}.npy", mmap_mode="r") for a in meta["arrays"]}
+
+    def put(
+        self, name: str, tiles: int, arrays: Arrays, variant: str = DEFAULT_VARIANT
+    ) -> Path | None:
+        """
+        Store an artifact atomically; concurrent writers of the same key are
+        harmless since the first completed entry wins.
+        """
+        if self.root is None:
+            return None
+        entry = self.path(name, tiles, variant)
+        if (entry / "meta.json").exists():
+            return entry
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=f".{entry.name}-", dir=self.root))
+        try:
+            for array_name, arr in arrays.items():
+                np.save(tmp / f"{array_name}.npy", np.ascontiguousarray(arr))
+            meta = EntryInfo(
+                key=entry.name,
+                name=name,
+                variant=variant,
+                tiles=tiles,
+                format=artifact_format(name),
+                version=library_version(),
+                arrays=list(arrays),
+                nbytes=int(sum(a.nbytes for a in arrays.values())),
+            )
+            (tmp / "meta.json").write_text(json.dumps(meta))
+            os.replace(tmp, entry)
+        except OSError:
+            # Another process won the race (or the disk is read-only).
+            shutil.rmtree(tmp, ignore_errors=True)
+            if not (entry / "meta.json").exists():
+                raise
+        return entry
+
+    def get_or_build(
+        self,
+        name: str,
+        tiles: int,
+        build: Callable[[], Arrays],
+        variant: str = DEFAULT_VARIANT,
+    ) -> Arrays:
+        """Return the cached artifact, building and storing it on a miss."""
+        cached = self.get(name, tiles, variant)
+        if cached is not None:
+            return cached
+        arrays = build()
+        try:
+            entry = self.put(name, tiles, arrays, variant)
+        except OSError:
+            return arrays  # Unwritable cache: fall back to the in-memory build.
+        if entry is None:
+            return arrays
+        cached = self.get(name, tiles, variant)
+        return cached if cached is not None else arrays
+
+    def entries(self) -> list[EntryInfo]:
+        """Metadata of every cached artifact, sorted by key."""
+        if self.root is None or not self.root.exists():
+            return []
+        found = []
+        for meta_path in sorted(self.root.glob("*/meta.json")):
+            meta: EntryInfo = json.loads(meta_path.read_text())
+            found.append(meta)
+        return found
+
+    def clear(self, name: str | None = None) -> int:
+        """Delete cached artifacts (all, or those named ``name``); return count."""
+        removed = 0
+        for meta in self.entries():
+            if name is None or meta["name"] == name:
+                assert self.root is not None
+                shutil.rmtree(self.root / meta["key"], ignore_errors=True)
+                removed += 1
+        return removed
+
+
+# Builders for the artifacts `stbsim cache warm` knows how to produce.
+ARTIFACT_BUILDERS: dict[str, ArtifactBuilder] = {}
+
+# Format version of each registered artifact (0 for unregistered names).
+ARTIFACT_FORMATS: dict[str, int] = {}
+
+
+def artifact_format(name: str) -> int:
+    """Format version cache entries named ``name`` are stored and looked up with."""
+    return ARTIFACT_FORMATS.get(name, 0)
+
+
+def register_artifact(
+    name: str, format_version: int
+) -> Callable[[ArtifactBuilder], ArtifactBuilder]:
+    """
+    Decorator registering ``builder(tiles, variant) -> arrays`` under ``name``. Bump
+    ``format_version`` whenever the stored arrays change shape, type or
+    meaning, so entries built by older code are never served.
+    """
+
+    def decorator(builder: ArtifactBuilder) -> ArtifactBuilder:
+        ARTIFACT_BUILDERS[name] = builder
+        ARTIFACT_FORMATS[name] = format_version
+        return builder
+
+    return decorator
+
+
+def warm(
+    tiles: int,
+    cache: ArtifactCache | None = None,
+    variant: RuleVariant | str | None = None,
+) -> list[str]:
+    """
+    Build every registered artifact for ``tiles`` under a rule variant
+    (default standard) that is not cached yet, under the same keys solve()
+    and load_policy() look up.
+    """
+    cache = cache if cache is not None else ArtifactCache()
+    rules = rule_variant(variant)
+    warmed = []
+    for name, builder in ARTIFACT_BUILDERS.items():
+        if cache.get(name, tiles, rules.cache_key) is None:
+            cache.get_or_build(
+                name, tiles, partial(builder, tiles, rules), variant=rules.cache_key
+            )
+            warmed.append(name)
+    return warmed
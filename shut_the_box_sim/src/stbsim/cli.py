@@ -3,21 +3,51 @@ stbsim CLI for Shut the Box batch simulations.
 
 Entrypoint: python -m stbsim.cli --help or uv run python -m stbsim.cli --n-games ...
 Allows bulk parameterized games, stats, and reproducibility.
+Subcommands: `cache` (list, warm, clear precomputed tables), `train` (self-play learning curve),
+`search` (successive-halving search over weighted strategies).
 """
 
+from contextlib import ExitStack
+
+import pandas as pd
 import typer
 from tqdm import tqdm
 
+from stbsim.cache import ArtifactCache, warm
+from stbsim.learning import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_TRAINING_GAMES,
+    TrainingReport,
+    train_policy,
+)
+from stbsim.progress import (
+    DEFAULT_REPORT_EVERY,
+    ProgressCallback,
+    ProgressReport,
+    fan_out,
+    json_lines_writer,
+)
+from stbsim.rules import RULE_VARIANTS
+from stbsim.search import (
+    register_weighted_strategy,
+    sample_weights,
+    successive_halving,
+)
 from stbsim.simulation import Simulation
 from stbsim.stats import calculate_summary_stats
 from stbsim.strategies import STRATEGY_MAP
 
 app = typer.Typer()
+cache_app = typer.Typer(help="Manage the cache of precomputed tables.")
+app.add_typer(cache_app, name="cache")
 
 
-@app.command()
+@app.callback(invoke_without_command=True)
 def run(
-    n_games: int = typer.Option(..., "--n-games", help="Number of games to simulate."),
+    ctx: typer.Context,
+    n_games: int | None = typer.Option(
+        None, "--n-games", help="Number of games to simulate."
+    ),
     p1_strategy: str = typer.Option(
         "greedy_max",
         "--p1-strategy",
@@ -34,6 +64,24 @@ def run(
         "--output-file",
         help="Output detailed log to CSV/Parquet (not implemented).",
     ),
+    progress_file: str | None = typer.Option(
+        None,
+        "--progress-file",
+        help="Append progress reports to this file as JSON lines.",
+    ),
+    progress_every: int = typer.Option(
+        DEFAULT_REPORT_EVERY, "--progress-every", help="Games between progress reports."
+    ),
+    workers: int = typer.Option(
+        1,
+        "--workers",
+        help="Worker threads (0: one per CPU on a free-threaded build, else 1).",
+    ),
+    variant: str = typer.Option(
+        "standard",
+        "--variant",
+        help=f"House rules. Options: {list(RULE_VARIANTS.keys())}",
+    ),
 ) -> None:
     """
     Run and summarize bulk Shut the Box simulations.
@@ -44,11 +92,20 @@ def run(
         p2_strategy: Strategy for Player 2
         seed: Optional random seed for reproducibility
         output_file: If specified, save detailed logs to CSV/Parquet (future)
+        progress_file: If specified, stream progress reports there as JSON lines
+        progress_every: Games between progress reports
+        workers: Worker threads to simulate on (0 picks a default)
+        variant: House-rule variant (see rules.RULE_VARIANTS)
 
     Example:
         uv run python -m stbsim.cli --n-games 100 \\
             --p1-strategy greedy_max --p2-strategy min_tiles --seed 42
     """
+    if ctx.invoked_subcommand is not None:
+        return
+    if n_games is None:
+        typer.echo("Missing option '--n-games'.")
+        raise typer.Exit(2)
     if p1_strategy not in STRATEGY_MAP:
         typer.echo(
             f"Unknown p1-strategy: {p1_strategy}. "
@@ -61,20 +118,42 @@ def run(
             f"Available: {list(STRATEGY_MAP.keys())}"
         )
         raise typer.Exit(1)
+    if variant not in RULE_VARIANTS:
+        typer.echo(
+            f"Unknown variant: {variant}. Available: {list(RULE_VARIANTS.keys())}"
+        )
+        raise typer.Exit(1)
 
     typer.echo(f"Simulating {n_games} games: P1({p1_strategy}) vs P2({p2_strategy})")
     if seed is not None:
         typer.echo(f"Using random seed: {seed}")
+    if variant != "standard":
+        typer.echo(f"Rule variant: {variant}")
 
     sim = Simulation()
-    summaries = []
-    for _ in tqdm(range(n_games), desc="Simulating"):
-        # For now, Simulation.run expects to be told n_games at once; let's just run once
-        # ...so single Simulation.run call outside tqdm is preferable for batching:
-        pass
+    with ExitStack() as stack:
+        bar = stack.enter_context(tqdm(total=n_games, desc="Simulating", unit="game"))
 
-    # Actually use single Simulation.run call for batch efficiency
-    summaries = sim.run(n_games, p1_strategy, p2_strategy, seed_start=seed)
+        def show(report: ProgressReport) -> None:
+            bar.update(report["games_completed"] - bar.n)
+            bar.set_postfix(
+                rate=f"{report['moving_avg_games_per_sec']:,.0f}/s", refresh=False
+            )
+
+        callback: ProgressCallback = show
+        if progress_file:
+            stream = stack.enter_context(open(progress_file, "a", encoding="utf-8"))
+            callback = fan_out(show, json_lines_writer(stream))
+        summaries = sim.run(
+            n_games,
+            p1_strategy,
+            p2_strategy,
+            seed_start=seed,
+            progress=callback,
+            progress_every=progress_every,
+            workers=workers or None,
+            variant=variant,
+        )
 
     stats = calculate_summary_stats(summaries)
     typer.echo("==== Summary Stats ====")
@@ -86,5 +165,131 @@ def run(
         # See: logger/events upgrade in Game/TurnManager for detailed event exports.
 
 
+@app.command("train")
+def train(
+    tiles: int = typer.Option(9, "--tiles", help="Board size to learn."),
+    n_games: int = typer.Option(
+        DEFAULT_TRAINING_GAMES, "--n-games", help="Self-play games to train on."
+    ),
+    batch_size: int = typer.Option(
+        DEFAULT_BATCH_SIZE, "--batch-size", help="Games played per update."
+    ),
+    seed: int | None = typer.Option(None, "--seed", help="Random seed (optional)."),
+    variant: str = typer.Option(
+        "standard",
+        "--variant",
+        help=f"House rules. Options: {list(RULE_VARIANTS.keys())}",
+    ),
+) -> None:
+    """Learn a policy by batched self-play and print its learning curve."""
+    if variant not in RULE_VARIANTS:
+        typer.echo(
+            f"Unknown variant: {variant}. Available: {list(RULE_VARIANTS.keys())}"
+        )
+        raise typer.Exit(1)
+
+    def show(report: TrainingReport) -> None:
+        typer.echo(
+            f"{report['games']:>10,} games  mean score {report['mean_score']:6.3f}  "
+            f"shut {report['shut_box_rate']:.3f}  eps {report['epsilon']:.3f}  "
+            f"{report['elapsed_seconds']:.2f}s"
+        )
+
+    train_policy(tiles, n_games, batch_size, seed=seed, callback=show, variant=variant)
+
+
+@app.command("search")
+def search(
+    candidates: int = typer.Option(
+        64, "--candidates", help="Weighted strategies to sample."
+    ),
+    opponent: str = typer.Option(
+        "min_tiles",
+        "--opponent",
+        help=f"Strategy to beat. Options: {list(STRATEGY_MAP.keys())}",
+    ),
+    budget: int = typer.Option(
+        200_000, "--budget", help="Total games over all rounds."
+    ),
+    keep: int = typer.Option(1, "--keep", help="Survivors to stop at."),
+    seed: int | None = typer.Option(None, "--seed", help="Random seed (optional)."),
+    workers: int = typer.Option(
+        1, "--workers", help="Threads evaluating a round's candidates."
+    ),
+) -> None:
+    """Search weighted strategies for the best win rate against an opponent."""
+    if opponent not in STRATEGY_MAP:
+        typer.echo(
+            f"Unknown opponent: {opponent}. Available: {list(STRATEGY_MAP.keys())}"
+        )
+        raise typer.Exit(1)
+    names = [register_weighted_strategy(w) for w in sample_weights(candidates, seed)]
+
+    def show(round_idx: int, standings: pd.DataFrame) -> None:
+        typer.echo(
+            f"round {round_idx}: {int(standings['survivor'].sum())} survivors, "
+            f"{int(standings['games'].sum()):,} games"
+        )
+
+    results = successive_halving(
+        names,
+        opponent,
+        budget=budget,
+        keep=keep,
+        seed=seed,
+        workers=workers,
+        callback=show,
+    )
+    typer.echo(f"==== Survivors vs {opponent} ====")
+    for name, row in results[results["survivor"]].iterrows():
+        typer.echo(
+            f"{name}: win rate {row['win_rate']:.4f} "
+            f"[{row['ci_low']:.4f}, {row['ci_high']:.4f}] "
+            f"over {int(row['games']):,} games"
+        )
+
+
+@cache_app.command("list")
+def cache_list() -> None:
+    """List cached artifacts."""
+    cache = ArtifactCache()
+    typer.echo(f"Cache directory: {cache.root}")
+    for entry in cache.entries():
+        typer.echo(
+            f"{entry['key']}: {', '.join(entry['arrays'])} "
+            f"({entry['nbytes'] / 1024:.1f} KiB)"
+        )
+
+
+@cache_app.command("warm")
+def cache_warm(
+    tiles: int = typer.Option(9, "--tiles", help="Board size to precompute."),
+    variant: str = typer.Option(
+        "standard",
+        "--variant",
+        help=f"House rules. Options: {list(RULE_VARIANTS.keys())}",
+    ),
+) -> None:
+    """Precompute and store every known artifact for a board size and variant."""
+    if variant not in RULE_VARIANTS:
+        typer.echo(
+            f"Unknown variant: {variant}. Available: {list(RULE_VARIANTS.keys())}"
+        )
+        raise typer.Exit(1)
+    built = warm(tiles, variant=variant)
+    typer.echo(f"Built: {', '.join(built)}" if built else "Already warm.")
+
+
+@cache_app.command("clear")
+def cache_clear(
+    name: str | None = typer.Option(
+        None, "--name", help="Only clear artifacts with this name."
+    ),
+) -> None:
+    """Delete cached artifacts."""
+    removed = ArtifactCache().clear(name)
+    typer.echo(f"Removed {removed} cache entr{'y' if removed == 1 else 'ies'}.")
+
+
 if __name__ == "__main__":
     app()
@@ -1,5 +1,7 @@
 from typing import Any
 
+from .rules import RuleVariant, rule_variant
+
 
 class TileRack:
     """
@@ -26,11 +28,16 @@ class TileRack:
         tile_set = set(combo)
         return tile_set <= self.tiles_up and sum(combo) == roll_total
 
-    def score(self) -> int:
+    def score(self, variant: RuleVariant | str | None = None) -> int:
         """
-        Compute the player's (bad) score: sum of all remaining up tiles.
+        Compute the player's (bad) score: sum of all remaining up tiles, or the
+        score of the rack under a house-rule variant (see rules.py).
         """
-        return sum(self.tiles_up)
+        if variant is None:
+            return sum(self.tiles_up)
+        mask = sum(1 << (tile - 1) for tile in self.tiles_up)
+        tiles = max(9, max(self.tiles_up, default=0))
+        return rule_variant(variant).score(mask, tiles)
 
     def is_shut(self) -> bool:
         """Returns True if all tiles have been flipped (the box is shut)."""
@@ -1,26 +1,50 @@
 import random
+from collections.abc import Sequence
 
 from .board import Board
+from .rules import STANDARD
 
 
 class Die:
-    def __init__(self, faces: int = 6):
+    """
+    One die. Rolls use ``rng`` if given (e.g. a per-thread random.Random),
+    else the global ``random`` module.
+    """
+
+    __slots__ = ("faces", "current_value", "_randint")
+
+    def __init__(self, faces: int = 6, rng: random.Random | None = None):
         self.faces = faces
         self.current_value: int = 0
+        self._randint = rng.randint if rng is not None else random.randint
 
     def roll(self) -> int:
-        self.current_value = random.randint(1, self.faces)
+        self.current_value = self._randint(1, self.faces)
         return self.current_value
 
 
 class DiceManager:
     """
-    Handles 1 or 2 dice according to Shut the Box rules.
-    Automatically decides 1 or 2 dice when rolling, based on board state.
+    Handles 1 or 2 dice (more under some variants) according to Shut the Box rules.
+    Automatically decides how many dice to roll, based on board state:
+    ``dice_counts[board.up_mask]`` dice are rolled (default: the standard
+    rule on a 9-tile board; see rules.CompiledRules).
+    All dice draw from ``rng`` (default: the global ``random`` module).
     """
 
-    def __init__(self, die_faces: int = 6):
-        self.dice: list[Die] = [Die(die_faces) for _ in range(2)]
+    __slots__ = ("dice", "num_dice", "dice_counts")
+
+    def __init__(
+        self,
+        die_faces: int = 6,
+        rng: random.Random | None = None,
+        dice_counts: Sequence[int] | None = None,
+    ):
+        self.dice_counts = (
+            dice_counts if dice_counts is not None else STANDARD.compile(9).dice_counts
+        )
+        n_dice = max(2, max(self.dice_counts))
+        self.dice: list[Die] = [Die(die_faces, rng) for _ in range(n_dice)]
         self.num_dice = 2  # Start with two dice
 
     def set_number_of_dice(self, count: int) -> None:
@@ -29,12 +53,7 @@ class DiceManager:
     def roll(self, board: Board | None = None) -> list[int]:
         """Rolls either 1 or 2 dice based on board state (if board is provided)."""
         if board is not None:
-            # 1 die is allowed only if 7,8,9 are all down.
-            upright = [t.number for t in board.get_upright_tiles()]
-            if all(num not in upright for num in [7, 8, 9]):
-                self.num_dice = 1
-            else:
-                self.num_dice = 2
+            self.num_dice = self.dice_counts[board.up_mask]
         rolled = [self.dice[i].roll() for i in range(self.num_dice)]
         return rolled
 
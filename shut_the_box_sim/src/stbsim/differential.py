@@ -0,0 +1,236 @@
+"""
+Differential re-simulation after a strategy change.
+
+Under a fixed seed, a game can only play out differently under a modified
+strategy if that strategy chooses a different move at some (rack, roll,
+target) cell the game actually visits. record_baseline() runs a seeded
+simulation while a DecisionTrace hook records every decision cell each player
+visited. resimulate() then:
+
+    1. tabulates the old and new strategy's decisions on the distinct visited
+       cells only (cheap: a few thousand cells for any number of games),
+    2. selects the games that visit a cell where they disagree, and
+    3. replays just those games with Simulation.run_games(), reusing every
+       other game's result from the baseline.
+
+Replayed games are played from their seed, so their moves up to the first
+divergent decision are the baseline's; everything after it (including the
+other player's turn, whose dice and target may shift) is simulated afresh.
+The baseline's board size and rule variant are kept, and decisions are
+compared under its compiled rules.
+
+Example:
+    baseline = record_baseline(100_000, "greedy_max", "min_tiles", seed_start=0)
+    update = resimulate(baseline, p2_strategy="learned")
+    update["summary"], update["fraction_resimulated"]
+"""
+
+from array import array
+from typing import Any, TypedDict
+
+import numpy as np
+
+from .board import mask_combos
+from .hooks import HookRegistry
+from .rules import CompiledRules, RuleVariant, rule_variant
+from .simulation import Simulation
+from .solver import DIE_FACES
+from .stats import calculate_summary_stats
+from .strategies import TARGET_AWARE_STRATEGIES, decide
+
+# Target stored for decisions made without a score to beat.
+NO_TARGET = -1
+
+
+class DecisionTrace:
+    """
+    Hook subscriber recording every decision of every game: game id, turn
+    index (player), rack mask, roll total and score to beat (NO_TARGET if none).
+    """
+
+    def __init__(self) -> None:
+        self.game_id = array("q")
+        self.turn_idx = array("q")
+        self.mask = array("q")
+        self.roll = array("q")
+        self.target = array("q")
+
+    def subscribe(self, hooks: HookRegistry) -> None:
+        game_id, turn_idx = self.game_id.append, self.turn_idx.append
+        mask, roll, target = self.mask.append, self.roll.append, self.target.append
+
+        def on_move(
+            tm: Any, move_idx: int, roll_total: int, combo: tuple[int, ...], rank: int
+        ) -> None:
+            game_id(tm.game_id)
+            turn_idx(tm.turn_idx)
+            mask(tm.board.up_mask)
+            roll(roll_total)
+            target(NO_TARGET if tm.target is None else tm.target)
+
+        hooks.subscribe("move", on_move)
+
+    def arrays(self) -> dict[str, np.ndarray[Any, Any]]:
+        """The trace as int64 column arrays."""
+        return {
+            name: np.frombuffer(getattr(self, name), dtype=np.int64)
+            for name in ("game_id", "turn_idx", "mask", "roll", "target")
+        }
+
+
+class BaselineRun(TypedDict):
+    """A seeded run plus the decision cells its games visited.
+
+    Fields:
+        - results: Per-game summaries (see simulation.py)
+        - trace: DecisionTrace column arrays
+        - strategies: Strategy of each player, in turn order
+        - seed_start: Seed of game 0
+        - variant: Rule variant the games were played under
+        - tiles: Number of tiles on the board
+    """
+
+    results: list[dict[str, Any]]
+    trace: dict[str, np.ndarray[Any, Any]]
+    strategies: list[str]
+    seed_start: int
+    variant: RuleVariant
+    tiles: int
+
+
+class DifferentialResult(TypedDict):
+    """Outcome of a differential re-simulation.
+
+    Fields:
+        - results: Per-game summaries under the new strategies
+        - summary: calculate_summary_stats() of ``results``
+        - changed_game_ids: Games that were replayed
+        - fraction_resimulated: Share of games replayed
+    """
+
+    results: list[dict[str, Any]]
+    summary: dict[str, Any]
+    changed_game_ids: list[int]
+    fraction_resimulated: float
+
+
+def record_baseline(
+    n_games: int,
+    p1_strategy: str,
+    p2_strategy: str,
+    seed_start: int = 0,
+    variant: RuleVariant | str | None = None,
+    tiles: int = 9,
+) -> BaselineRun:
+    """
+    Run a seeded simulation (under ``variant`` on ``tiles`` tiles, see
+    Simulation.run()) and record the decision cells of every game.
+    """
+    rules = rule_variant(variant)
+    trace = DecisionTrace()
+    hooks = HookRegistry()
+    trace.subscribe(hooks)
+    results = Simulation().run(
+        n_games,
+        p1_strategy,
+        p2_strategy,
+        seed_start=seed_start,
+        hooks=hooks,
+        variant=rules,
+        tiles=tiles,
+    )
+    return BaselineRun(
+        results=results,
+        trace=trace.arrays(),
+        strategies=[p1_strategy, p2_strategy],
+        seed_start=seed_start,
+        variant=rules,
+        tiles=tiles,
+    )
+
+
+def _disagreeing_cells(
+    cells: np.ndarray[Any, Any], old: str, new: str, rules: CompiledRules
+) -> np.ndarray[Any, Any]:
+    """Boolean mask over distinct (mask, roll, target) rows where old != new."""
+    differs = np.zeros(len(cells), dtype=bool)
+    for i, (mask, roll, target) in enumerate(cells.tolist()):
+        if len(mask_combos(mask, roll)) < 2:
+            continue  # Forced move: every strategy agrees.
+        score = None if target == NO_TARGET else target
+        old_target = score if old in TARGET_AWARE_STRATEGIES else None
+        new_target = score if new in TARGET_AWARE_STRATEGIES else None
+        differs[i] = decide(old, mask, roll, old_target, rules) != decide(
+            new, mask, roll, new_target, rules
+        )
+    return differs
+
+
+def resimulate(
+    baseline: BaselineRun,
+    p1_strategy: str | None = None,
+    p2_strategy: str | None = None,
+) -> DifferentialResult:
+    """
+    Results of the baseline's games under new strategies, replaying only the
+    games whose visited decisions change.
+
+    Args:
+        baseline: Output of record_baseline()
+        p1_strategy: New strategy for Player 1 (None keeps the baseline's)
+        p2_strategy: New strategy for Player 2 (None keeps the baseline's)
+
+    Returns:
+        DifferentialResult
+    """
+    old = baseline["strategies"]
+    new = [p1_strategy or old[0], p2_strategy or old[1]]
+    trace = baseline["trace"]
+    variant, tiles = baseline["variant"], baseline["tiles"]
+    rules = variant.compile(tiles)
+    # Roll totals take just enough bits for the variant's largest roll.
+    roll_bits = (DIE_FACES * max(rules.dice_counts)).bit_length()
+    changed = np.zeros(len(baseline["results"]), dtype=bool)
+    for turn_idx in range(2):
+        if new[turn_idx] == old[turn_idx]:
+            continue
+        rows = trace["turn_idx"] == turn_idx
+        target = trace["target"][rows]
+        if not TARGET_AWARE_STRATEGIES & {old[turn_idx], new[turn_idx]}:
+            target = np.full_like(target, NO_TARGET)
+        # One (target, rack and roll) key per decision cell.
+        keys = np.stack(
+            [target, trace["mask"][rows] << roll_bits | trace["roll"][rows]], axis=1
+        )
+        cell_keys, cell_of_row = np.unique(keys, axis=0, return_inverse=True)
+        cell_of_row = cell_of_row.reshape(-1)
+        rack_roll = cell_keys[:, 1]
+        cells = np.stack(
+            [
+                rack_roll >> roll_bits,
+                rack_roll & ((1 << roll_bits) - 1),
+                cell_keys[:, 0],
+            ],
+            axis=1,
+        )
+        differs = _disagreeing_cells(cells, old[turn_idx], new[turn_idx], rules)
+        changed[trace["game_id"][rows][differs[cell_of_row]]] = True
+    changed_ids = np.flatnonzero(changed).tolist()
+    results = list(baseline["results"])
+    if changed_ids:
+        replayed = Simulation().run_games(
+            changed_ids,
+            new[0],
+            new[1],
+            seed_start=baseline["seed_start"],
+            variant=variant,
+            tiles=tiles,
+        )
+        for game_id, result in zip(changed_ids, replayed, strict=True):
+            results[game_id] = result
+    return DifferentialResult(
+        results=results,
+        summary=calculate_summary_stats(results),
+        changed_game_ids=changed_ids,
+        fraction_resimulated=len(changed_ids) / max(1, len(results)),
+    )
@@ -0,0 +1,389 @@
+"""
+Partitioned on-disk event store for Shut the Box event logs.
+
+Events produced by InMemoryEventLogger are written as a dataset partitioned by
+``sim_id`` and ``event_type``. Each partition is split into chunks sorted by
+``game_id``; a JSON manifest records per-chunk row counts, ``game_id`` min/max
+statistics and the set of ``player_id`` values. Queries consult the manifest
+first and only read the chunks that can contain matching rows. A row whose
+filtered column is missing or NaN never matches a game_id or player_id filter.
+
+Chunks hold one file per column, so a query only reads the columns it needs,
+and nothing stored is ever unpickled: numeric, boolean and datetime columns
+are .npy arrays (loaded with ``allow_pickle=False``, as in cache.py), and
+object columns (strings, tuples, lists, dicts) are JSON lists, with tuples
+and dict keys tagged so they round-trip.
+
+Layout:
+    root/
+        manifest.json
+        sim_id=0/event_type=tiles_flipped/part-00000/columns.json
+        sim_id=0/event_type=tiles_flipped/part-00000/c000.npy
+        sim_id=0/event_type=tiles_flipped/part-00000/c001.json
+        ...
+
+Example:
+    store = EventStore("runs/events")
+    store.append(logger.to_df())
+    df = store.query(event_type="tiles_flipped", game_id=range(100, 200))
+"""
+
+import json
+import os
+from collections.abc import Iterable, Mapping
+from pathlib import Path
+from typing import Any, TypedDict
+
+import numpy as np
+import pandas as pd
+
+MANIFEST_NAME = "manifest.json"
+CHUNK_COLUMNS_NAME = "columns.json"
+# 2: chunks are directories of per-column .npy/JSON files instead of pickles.
+STORE_VERSION = 2
+DEFAULT_CHUNK_ROWS = 65_536
+
+
+class ChunkInfo(TypedDict):
+    """Manifest entry describing one stored chunk.
+
+    Fields:
+        - sim_id: Simulation run identifier of every row in the chunk
+        - event_type: Event type of every row in the chunk
+        - path: Chunk directory, relative to the store root
+        - rows: Number of rows in the chunk
+        - game_id_min: Smallest game_id in the chunk (None if unknown)
+        - game_id_max: Largest game_id in the chunk (None if unknown)
+        - player_ids: Distinct player_id values present in the chunk
+    """
+
+    sim_id: Any
+    event_type: str
+    path: str
+    rows: int
+    game_id_min: int | None
+    game_id_max: int | None
+    player_ids: list[str]
+
+
+def _as_values(value: Any) -> list[Any] | None:
+    """Normalize a scalar-or-iterable filter into a list (None means no filter)."""
+    if value is None:
+        return None
+    if isinstance(value, str) or not isinstance(value, Iterable):
+        return [value]
+    return list(value)
+
+
+def _encode(value: Any) -> Any:
+    """JSON form of one object-column value (tuples and dicts are tagged)."""
+    if isinstance(value, tuple):
+        return {"tuple": [_encode(v) for v in value]}
+    if isinstance(value, list):
+        return [_encode(v) for v in value]
+    if isinstance(value, dict):
+        return {"dict": [[_encode(k), _encode(v)] for k, v in value.items()]}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is pd.NA or value is pd.NaT:
+        return None
+    return value
+
+
+def _decode(value: Any) -> Any:
+    """Inverse of _encode()."""
+    if isinstance(value, list):
+        return [_decode(v) for v in value]
+    if isinstance(value, dict):
+        if "tuple" in value:
+            return tuple(_decode(v) for v in value["tuple"])
+        return {_decode(k): _decode(v) for k, v in value["dict"]}
+    return value
+
+
+def _write_chunk(path: Path, chunk: pd.DataFrame) -> None:
+    """Store ``chunk`` as one file per column plus a column index."""
+    path.mkdir(parents=True, exist_ok=True)
+    entries = []
+    for i, (name, column) in enumerate(chunk.items()):
+        entry: dict[str, Any] = {"name": name, "file": f"c{i:03d}"}
+        dtype = column.dtype
+        if isinstance(dtype, pd.DatetimeTZDtype):
+            entry.update(kind="datetime", tz=str(dtype.tz))
+            utc = column.dt.tz_convert("UTC").dt.tz_localize(None)
+            np.save(path / f"{entry['file']}.npy", utc.to_numpy())
+        elif isinstance(dtype, np.dtype) and dtype.kind in "biufcmM":
+            entry.update(kind="array")
+            np.save(path / f"{entry['file']}.npy", column.to_numpy())
+        else:
+            entry.update(kind="json")
+            try:
+                text = json.dumps([_encode(v) for v in column])
+            except TypeError as err:
+                raise ValueError(f"Cannot store column {name!r}: {err}") from err
+            (path / f"{entry['file']}.json").write_text(text)
+        entries.append(entry)
+    (path / CHUNK_COLUMNS_NAME).write_text(json.dumps(entries))
+
+
+def _read_chunk(
+    path: Path, rows: int, columns: Iterable[str] | None = None
+) -> pd.DataFrame:
+    """Load a chunk written by _write_chunk() (only ``columns``, if given)."""
+    wanted = None if columns is None else set(columns)
+    data: dict[str, Any] = {}
+    for entry in json.loads((path / CHUNK_COLUMNS_NAME).read_text()):
+        name = entry["name"]
+        if wanted is not None and name not in wanted:
+            continue
+        if entry["kind"] == "json":
+            values = json.loads((path / f"{entry['file']}.json").read_text())
+            data[name] = pd.Series([_decode(v) for v in values], dtype=object)
+            continue
+        array = np.load(path / f"{entry['file']}.npy", allow_pickle=False)
+        if entry["kind"] == "datetime":
+            data[name] = (
+                pd.Series(array).dt.tz_localize("UTC").dt.tz_convert(entry["tz"])
+            )
+        else:
+            data[name] = array
+    return pd.DataFrame(data, index=pd.RangeIndex(rows))
+
+
+class _GameIdFilter:
+    """game_id predicate supporting an int, a range, or any iterable of ints."""
+
+    def __init__(self, game_id: int | range | Iterable[int]):
+        self.range: range | None = None
+        self.values: np.ndarray[Any, np.dtype[np.int64]] | None = None
+        if isinstance(game_id, range):
+            self.range = game_id
+        elif isinstance(game_id, int | np.integer):
+            self.range = range(int(game_id), int(game_id) + 1)
+        else:
+            self.values = np.unique(np.fromiter(game_id, dtype=np.int64))
+
+    def overlaps(self, lo: int | None, hi: int | None) -> bool:
+        """
+        True if some accepted game_id may fall inside [lo, hi] (None: the chunk
+        has no game_id values, so nothing can match).
+        """
+        if lo is None or hi is None:
+            return False
+        if self.range is not None:
+            r = self.range
+            if len(r) == 0:
+                return False
+            first, last = min(r[0], r[-1]), max(r[0], r[-1])
+            return first <= hi and last >= lo
+        assert self.values is not None
+        idx = int(np.searchsorted(self.values, lo, side="left"))
+        return idx < len(self.values) and int(self.values[idx]) <= hi
+
+    def mask(self, column: pd.Series) -> np.ndarray[Any, np.dtype[np.bool_]]:
+        """Row mask of the rows whose game_id is accepted (NaN never is)."""
+        present = column.notna().to_numpy()
+        g = column.where(present, 0).to_numpy(dtype=np.int64)
+        if self.range is not None:
+            r = self.range
+            if len(r) == 0:
+                return np.zeros(len(g), dtype=bool)
+            first, last = min(r[0], r[-1]), max(r[0], r[-1])
+            hit = present & (g >= first) & (g <= last)
+            if abs(r.step) != 1:
+                hit &= (g - r[0]) % r.step == 0
+            return hit
+        assert self.values is not None
+        return present & np.isin(g, self.values)
+
+
+class EventStore:
+    """
+    Append-only event dataset partitioned by simulation and event type.
+
+    Args:
+        root: Directory holding the dataset (created on first append).
+        chunk_rows: Maximum number of rows written per chunk file.
+    """
+
+    def __init__(
+        self, root: str | os.PathLike[str], chunk_rows: int = DEFAULT_CHUNK_ROWS
+    ):
+        if chunk_rows < 1:
+            raise ValueError("chunk_rows must be positive")
+        self.root = Path(root)
+        self.chunk_rows = chunk_rows
+        self._chunks: list[ChunkInfo] = self._load_manifest()
+
+    def _load_manifest(self) -> list[ChunkInfo]:
+        path = self.root / MANIFEST_NAME
+        if not path.exists():
+            return []
+        data = json.loads(path.read_text())
+        if data.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported event store version: {data.get('version')}")
+        chunks: list[ChunkInfo] = data["chunks"]
+        return chunks
+
+    def _write_manifest(self) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp = self.root / (MANIFEST_NAME + ".tmp")
+        tmp.write_text(json.dumps({"version": STORE_VERSION, "chunks": self._chunks}))
+        os.replace(tmp, self.root / MANIFEST_NAME)
+
+    @property
+    def chunk_infos(self) -> list[ChunkInfo]:
+        """All manifest entries, in write order."""
+        return list(self._chunks)
+
+    def append(self, events: pd.DataFrame | Iterable[Mapping[str, Any]]) -> int:
+        """
+        Write events (a to_df() frame or an iterable of event dicts) to the store.
+
+        Rows are grouped by (sim_id, event_type), sorted by game_id and split
+        into chunks of at most ``chunk_rows`` rows.
+
+        Returns:
+            int: Number of rows written.
+        """
+        df = events if isinstance(events, pd.DataFrame) else pd.DataFrame(list(events))
+        if df.empty:
+            return 0
+        for col in ("sim_id", "event_type"):
+            if col not in df.columns:
+                raise ValueError(f"Events are missing required column: {col}")
+        existing: dict[str, int] = {}
+        for info in self._chunks:
+            part_dir = str(Path(info["path"]).parent)
+            existing[part_dir] = existing.get(part_dir, 0) + 1
+        has_game = "game_id" in df.columns
+        has_player = "player_id" in df.columns
+        for (sim_id, event_type), part in df.groupby(
+            ["sim_id", "event_type"], sort=False, dropna=False
+        ):
+            # Drop columns that no event of this type ever sets.
+            part = part.dropna(axis=1, how="all")
+            if has_game and "game_id" in part.columns:
+                part = part.sort_values("game_id", kind="stable")
+            part_dir = f"sim_id={sim_id}/event_type={event_type}"
+            (self.root / part_dir).mkdir(parents=True, exist_ok=True)
+            for start in range(0, len(part), self.chunk_rows):
+                chunk = part.iloc[start : start + self.chunk_rows].reset_index(
+                    drop=True
+                )
+                n = existing.get(part_dir, 0)
+                existing[part_dir] = n + 1
+                rel_path = f"{part_dir}/part-{n:05d}"
+                _write_chunk(self.root / rel_path, chunk)
+                g_min = g_max = None
+                if has_game and "game_id" in chunk.columns:
+                    g_min = int(chunk["game_id"].min())
+                    g_max = int(chunk["game_id"].max())
+                players: list[str] = []
+                if has_player and "player_id" in chunk.columns:
+                    players = sorted(
+                        str(p) for p in chunk["player_id"].dropna().unique()
+                    )
+                self._chunks.append(
+                    ChunkInfo(
+                        sim_id=(
+                            sim_id.item() if isinstance(sim_id, np.generic) else sim_id
+                        ),
+                        event_type=str(event_type),
+                        path=rel_path,
+                        rows=len(chunk),
+                        game_id_min=g_min,
+                        game_id_max=g_max,
+                        player_ids=players,
+                    )
+                )
+        self._write_manifest()
+        return len(df)
+
+    def plan(
+        self,
+        *,
+        sim_id: Any = None,
+        event_type: str | Iterable[str] | None = None,
+        game_id: int | range | Iterable[int] | None = None,
+        player_id: str | Iterable[str] | None = None,
+    ) -> list[ChunkInfo]:
+        """Return the chunks a query with these filters would read."""
+        sims = _as_values(sim_id)
+        types = _as_values(event_type)
+        players = _as_values(player_id)
+        games = _GameIdFilter(game_id) if game_id is not None else None
+        selected = []
+        for info in self._chunks:
+            if sims is not None and info["sim_id"] not in sims:
+                continue
+            if types is not None and info["event_type"] not in types:
+                continue
+            if games is not None and not games.overlaps(
+                info["game_id_min"], info["game_id_max"]
+            ):
+                continue
+            if players is not None and not set(info["player_ids"]).intersection(
+                players
+            ):
+                continue
+            selected.append(info)
+        return selected
+
+    def query(
+        self,
+        *,
+        sim_id: Any = None,
+        event_type: str | Iterable[str] | None = None,
+        game_id: int | range | Iterable[int] | None = None,
+        player_id: str | Iterable[str] | None = None,
+        columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Load events matching all given filters, reading only candidate chunks.
+
+        Args:
+            sim_id: Simulation id or ids to keep.
+            event_type: Event type or types to keep.
+            game_id: A game id, a range, or an iterable of game ids to keep.
+            player_id: Player id or ids to keep.
+            columns: Optional subset of columns to return.
+
+        Returns:
+            pd.DataFrame: Matching rows, ordered by partition then game_id.
+        """
+        games = _GameIdFilter(game_id) if game_id is not None else None
+        players = _as_values(player_id)
+        needed = None
+        if columns is not None:
+            needed = set(columns)
+            if games is not None:
+                needed.add("game_id")
+            if players is not None:
+                needed.add("player_id")
+        frames = []
+        for info in self.plan(
+            sim_id=sim_id, event_type=event_type, game_id=game_id, player_id=player_id
+        ):
+            chunk = _read_chunk(self.root / info["path"], info["rows"], needed)
+            keep = np.ones(len(chunk), dtype=bool)
+            if games is not None:
+                if "game_id" in chunk.columns:
+                    keep &= games.mask(chunk["game_id"])
+                else:
+                    keep[:] = False
+            if players is not None:
+                if "player_id" in chunk.columns:
+                    ids = chunk["player_id"]
+                    keep &= (ids.notna() & ids.isin(players)).to_numpy()
+                else:
+                    keep[:] = False
+            if not keep.all():
+                chunk = chunk[keep]
+            if columns is not None:
+                chunk = chunk.reindex(columns=columns)
+            if not chunk.empty:
+                frames.append(chunk)
+        if not frames:
+            return pd.DataFrame(columns=columns)
+        return pd.concat(frames, ignore_index=True)
@@ -1,32 +1,117 @@
-from typing import Any
+import random
 
 from .board import Board
 from .dice import DiceManager
+from .hooks import HookRegistry
 from .loggers import InMemoryEventLogger
 from .player import Player
+from .rules import RuleVariant, rule_variant
+from .telemetry import StateTelemetry
 from .turn_manager import TurnManager
 
 
 class Game:
+    """
+    One Shut the Box game between ``players``.
+
+    A Game can be replayed: reset() clears the board and scores and assigns a
+    new game_id, so batch runners reuse one Game (with its Board, DiceManager
+    and TurnManager) for every game of a simulation.
+
+    Args:
+        players: Players, in turn order.
+        tiles: Highest tile number on the board.
+        variation: House rules: a rules.RuleVariant or the name of one in
+            rules.RULE_VARIANTS (default: the standard rules). It is compiled
+            into lookup tables once, here.
+        sim_id: Simulation identifier used in logged events.
+        game_id: Game identifier used in logged events.
+        logger: Optional event logger.
+        verbose: Print the winner at the end of start_game() (default: quiet).
+        telemetry: Optional aggregate move counters fed by every turn; a
+            collector laid out for another board size or roll range raises
+            ValueError.
+        hooks: Optional event subscribers (see hooks.py). The logger and
+            telemetry are subscribed to a copy, so ``hooks`` is not modified.
+        rng: Random number generator for the dice (default: the global
+            ``random`` module); give each thread its own.
+    """
+
+    __slots__ = (
+        "players",
+        "board",
+        "dice_manager",
+        "current_player_idx",
+        "state",
+        "variation",
+        "rules",
+        "shut_box",
+        "sim_id",
+        "game_id",
+        "logger",
+        "verbose",
+        "turn_manager",
+        "hooks",
+        "_on_game_start",
+        "_on_game_end",
+    )
+
     def __init__(
         self,
         players: list[Player],
         tiles: int = 9,
-        variation: Any = None,
+        variation: RuleVariant | str | None = None,
         *,
         sim_id: int = 0,
         game_id: int = 0,
         logger: InMemoryEventLogger | None = None,
+        verbose: bool = False,
+        telemetry: StateTelemetry | None = None,
+        hooks: HookRegistry | None = None,
+        rng: random.Random | None = None,
     ):
         self.players = players
+        self.variation = rule_variant(variation)
+        self.rules = self.variation.compile(tiles)
         self.board = Board(max_tile_number=tiles)
-        self.dice_manager = DiceManager()
+        self.dice_manager = DiceManager(rng=rng, dice_counts=self.rules.dice_counts)
         self.current_player_idx = 0
         self.state = "SETUP"
-        self.variation = variation
+        self.shut_box = False
         self.sim_id = sim_id
         self.game_id = game_id
         self.logger = logger
+        self.verbose = verbose
+        registry = hooks.copy() if hooks is not None else HookRegistry()
+        if logger is not None:
+            logger.subscribe(registry)
+        if telemetry is not None:
+            telemetry.check_board(tiles, self.rules.dice_counts)
+            telemetry.subscribe(registry)
+        self.turn_manager = TurnManager(
+            players[0],
+            self.board,
+            self.dice_manager,
+            sim_id=self.sim_id,
+            game_id=self.game_id,
+            strategy=players[0].strategy,
+            rules=self.rules,
+        )
+        self.bind_hooks(registry)
+
+    def bind_hooks(self, hooks: HookRegistry) -> None:
+        """(Re)bind the game and turn loops to the current subscribers of ``hooks``."""
+        self.hooks = hooks
+        self._on_game_start = hooks.dispatcher("game_start")
+        self._on_game_end = hooks.dispatcher("game_end")
+        self.turn_manager.bind_hooks(hooks)
+
+    def reset(self, game_id: int) -> None:
+        """Prepare this Game object to be played again as game ``game_id``."""
+        self.game_id = game_id
+        self.current_player_idx = 0
+        self.state = "SETUP"
+        self.shut_box = False
 
     def initialize(self) -> None:
         self.board.reset()
@@ -36,42 +121,37 @@ class Game:
 
     def start_game(self) -> None:
         self.initialize()
-        if self.logger:
-            self.logger.log_game_start(
-                self.sim_id,
-                self.game_id,
-                [p.name for p in self.players],
-                num_dice=2,  # Assume 2 dice init
-            )
-        for turn_idx, player in enumerate(self.players):
-            self.current_player_idx = self.players.index(player)
-            # Each player plays a full turn
-            tm = TurnManager(
-                player,
-                self.board,
-                self.dice_manager,
-                self.logger,
-                sim_id=self.sim_id,
-                game_id=self.game_id,
-                turn_idx=turn_idx,
-                strategy="greedy",
-            )
-            score, shut_box = tm.play_turn()
-            player.update_score(score)
+        if self._on_game_start is not None:
+            self._on_game_start(self)
+        tm = self.turn_manager
+        shut = False
+        # Player scores accumulate over the rounds of a match.
+        for round_idx in range(self.rules.rounds):
+            best_total: int | None = None
+            for turn_idx, player in enumerate(self.players):
+                self.current_player_idx = turn_idx
+                # Each player plays a full turn on their own fresh rack, knowing
+                # the score that would beat the best total so far
+                if turn_idx or round_idx:
+                    self.board.reset()
+                target = None
+                if best_total is not None:
+                    target = max(0, best_total - player.score)
+                tm.reset(player, turn_idx, game_id=self.game_id, target=target)
+                score, shut_box = tm.play_turn()
+                shut = shut or shut_box
+                player.update_score(player.score + score)
+                if best_total is None or player.score < best_total:
+                    best_total = player.score
+        self.shut_box = shut
         self.state = "COMPLETED"
         # Determine winner
         winner = self.determine_winner()
-        scores = {p.name: p.score for p in self.players}
         # Print winner information
-        print(f"Winner: {winner.name} with score {winner.score}")
-        # After all turns, log game end event
-        if self.logger:
-            self.logger.log_game_end(
-                self.sim_id,
-                self.game_id,
-                winner_id=winner.name if winner else None,
-                player_scores=scores,
-            )
+        if self.verbose:
+            print(f"Winner: {winner.name} with score {winner.score}")
+        if self._on_game_end is not None:
+            self._on_game_end(self, winner)
 
     def next_turn(self) -> None:
         self.current_player_idx = (self.current_player_idx + 1) % len(self.players)
@@ -80,4 +160,9 @@ class Game:
         return self.state == "COMPLETED"
 
     def determine_winner(self) -> Player:
-        return min(self.players, key=lambda p: p.score)
+        # First player with the lowest score (earlier players win ties).
+        winner = self.players[0]
+        for p in self.players:
+            if p.score < winner.score:
+                winner = p
+        return winner
@@ -0,0 +1,90 @@
+"""
+Subscriber registry for game-loop events.
+
+Loggers, telemetry collectors and profilers subscribe to the event kinds they
+need. The game loop binds its hooks once, when a Game (or TurnManager) is
+constructed: each kind resolves to None (no subscriber), the subscriber
+itself, or a small fan-out, and the loop only tests a local for None. Hooks
+receive cheap raw values (the TurnManager, rack bitmask, roll, chosen combo);
+anything derived, such as lists of upright tiles, is computed inside the
+subscribers that want it. A loop with no subscribers therefore does no
+per-event work.
+
+Hook signatures:
+    game_start(game)
+    dice_roll(tm, roll_values)                  # before the move, tm.board intact
+    move(tm, move_idx, roll_total, combo, rank)  # before the combo is flipped
+    bust(tm, move_idx, roll_total)
+    turn_end(tm, score, shut_box)
+    game_end(game, winner)
+
+where ``tm`` is the TurnManager playing the turn (player, board, strategy,
+sim_id, game_id, turn_idx) and ``rank`` is the combo's index in
+board.mask_combos(mask, roll_total).
+
+Example:
+    hooks = HookRegistry()
+    hooks.subscribe("turn_end", lambda tm, score, shut: scores.append(score))
+    Simulation().run(1_000, "greedy_max", "min_tiles", hooks=hooks)
+"""
+
+from collections.abc import Callable
+from typing import Any, Literal, get_args
+
+HookKind = Literal["game_start", "dice_roll", "move", "bust", "turn_end", "game_end"]
+HOOK_KINDS: tuple[HookKind, ...] = get_args(HookKind)
+
+Hook = Callable[..., None]
+
+
+class HookRegistry:
+    """
+    Event-kind -> subscribers registry.
+
+    Subscriptions made after a Game is constructed are not seen by that Game;
+    subscribe first (or call Game.bind_hooks() again).
+    """
+
+    def __init__(self) -> None:
+        self._subscribers: dict[str, list[Hook]] = {kind: [] for kind in HOOK_KINDS}
+
+    def subscribe(self, kind: HookKind, hook: Hook) -> Hook:
+        """Register ``hook`` for ``kind`` events; returns the hook."""
+        if kind not in self._subscribers:
+            raise ValueError(f"Unknown hook kind: {kind}")
+        self._subscribers[kind].append(hook)
+        return hook
+
+    def unsubscribe(self, kind: HookKind, hook: Hook) -> None:
+        """Remove a hook registered with subscribe()."""
+        self._subscribers[kind].remove(hook)
+
+    def subscribers(self, kind: HookKind) -> tuple[Hook, ...]:
+        return tuple(self._subscribers[kind])
+
+    def dispatcher(self, kind: HookKind) -> Hook | None:
+        """
+        The callable the game loop should invoke for ``kind``: None without
+        subscribers, the hook itself for one, else a fan-out over all of them.
+        """
+        hooks = self.subscribers(kind)
+        if not hooks:
+            return None
+        if len(hooks) == 1:
+            return hooks[0]
+
+        def fan_out(*args: Any) -> None:
+            for hook in hooks:
+                hook(*args)
+
+        return fan_out
+
+    def copy(self) -> "HookRegistry":
+        """A registry with the same subscriptions (later changes are separate)."""
+        other = HookRegistry()
+        for kind, hooks in self._subscribers.items():
+            other._subscribers[kind] = list(hooks)
+        return other
+
+    def __bool__(self) -> bool:
+        return any(self._subscribers.values())
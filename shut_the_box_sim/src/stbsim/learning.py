@@ -0,0 +1,274 @@
+"""
+Batched self-play learning of move policies.
+
+For boards too large to solve exactly, a policy can be learned from play
+instead. train_policy() plays a whole batch of single-turn games at once: the
+dice for every live game are drawn in one array call, every candidate move is
+gathered from the solver's MoveTable, and the batch picks its moves with a
+segmented min over the current value estimates (with epsilon-greedy
+exploration). After each batch the Monte Carlo value estimate of every rack
+visited is updated with the final scores via bincount, so the Python-level
+work per batch is one loop iteration per move (at most ``tiles``), not per game.
+
+Any rule variant can be learned (see rules.py): dice counts and scores come
+from its compiled tables, and the move table covers rolls of up to as many
+dice as the variant ever rolls.
+
+The learned value table is turned into a compact move table (the bitmask of
+tiles to flip for every (rack, roll) cell) and served as the "learned" entry
+of STRATEGY_MAP, via the artifact cache (one policy per board size and
+variant).
+
+Example:
+    policy, curve = train_policy(9, n_games=200_000, seed=0)
+    policy.combo(0b111111111, 8)  # tiles to flip on a fresh board after an 8
+    [report["mean_score"] for report in curve]
+"""
+
+import time
+from collections.abc import Callable
+from functools import cache, partial
+from typing import Any, TypedDict
+
+import numpy as np
+
+from .cache import Arrays, ArtifactCache, register_artifact
+from .rules import RuleVariant, rule_variant
+from .solver import DIE_FACES, MoveTable, shared_move_table
+
+DEFAULT_TRAINING_GAMES = 200_000
+DEFAULT_BATCH_SIZE = 10_000
+
+
+class TrainingReport(TypedDict):
+    """Learning-curve point, reported after each training batch.
+
+    Fields:
+        - iteration: Batch number (from 1)
+        - games: Games played so far
+        - mean_score: Mean final score of the batch
+        - shut_box_rate: Fraction of the batch that shut the box
+        - epsilon: Exploration rate used for the batch
+        - states_visited: Racks with at least one value sample so far
+        - elapsed_seconds: Training time so far
+    """
+
+    iteration: int
+    games: int
+    mean_score: float
+    shut_box_rate: float
+    epsilon: float
+    states_visited: int
+    elapsed_seconds: float
+
+
+class LearnedPolicy:
+    """
+    Compact move table of a learned policy.
+
+    Attributes:
+        tiles: Number of tiles on the board.
+        max_roll: Largest roll total.
+        values: (2**tiles,) learned expected final score per rack.
+        moves: (2**tiles * max_roll,) bitmask of the tiles to flip in cell
+            ``mask * max_roll + roll - 1`` (0 when the roll busts).
+    """
+
+    def __init__(
+        self,
+        tiles: int,
+        values: np.ndarray[Any, Any],
+        moves: np.ndarray[Any, Any],
+        max_roll: int = 2 * DIE_FACES,
+    ):
+        self.tiles = tiles
+        self.max_roll = max_roll
+        self.values = values
+        self.moves = moves
+
+    def move(self, mask: int, roll_total: int) -> int:
+        """
+        Bitmask of the tiles to flip (0 if the roll busts). Raises ValueError
+        for a roll total outside 1..max_roll.
+        """
+        if not 1 <= roll_total <= self.max_roll:
+            raise ValueError(f"Roll total must be between 1 and {self.max_roll}")
+        return int(self.moves[mask * self.max_roll + roll_total - 1])
+
+    def combo(self, mask: int, roll_total: int) -> tuple[int, ...]:
+        """Tile numbers to flip, ascending, or () if the roll busts."""
+        flip = self.move(mask, roll_total)
+        return tuple(n + 1 for n in range(flip.bit_length()) if flip >> n & 1)
+
+
+def _segment_choice(
+    table: MoveTable,
+    values: np.ndarray[Any, Any],
+    start: np.ndarray[Any, Any],
+    count: np.ndarray[Any, Any],
+) -> np.ndarray[Any, Any]:
+    """
+    Index into table.succ of the lowest-valued successor of each cell, where
+    cell i's successors are succ[start[i]:start[i] + count[i]] (count >= 1).
+    Ties go to the first successor in table order.
+    """
+    offsets = np.cumsum(count) - count
+    position = np.arange(int(count.sum()))
+    candidate = np.repeat(start - offsets, count) + position
+    candidate_values = values[table.succ[candidate]]
+    best = np.minimum.reduceat(candidate_values, offsets)
+    first = np.where(
+        candidate_values == np.repeat(best, count), position, position.size
+    )
+    chosen: np.ndarray[Any, Any] = candidate[np.minimum.reduceat(first, offsets)]
+    return chosen
+
+
+def policy_moves(
+    table: MoveTable, values: np.ndarray[Any, Any]
+) -> np.ndarray[Any, Any]:
+    """Greedy move table (see LearnedPolicy.moves) for a value table."""
+    n_masks = 1 << table.tiles
+    masks = np.repeat(np.arange(n_masks), table.max_roll)
+    rolls = np.tile(np.arange(table.max_roll), n_masks)
+    cell = table.rank[masks] * table.max_roll + rolls
+    start = table.ptr[cell]
+    count = table.ptr[cell + 1] - start
+    dtype = np.uint16 if table.tiles <= 16 else np.uint32
+    moves = np.zeros(n_masks * table.max_roll, dtype=dtype)
+    live = count > 0
+    chosen = _segment_choice(table, values, start[live], count[live])
+    moves[live] = masks[live] ^ table.succ[chosen]
+    return moves
+
+
+def train_policy(
+    tiles: int = 9,
+    n_games: int = DEFAULT_TRAINING_GAMES,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    epsilon: float = 0.2,
+    seed: int | None = None,
+    callback: Callable[[TrainingReport], None] | None = None,
+    variant: RuleVariant | str | None = None,
+) -> tuple[LearnedPolicy, list[TrainingReport]]:
+    """
+    Learn a policy minimizing the expected final score by batched self-play.
+
+    Values are every-visit Monte Carlo averages of the final score from each
+    rack, starting at 0 (optimistic, so unexplored racks get tried). Moves pick
+    the successor rack with the lowest value, or with probability epsilon a
+    uniformly random valid move; epsilon decays linearly to 0 over training.
+
+    Args:
+        tiles: Number of tiles on the board
+        n_games: Total single-turn games to play
+        batch_size: Games played simultaneously per update
+        epsilon: Initial exploration rate
+        seed: Seed for the training RNG
+        callback: Called with each batch's TrainingReport
+        variant: Rule variant to learn (dice counts and scores; default: the
+            standard rules)
+
+    Returns:
+        tuple: (learned policy, learning curve with one report per batch)
+    """
+    if n_games < 1 or batch_size < 1:
+        raise ValueError("n_games and batch_size must be positive")
+    rules = rule_variant(variant).compile(tiles)
+    dice_counts = np.asarray(rules.dice_counts)
+    rack_scores = np.asarray(rules.scores)
+    max_dice = max(rules.dice_counts)
+    table = shared_move_table(tiles, DIE_FACES * max_dice)
+    rng = np.random.default_rng(seed)
+    n_masks = 1 << tiles
+    full_mask = n_masks - 1
+    values = np.zeros(n_masks)
+    visits = np.zeros(n_masks, dtype=np.int64)
+    n_batches = max(1, -(-n_games // batch_size))
+    curve: list[TrainingReport] = []
+    start_time = time.perf_counter()
+    games = 0
+    for iteration in range(1, n_batches + 1):
+        size = min(batch_size, n_games - games)
+        eps = epsilon * (1 - (iteration - 1) / max(1, n_batches - 1))
+        masks = np.full(size, full_mask, dtype=np.int64)
+        live = np.arange(size)
+        trajectory = []
+        while live.size:
+            state = masks[live]
+            trajectory.append((live, state))
+            dice = rng.integers(1, DIE_FACES + 1, (max_dice, live.size))
+            rolled = np.arange(max_dice)[:, None] < dice_counts[state]
+            roll = (dice * rolled).sum(axis=0)
+            cell = table.rank[state] * table.max_roll + roll - 1
+            start = table.ptr[cell]
+            count = table.ptr[cell + 1] - start
+            moving = count > 0
+            live, state = live[moving], state[moving]
+            start, count = start[moving], count[moving]
+            if not live.size:
+                break
+            chosen = _segment_choice(table, values, start, count)
+            explore = rng.random(live.size) < eps
+            random_pick = start + (rng.random(live.size) * count).astype(np.int64)
+            chosen = np.where(explore, random_pick, chosen)
+            masks[live] = table.succ[chosen]
+            live = live[masks[live] != 0]
+        scores = rack_scores[masks]
+        visited = np.concatenate([state for _, state in trajectory])
+        returns = np.concatenate([scores[idx] for idx, _ in trajectory])
+        counts = np.bincount(visited, minlength=n_masks)
+        totals = np.bincount(visited, weights=returns, minlength=n_masks)
+        seen = counts > 0
+        visits[seen] += counts[seen]
+        values[seen] += (totals[seen] - counts[seen] * values[seen]) / visits[seen]
+        games += size
+        report = TrainingReport(
+            iteration=iteration,
+            games=games,
+            mean_score=float(scores.mean()),
+            shut_box_rate=float((masks == 0).mean()),
+            epsilon=eps,
+            states_visited=int((visits > 0).sum()),
+            elapsed_seconds=time.perf_counter() - start_time,
+        )
+        curve.append(report)
+        if callback is not None:
+            callback(report)
+    values[0] = rack_scores[0]
+    policy = LearnedPolicy(tiles, values, policy_moves(table, values), table.max_roll)
+    return policy, curve
+
+
+# 2: boards above 9 tiles keep rolling two dice while any tile above 6 is up.
+@register_artifact("learned_policy", format_version=2)
+def build_policy_arrays(tiles: int, variant: RuleVariant | str | None = None) -> Arrays:
+    """Default learned policy (default standard rules) for the artifact cache."""
+    return _policy_arrays(tiles, variant)
+
+
+def _policy_arrays(
+    tiles: int, variant: RuleVariant | str | None = None, seed: int = 0
+) -> Arrays:
+    """Arrays of the policy learned under ``variant`` (fixed seed, so reproducible)."""
+    policy, _ = train_policy(tiles, seed=seed, variant=variant)
+    return {"values": policy.values, "moves": policy.moves}
+
+
+@cache
+def load_policy(
+    tiles: int = 9, variant: RuleVariant | str | None = None
+) -> LearnedPolicy:
+    """
+    The default learned policy for ``tiles`` under a rule variant (default
+    standard): memory-mapped from the artifact cache, and trained (then
+    cached) only on a miss.
+    """
+    arrays = ArtifactCache().get_or_build(
+        "learned_policy",
+        tiles,
+        partial(build_policy_arrays, tiles, variant),
+        variant=rule_variant(variant).cache_key,
+    )
+    moves = arrays["moves"]
+    return LearnedPolicy(tiles, arrays["values"], moves, len(moves) >> tiles)
@@ -5,6 +5,8 @@ from typing import Any, Literal
 
 import pandas as pd
 
+from .hooks import HookRegistry
+
 EventType = Literal[
     "simulation_start",
     "game_start",
@@ -66,8 +68,8 @@ class InMemoryEventLogger:
         game_id: str | int | None,
         player_id: str,
         turn_idx: int,
-        roll_values: list[int],
-        tiles_up: list[int],
+        roll_values: Sequence[int],
+        tiles_up: Sequence[int],
     ) -> None:
         evt = {
             **self._add_base_context(sim_id, game_id, player_id, turn_idx),
@@ -161,6 +163,83 @@ class InMemoryEventLogger:
         }
         self.events.append(GameEvent(evt))
 
+    def subscribe(self, hooks: HookRegistry) -> None:
+        """Record the events of every game bound to ``hooks`` (see hooks.py)."""
+
+        def on_game_start(game: Any) -> None:
+            self.log_game_start(
+                game.sim_id, game.game_id, [p.name for p in game.players], num_dice=2
+            )
+
+        def on_dice_roll(tm: Any, roll_values: Sequence[int]) -> None:
+            self.log_dice_roll(
+                tm.sim_id,
+                tm.game_id,
+                tm.player.name,
+                tm.turn_idx,
+                roll_values,
+                tm.board.upright_numbers(),
+            )
+
+        def on_move(
+            tm: Any, move_idx: int, roll_total: int, combo: tuple[int, ...], rank: int
+        ) -> None:
+            tiles_up = tm.board.upright_numbers()
+            self.log_move_attempt(
+                tm.sim_id,
+                tm.game_id,
+                tm.player.name,
+                tm.turn_idx,
+                move_idx,
+                tm.strategy,
+                combo,
+                tiles_up,
+                roll_total,
+                True,
+                tiles_flipped=combo,
+                final_tiles_up=[n for n in tiles_up if n not in combo],
+            )
+
+        def on_bust(tm: Any, move_idx: int, roll_total: int) -> None:
+            self.log_move_attempt(
+                tm.sim_id,
+                tm.game_id,
+                tm.player.name,
+                tm.turn_idx,
+                move_idx,
+                tm.strategy,
+                (),
+                tm.board.upright_numbers(),
+                roll_total,
+                False,
+            )
+
+        def on_turn_end(tm: Any, score: int, shut_box: bool) -> None:
+            self.log_turn_end(
+                tm.sim_id,
+                tm.game_id,
+                tm.player.name,
+                tm.turn_idx,
+                list(tm.board.upright_numbers()),
+                score,
+                shut_box,
+            )
+
+        def on_game_end(game: Any, winner: Any) -> None:
+            self.log_game_end(
+                game.sim_id,
+                game.game_id,
+                winner_id=winner.name if winner else None,
+                player_scores={p.name: p.score for p in game.players},
+            )
+
+        hooks.subscribe("game_start", on_game_start)
+        hooks.subscribe("dice_roll", on_dice_roll)
+        hooks.subscribe("move", on_move)
+        hooks.subscribe("bust", on_bust)
+        hooks.subscribe("turn_end", on_turn_end)
+        hooks.subscribe("game_end", on_game_end)
+
     def to_df(self) -> pd.DataFrame:
         if not self.events:
             return pd.DataFrame()
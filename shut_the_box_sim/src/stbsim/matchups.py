@@ -0,0 +1,212 @@
+"""
+Turn-pairing estimators of head-to-head win rates.
+
+Each player's turn starts on a fresh board, so a game between two strategies
+is a pair of independent turns: Player 1's score depends only on its strategy
+and dice, and Player 2's only on its strategy, dice and (if target-aware)
+Player 1's score. Rather than simulating one pair per game, a TurnPool plays
+M turns per strategy once and estimate_matchup() compares them across
+pairings:
+
+    - "u_statistic": for a Player 2 that ignores the target, every one of the
+      M x M pairings is a game. Win and tie rates are two-sample U-statistics,
+      computed with one sort and a searchsorted. Player 1 wins ties.
+    - "conditional": a target-aware Player 2 plays turns conditional on each
+      score s that Player 1 reaches, and P(Player 2 wins) is the sum over s
+      of P(Player 1 scores s) * P(Player 2 scores < s | target s).
+
+Pools are reused across matchups, so matchup_matrix() turns n strategies'
+pools into all n x n win rates.
+
+Example:
+    pool = TurnPool(100_000, seed=0)
+    estimate_matchup("greedy_max", "min_tiles", pool)["p1_win"]
+"""
+
+from collections.abc import Sequence
+from typing import Any, TypedDict
+
+import numpy as np
+import pandas as pd
+from scipy import stats as sps
+
+from .strategies import TARGET_AWARE_STRATEGIES
+from .turn_engine import TurnEngine
+
+# Fewest Player 2 turns simulated for any one conditioning target.
+MIN_CONDITIONAL_TURNS = 1_000
+
+
+class MatchupEstimate(TypedDict):
+    """Head-to-head estimate between two strategies.
+
+    Fields:
+        - p1_win: Probability that Player 1 wins (ties go to Player 1)
+        - p2_win: Probability that Player 2 wins
+        - tie: Probability of equal scores (included in p1_win)
+        - std_error: Standard error of p1_win (and p2_win)
+        - ci_low: Lower confidence bound of p1_win
+        - ci_high: Upper confidence bound of p1_win
+        - p1_turns: Player 1 turns used
+        - p2_turns: Player 2 turns used
+        - method: "u_statistic" or "conditional"
+    """
+
+    p1_win: float
+    p2_win: float
+    tie: float
+    std_error: float
+    ci_low: float
+    ci_high: float
+    p1_turns: int
+    p2_turns: int
+    method: str
+
+
+class TurnPool:
+    """
+    Cache of simulated single-turn scores per (strategy, target).
+
+    Args:
+        n_turns: Turns simulated per strategy moving first.
+        seed: Seed of the pool's RNG.
+        tiles: Number of tiles on the board.
+    """
+
+    def __init__(self, n_turns: int, seed: int | None = None, tiles: int = 9):
+        if n_turns < 2:
+            raise ValueError("n_turns must be at least 2")
+        self.n_turns = n_turns
+        self.tiles = tiles
+        self.engine = TurnEngine(tiles)
+        self.rng = np.random.default_rng(seed)
+        self._scores: dict[tuple[str, int | None], np.ndarray[Any, Any]] = {}
+
+    def scores(
+        self, strategy: str, target: int | None = None, n_turns: int | None = None
+    ) -> np.ndarray[Any, Any]:
+        """
+        Final scores of turns played by ``strategy`` against ``target`` (None
+        when moving first), simulated on first request and reused afterwards.
+        """
+        if strategy not in TARGET_AWARE_STRATEGIES:
+            target = None
+        key = (strategy, target)
+        scores = self._scores.get(key)
+        n = self.n_turns if n_turns is None else n_turns
+        if scores is None or len(scores) < n:
+            targets = None if target is None else np.full(n, target)
+            scores, _ = self.engine.play(strategy, targets, self.rng, n)
+            self._scores[key] = scores
+        return scores
+
+
+def _u_statistic(
+    a: np.ndarray[Any, Any], b: np.ndarray[Any, Any]
+) -> tuple[float, float, float]:
+    """(P(a <= b), P(a == b), standard error of the first) over all pairings."""
+    b_sorted = np.sort(b)
+    a_sorted = np.sort(a)
+    # Per Player 1 turn: share of Player 2 turns it beats or ties.
+    below = np.searchsorted(b_sorted, a, side="left")
+    above_or_equal = 1 - below / len(b)
+    ties = (np.searchsorted(b_sorted, a, side="right") - below) / len(b)
+    # Per Player 2 turn: share of Player 1 turns that beat or tie it.
+    beaten_by = np.searchsorted(a_sorted, b, side="right") / len(a)
+    variance = above_or_equal.var(ddof=1) / len(a) + beaten_by.var(ddof=1) / len(b)
+    return float(above_or_equal.mean()), float(ties.mean()), float(np.sqrt(variance))
+
+
+def _conditional(
+    pool: TurnPool, a: np.ndarray[Any, Any], p2_strategy: str
+) -> tuple[float, float, float, int]:
+    """(P(P2 wins), P(tie), standard error, P2 turns) for a target-aware P2."""
+    levels, counts = np.unique(a, return_counts=True)
+    share = counts / len(a)
+    wins = np.zeros(len(levels))
+    ties = np.zeros(len(levels))
+    sampling_var = np.zeros(len(levels))
+    used = 0
+    for i, (level, weight) in enumerate(zip(levels.tolist(), share, strict=True)):
+        n = max(MIN_CONDITIONAL_TURNS, int(np.ceil(weight * pool.n_turns)))
+        b = pool.scores(p2_strategy, level, n)
+        used += len(b)
+        wins[i] = np.mean(b < level)
+        ties[i] = np.mean(b == level)
+        sampling_var[i] = wins[i] * (1 - wins[i]) / len(b)
+    p2_win = float(share @ wins)
+    # Variance from Player 1's score distribution plus from each conditional rate.
+    variance = (share @ wins**2 - p2_win**2) / len(a) + share**2 @ sampling_var
+    return p2_win, float(share @ ties), float(np.sqrt(variance)), used
+
+
+def estimate_matchup(
+    p1_strategy: str,
+    p2_strategy: str,
+    pool: TurnPool | None = None,
+    n_turns: int = 100_000,
+    confidence: float = 0.95,
+    seed: int | None = None,
+) -> MatchupEstimate:
+    """
+    Estimate head-to-head win rates from pooled single turns.
+
+    Args:
+        p1_strategy: Strategy moving first (see strategies.STRATEGY_MAP)
+        p2_strategy: Strategy moving second (sees Player 1's score as its target)
+        pool: Turn pool to draw from (and extend); a new one by default
+        n_turns: Turns per strategy when creating a pool
+        confidence: Two-sided confidence level of the p1_win interval
+        seed: Seed when creating a pool
+
+    Returns:
+        MatchupEstimate
+    """
+    pool = pool if pool is not None else TurnPool(n_turns, seed)
+    a = pool.scores(p1_strategy)
+    if p2_strategy in TARGET_AWARE_STRATEGIES:
+        p2_win, tie, std_error, p2_turns = _conditional(pool, a, p2_strategy)
+        p1_win = 1.0 - p2_win
+        method = "conditional"
+    else:
+        b = pool.scores(p2_strategy)
+        if p2_strategy == p1_strategy:
+            # Pair two disjoint halves so no turn is paired with itself.
+            a, b = a[: len(a) // 2], a[len(a) // 2 :]
+        p1_win, tie, std_error = _u_statistic(a, b)
+        p2_win = 1.0 - p1_win
+        p2_turns = len(b)
+        method = "u_statistic"
+    z = float(sps.norm.ppf(0.5 + confidence / 2))
+    return MatchupEstimate(
+        p1_win=p1_win,
+        p2_win=p2_win,
+        tie=tie,
+        std_error=std_error,
+        ci_low=max(0.0, p1_win - z * std_error),
+        ci_high=min(1.0, p1_win + z * std_error),
+        p1_turns=len(a),
+        p2_turns=p2_turns,
+        method=method,
+    )
+
+
+def matchup_matrix(
+    strategies: Sequence[str],
+    pool: TurnPool | None = None,
+    n_turns: int = 100_000,
+    seed: int | None = None,
+) -> pd.DataFrame:
+    """
+    Player 1 win rate for every ordered pair of ``strategies``, all estimated
+    from one shared TurnPool (rows: Player 1, columns: Player 2).
+    """
+    pool = pool if pool is not None else TurnPool(n_turns, seed)
+    return pd.DataFrame(
+        [
+            [estimate_matchup(p1, p2, pool)["p1_win"] for p2 in strategies]
+            for p1 in strategies
+        ],
+        index=pd.Index(strategies, name="p1_strategy"),
+        columns=pd.Index(strategies, name="p2_strategy"),
+    )
@@ -1,7 +1,12 @@
 class Player:
-    def __init__(self, name: str):
+    """A player and the name of the strategy (see strategies.STRATEGY_MAP) it plays."""
+
+    __slots__ = ("name", "score", "strategy")
+
+    def __init__(self, name: str, strategy: str = "min_tiles"):
         self.name = name
         self.score = 0
+        self.strategy = strategy
 
     def update_score(self, score: int) -> None:
         self.score = score
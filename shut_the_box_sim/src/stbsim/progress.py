@@ -0,0 +1,144 @@
+"""
+Batched progress telemetry for long simulation runs.
+
+A ProgressTracker receives completed-game counts from any number of workers
+(advance() is thread-safe) and, at most once per ``every`` games, calls a
+callback with a ProgressReport: games completed, overall games/sec, a moving
+average of recent throughput and an ETA. Runners report per batch, so the
+per-game cost of progress reporting is zero.
+
+Example:
+    def show(report: ProgressReport) -> None:
+        print(f"{report['games_completed']} games, {report['games_per_sec']:.0f}/s")
+
+    Simulation().run(1_000_000, "greedy_max", "min_tiles", progress=show)
+"""
+
+import json
+import threading
+import time
+from collections.abc import Callable
+from typing import IO, TypedDict
+
+
+class ProgressReport(TypedDict):
+    """Snapshot of a run's progress.
+
+    Fields:
+        - games_completed: Games finished so far, across all workers
+        - total_games: Games requested for the run
+        - elapsed_seconds: Wall-clock time since the tracker started
+        - games_per_sec: Overall throughput since the start
+        - moving_avg_games_per_sec: Exponential moving average of recent throughput
+        - eta_seconds: Estimated time remaining (None until a rate is known)
+        - done: True for the final report of the run
+    """
+
+    games_completed: int
+    total_games: int
+    elapsed_seconds: float
+    games_per_sec: float
+    moving_avg_games_per_sec: float
+    eta_seconds: float | None
+    done: bool
+
+
+ProgressCallback = Callable[[ProgressReport], None]
+
+DEFAULT_REPORT_EVERY = 1_000
+
+
+class ProgressTracker:
+    """
+    Aggregates completed-game counts and emits batched ProgressReports.
+
+    Args:
+        total_games: Games in the whole run.
+        callback: Called with each report (from the thread that crossed the
+            reporting threshold).
+        every: Minimum number of games between reports.
+        smoothing: Weight of the newest interval in the moving average.
+    """
+
+    def __init__(
+        self,
+        total_games: int,
+        callback: ProgressCallback,
+        every: int = DEFAULT_REPORT_EVERY,
+        smoothing: float = 0.3,
+    ):
+        self.total_games = total_games
+        self.callback = callback
+        self.every = max(1, every)
+        self.smoothing = smoothing
+        self.completed = 0
+        self._lock = threading.Lock()
+        self._start = time.perf_counter()
+        self._last_time = self._start
+        self._last_completed = 0
+        self._moving_rate = 0.0
+        self._finished = False
+
+    def advance(self, n_games: int) -> None:
+        """Record ``n_games`` more finished games (safe to call from any thread)."""
+        with self._lock:
+            self.completed += n_games
+            if (
+                self.completed - self._last_completed < self.every
+                or self.completed >= self.total_games
+            ):
+                return  # The last batch is reported by finish().
+            report = self._report(done=False)
+        self.callback(report)
+
+    def finish(self) -> None:
+        """Emit the final report (once)."""
+        with self._lock:
+            if self._finished:
+                return
+            self._finished = True
+            report = self._report(done=True)
+        self.callback(report)
+
+    def _report(self, done: bool) -> ProgressReport:
+        now = time.perf_counter()
+        interval = now - self._last_time
+        if interval > 0 and self.completed > self._last_completed:
+            rate = (self.completed - self._last_completed) / interval
+            if self._moving_rate:
+                rate = self.smoothing * rate + (1 - self.smoothing) * self._moving_rate
+            self._moving_rate = rate
+        self._last_time = now
+        self._last_completed = self.completed
+        elapsed = now - self._start
+        remaining = max(0, self.total_games - self.completed)
+        eta = remaining / self._moving_rate if self._moving_rate else None
+        return ProgressReport(
+            games_completed=self.completed,
+            total_games=self.total_games,
+            elapsed_seconds=elapsed,
+            games_per_sec=self.completed / elapsed if elapsed > 0 else 0.0,
+            moving_avg_games_per_sec=self._moving_rate,
+            eta_seconds=0.0 if done else eta,
+            done=done,
+        )
+
+
+def json_lines_writer(stream: IO[str]) -> ProgressCallback:
+    """Callback writing each report as one JSON line (for job dashboards)."""
+
+    def write(report: ProgressReport) -> None:
+        stream.write(json.dumps(report) + "\n")
+        stream.flush()
+
+    return write
+
+
+def fan_out(*callbacks: ProgressCallback) -> ProgressCallback:
+    """Combine several callbacks into one."""
+
+    def call_all(report: ProgressReport) -> None:
+        for callback in callbacks:
+            callback(report)
+
+    return call_all
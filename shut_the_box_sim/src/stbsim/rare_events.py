@@ -0,0 +1,174 @@
+"""
+Variance-reduced estimators for rare outcomes (shutting the box).
+
+A game "shuts the box" when either player flips every tile, which happens in
+only a few percent of games, so the plain shut_box_frequency of a Simulation
+needs very large runs to pin down. estimate_shut_box() offers two unbiased
+alternatives, both playing whole batches of turns as arrays through the
+strategies' batch interface (see turn_engine.py):
+
+    - "importance" (the variance-reduction method): dice are drawn only from
+      rolls that have a valid move, so every sampled turn shuts the box, and
+      each step is reweighted by the probability of not busting. The weight of
+      a turn is then exactly its probability of shutting along the sampled
+      path. Worth about 8 plain games per game for greedy_max vs beat_target.
+    - "stratified": games are stratified by the opening roll of each player
+      (121 strata with known dice probabilities), with proportional
+      allocation. This is NOT a variance-reduction method here: the chance of
+      shutting the box barely depends on the opening rolls (0.08-0.16 across
+      strata for greedy_max vs beat_target), so its variance reduction factor
+      is about 1.0, and Neyman allocation would not do better (about 1.005).
+      It is kept as an independent unbiased cross-check.
+
+Each estimate reports its standard error, a confidence interval and the
+variance reduction factor against plain Monte Carlo with the same number of
+games (equivalently, how many plain games the estimate is worth).
+
+Example:
+    est = estimate_shut_box(20_000, "greedy_max", "min_tiles", seed=0)
+    est["estimate"], est["variance_reduction"]
+"""
+
+from typing import Any, Literal, TypedDict
+
+import numpy as np
+from scipy import stats as sps
+
+from .solver import dice_total_probs
+from .stats import proportion_ci
+from .turn_engine import MAX_ROLL, TurnEngine
+
+EstimatorMethod = Literal["plain", "stratified", "importance"]
+
+
+class RareEventEstimate(TypedDict):
+    """Estimate of a game-level event probability.
+
+    Fields:
+        - estimate: Unbiased estimate of the probability
+        - std_error: Standard error of the estimate
+        - ci_low: Lower confidence bound
+        - ci_high: Upper confidence bound
+        - n_games: Games simulated
+        - method: Estimator used
+        - variance_reduction: Plain Monte Carlo variance with the same n_games
+          divided by this estimator's variance (1.0 for "plain")
+        - equivalent_games: Plain games needed for the same standard error
+    """
+
+    estimate: float
+    std_error: float
+    ci_low: float
+    ci_high: float
+    n_games: int
+    method: str
+    variance_reduction: float
+    equivalent_games: float
+
+
+def _opening_strata(tiles: int) -> np.ndarray[Any, Any]:
+    """Probability of each opening roll total 1..MAX_ROLL on a full board."""
+    n_dice = 2 if tiles >= 7 else 1
+    return dice_total_probs(n_dice)[1 : MAX_ROLL + 1]
+
+
+def estimate_shut_box(
+    n_games: int,
+    p1_strategy: str,
+    p2_strategy: str,
+    method: EstimatorMethod = "importance",
+    confidence: float = 0.95,
+    seed: int | None = None,
+    tiles: int = 9,
+) -> RareEventEstimate:
+    """
+    Estimate the probability that a game shuts the box (either player scores 0).
+
+    Player 2 sees Player 1's score as its target, as in Game.start_game().
+
+    Args:
+        n_games: Games to simulate (stratified runs round up so every stratum
+            gets at least two games)
+        p1_strategy: Strategy for Player 1 (see strategies.STRATEGY_MAP)
+        p2_strategy: Strategy for Player 2
+        method: "plain", "stratified" or "importance" (see module docstring;
+            only "importance" reduces variance)
+        confidence: Two-sided confidence level of the interval
+        seed: Seed for the estimator's RNG
+        tiles: Number of tiles on the board
+
+    Returns:
+        RareEventEstimate
+    """
+    if n_games < 2:
+        raise ValueError("n_games must be at least 2")
+    rng = np.random.default_rng(seed)
+    engine = TurnEngine(tiles)
+    z = float(sps.norm.ppf(0.5 + confidence / 2))
+
+    if method == "plain":
+        s1, _ = engine.play(p1_strategy, None, rng, n_games)
+        s2, _ = engine.play(p2_strategy, s1, rng, n_games)
+        shut = (s1 == 0) | (s2 == 0)
+        k = int(shut.sum())
+        lower, upper = proportion_ci(k, n_games, confidence)
+        p = k / n_games
+        return RareEventEstimate(
+            estimate=p,
+            std_error=float(np.sqrt(p * (1 - p) / n_games)),
+            ci_low=float(lower),
+            ci_high=float(upper),
+            n_games=n_games,
+            method=method,
+            variance_reduction=1.0,
+            equivalent_games=float(n_games),
+        )
+
+    if method == "stratified":
+        opening = _opening_strata(tiles)
+        strata_p = np.outer(opening, opening).ravel()
+        occupied = np.flatnonzero(strata_p > 0)
+        counts = np.zeros(strata_p.size, dtype=np.int64)
+        counts[occupied] = np.maximum(2, np.rint(strata_p[occupied] * n_games))
+        stratum = np.repeat(np.arange(strata_p.size), counts)
+        n = stratum.size
+        s1, _ = engine.play(
+            p1_strategy, None, rng, n, first_roll=stratum // MAX_ROLL + 1
+        )
+        s2, _ = engine.play(p2_strategy, s1, rng, n, first_roll=stratum % MAX_ROLL + 1)
+        shut = ((s1 == 0) | (s2 == 0)).astype(np.float64)
+        hits = np.bincount(stratum, weights=shut, minlength=strata_p.size)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            means = np.where(counts > 0, hits / counts, 0.0)
+            # Sample variance of a 0/1 outcome within each stratum.
+            variances = np.where(
+                counts > 1, means * (1 - means) * counts / (counts - 1), 0.0
+            )
+            estimate = float(strata_p @ means)
+            variance = float(np.sum(strata_p**2 * variances / np.maximum(counts, 1)))
+    elif method == "importance":
+        n = n_games
+        # Independent plain turn for Player 1's score (Player 2's target).
+        s1, _ = engine.play(p1_strategy, None, rng, n)
+        _, w1 = engine.play(p1_strategy, None, rng, n, conditioned=True)
+        _, w2 = engine.play(p2_strategy, s1, rng, n, conditioned=True)
+        # P(A or B) = P(A) + E[1{P1 scored > 0} * P(B | P1's score)]
+        y = w1 + (s1 > 0) * w2
+        estimate = float(y.mean())
+        variance = float(y.var(ddof=1) / n)
+    else:
+        raise ValueError(f"Unknown estimator method: {method}")
+
+    std_error = float(np.sqrt(variance))
+    plain_variance = estimate * (1 - estimate) / n
+    reduction = plain_variance / variance if variance > 0 else float("inf")
+    return RareEventEstimate(
+        estimate=estimate,
+        std_error=std_error,
+        ci_low=max(0.0, estimate - z * std_error),
+        ci_high=min(1.0, estimate + z * std_error),
+        n_games=n,
+        method=method,
+        variance_reduction=reduction,
+        equivalent_games=n * reduction,
+    )
@@ -0,0 +1,222 @@
+"""
+Dice-distribution reweighting of recorded simulations.
+
+With deterministic strategies, a game is a function of its dice alone, and
+every die roll is independent. The likelihood ratio of a recorded game under
+other face probabilities q, against the fair dice p it was played with, is
+therefore
+
+    w = prod_f (q_f / p_f) ** c_f
+
+where c_f counts the rolls that showed face f. Per-game face counts are
+sufficient statistics for any reweighting. record_dice() runs a simulation
+with a DiceFaceCounts hook (a few bytes per game), and reweight() estimates
+summary stats under any face distribution as self-normalized weighted means
+of the recorded games. The effective sample size (ESS) of the weights tells
+how many fair games the estimate is worth: it shrinks as q moves away from
+p. A sensitivity sweep (reweight_sweep()) costs one simulation plus one
+weighted mean per distribution.
+
+Example:
+    record = record_dice(200_000, "greedy_max", "min_tiles", seed_start=0)
+    reweight(record, loaded_die(6, 0.1))["summary"]["p1_win_rate"]
+"""
+
+from array import array
+from collections.abc import Mapping, Sequence
+from typing import Any, TypedDict
+
+import numpy as np
+import pandas as pd
+
+from .hooks import HookRegistry
+from .rules import RuleVariant
+from .simulation import Simulation
+from .solver import DIE_FACES
+from .stats import results_to_arrays
+
+
+class DiceFaceCounts:
+    """
+    Hook subscriber counting, per game, the rolls that showed each die face.
+
+    Counts are uint16 in one flat buffer (game ``g``, face ``f`` at
+    ``g * faces + f - 1``), allocated up front for ``n_games`` games so
+    worker threads never resize it.
+    """
+
+    def __init__(self, n_games: int, faces: int = DIE_FACES):
+        self.n_games = n_games
+        self.faces = faces
+        self.counts = array("H", bytes(2 * n_games * faces))
+
+    def subscribe(self, hooks: HookRegistry) -> None:
+        counts, faces = self.counts, self.faces
+
+        def on_dice_roll(tm: Any, roll_values: list[int]) -> None:
+            base = tm.game_id * faces - 1
+            for value in roll_values:
+                counts[base + value] += 1
+
+        hooks.subscribe("dice_roll", on_dice_roll)
+
+    def array(self) -> np.ndarray[Any, Any]:
+        """(n_games, faces) face counts."""
+        return np.frombuffer(self.counts, dtype=np.uint16).reshape(-1, self.faces)
+
+
+class DiceRecord(TypedDict):
+    """A simulation plus the face counts of every game.
+
+    Fields:
+        - results: Per-game summaries (see simulation.py)
+        - face_counts: (n_games, faces) rolls per face in each game
+        - face_probs: Face probabilities the games were played with
+    """
+
+    results: list[dict[str, Any]]
+    face_counts: np.ndarray[Any, Any]
+    face_probs: np.ndarray[Any, Any]
+
+
+class ReweightedSummary(TypedDict):
+    """Summary stats estimated under another dice distribution.
+
+    Fields:
+        - summary: Same keys as stats.calculate_summary_stats()
+        - std_error: Delta-method standard error of each averaged statistic
+        - face_probs: Face probabilities reweighted to
+        - ess: Effective sample size of the weights
+        - ess_fraction: ESS / number of recorded games
+        - max_weight_share: Largest single game's share of the total weight
+    """
+
+    summary: dict[str, Any]
+    std_error: dict[str, float]
+    face_probs: list[float]
+    ess: float
+    ess_fraction: float
+    max_weight_share: float
+
+
+def loaded_die(face: int, bias: float, faces: int = DIE_FACES) -> np.ndarray[Any, Any]:
+    """
+    Face probabilities of a die loaded towards ``face``: it shows with
+    probability (1 + bias) / faces and the other faces share the rest evenly.
+    """
+    if not 1 <= face <= faces:
+        raise ValueError(f"face must be between 1 and {faces}")
+    if not -1.0 <= bias <= faces - 1:
+        raise ValueError(f"bias must be between -1 and {faces - 1}")
+    probs = np.full(faces, (1 - bias / (faces - 1)) / faces)
+    probs[face - 1] = (1 + bias) / faces
+    return probs
+
+
+def record_dice(
+    n_games: int,
+    p1_strategy: str,
+    p2_strategy: str,
+    seed_start: int | None = None,
+    variant: RuleVariant | str | None = None,
+    tiles: int = 9,
+    workers: int | None = 1,
+) -> DiceRecord:
+    """Run a simulation (see Simulation.run) recording each game's face counts."""
+    counter = DiceFaceCounts(n_games)
+    hooks = HookRegistry()
+    counter.subscribe(hooks)
+    results = Simulation().run(
+        n_games,
+        p1_strategy,
+        p2_strategy,
+        seed_start=seed_start,
+        hooks=hooks,
+        workers=workers,
+        variant=variant,
+        tiles=tiles,
+    )
+    return DiceRecord(
+        results=results,
+        face_counts=counter.array(),
+        face_probs=np.full(counter.faces, 1.0 / counter.faces),
+    )
+
+
+def likelihood_weights(
+    face_counts: np.ndarray[Any, Any],
+    face_probs: Sequence[float] | np.ndarray[Any, Any],
+    base_probs: Sequence[float] | np.ndarray[Any, Any],
+) -> np.ndarray[Any, Any]:
+    """
+    Per-game likelihood ratios of ``face_probs`` against ``base_probs``,
+    normalized to sum to 1.
+    """
+    q = np.asarray(face_probs, dtype=np.float64)
+    p = np.asarray(base_probs, dtype=np.float64)
+    if q.shape != p.shape or (q < 0).any() or not np.isclose(q.sum(), 1.0):
+        raise ValueError(f"face_probs must be {len(p)} probabilities summing to 1")
+    with np.errstate(divide="ignore"):
+        log_ratio = np.log(q) - np.log(p)
+    # Faces that cannot occur under q contribute 0 * -inf; treat as 0.
+    log_w = face_counts @ np.where(np.isfinite(log_ratio), log_ratio, 0.0)
+    impossible = face_counts[:, ~np.isfinite(log_ratio)].any(axis=1)
+    log_w = np.where(impossible, -np.inf, log_w)
+    if not np.isfinite(log_w).any():
+        raise ValueError("No recorded game is possible under face_probs")
+    w = np.exp(log_w - log_w.max())
+    weights: np.ndarray[Any, Any] = w / w.sum()
+    return weights
+
+
+def reweight(
+    record: DiceRecord, face_probs: Sequence[float] | np.ndarray[Any, Any]
+) -> ReweightedSummary:
+    """
+    Estimate summary stats as if the recorded games had been played with dice
+    showing each face f with probability face_probs[f - 1].
+    """
+    w = likelihood_weights(record["face_counts"], face_probs, record["face_probs"])
+    cols = results_to_arrays(record["results"])
+    n = len(w)
+    summary: dict[str, Any] = {}
+    std_error: dict[str, float] = {}
+    for key, column in (
+        ("p1_win_rate", "p1_win"),
+        ("p2_win_rate", "p2_win"),
+        ("p1_avg_score", "p1_score"),
+        ("p2_avg_score", "p2_score"),
+        ("shut_box_frequency", "shut_box"),
+    ):
+        x = cols[column].astype(np.float64)
+        mean = float(w @ x)
+        summary[key] = mean
+        std_error[key] = float(np.sqrt(w**2 @ (x - mean) ** 2))
+    summary["total_games"] = n
+    ess = float(1.0 / (w @ w))
+    return ReweightedSummary(
+        summary=summary,
+        std_error=std_error,
+        face_probs=[float(q) for q in face_probs],
+        ess=ess,
+        ess_fraction=ess / n,
+        max_weight_share=float(w.max()),
+    )
+
+
+def reweight_sweep(
+    record: DiceRecord,
+    distributions: Mapping[str, Sequence[float] | np.ndarray[Any, Any]],
+) -> pd.DataFrame:
+    """
+    reweight() for every labelled face distribution; one row per label with
+    the summary stats, their standard errors (``<key>_se``) and ESS columns.
+    """
+    rows = []
+    for label, probs in distributions.items():
+        est = reweight(record, probs)
+        row: dict[str, Any] = {"distribution": label, **est["summary"]}
+        row.update({f"{key}_se": se for key, se in est["std_error"].items()})
+        row.update(ess=est["ess"], ess_fraction=est["ess_fraction"])
+        rows.append(row)
+    return pd.DataFrame(rows).set_index("distribution")
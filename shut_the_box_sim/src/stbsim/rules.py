@@ -0,0 +1,190 @@
+"""
+House-rule variants of Shut the Box.
+
+A RuleVariant describes what house rules change: how many dice are rolled,
+how a rack is scored and how many rounds a match lasts. Moves (any combo of
+upright tiles summing to the roll) are the same in every variant. Before a run
+the engine compiles the variant into per-rack tables (CompiledRules): the
+number of dice to roll and the score of every rack bitmask. The game loop only
+indexes those tables, so a variant costs no more per move than the standard
+rules.
+
+Built-in variants (RULE_VARIANTS):
+    - "standard": one die once every tile above 6 (7, 8 and 9 on the classic
+      board) is down; a rack scores the sum of its upright tiles; one round.
+    - "digits": upright tiles are read as one number in ascending order
+      (1, 4 and 7 up scores 147).
+    - "one_die_6": one die once the upright tiles sum to 6 or less.
+    - "down_and_out": all or nothing: a rack that is not shut scores the full
+      board.
+    - "match_3": three rounds; players are ranked by their total score.
+    - "three_dice": three dice instead of two until every tile above 6 is
+      down (for large boards, e.g. 16 tiles).
+
+Rule-aware strategies (strategies.RULES_AWARE_STRATEGIES) plan under the
+game's variant: solver.solve_tables() can solve, and learning.train_policy()
+learn, any variant.
+
+Example:
+    Simulation().run(1_000, "greedy_max", "min_tiles", variant="digits")
+    RULE_VARIANTS["one_die_6"].compile(9).dice_counts[0b111]  # -> 1
+"""
+
+from typing import Literal
+
+from .board import mask_numbers
+
+# Bits of every tile above 6 (7, 8 and 9 on the classic board, up to 16 on
+# large ones): under the standard rule two dice are rolled while any of them
+# is up, since a single die cannot reach them.
+HIGH_TILES_MASK = -1 << 6
+
+Scoring = Literal["sum", "digits"]
+
+
+class CompiledRules:
+    """
+    Per-rack lookup tables of a RuleVariant for one board size.
+
+    Attributes:
+        tiles: Number of tiles on the board.
+        rounds: Rounds per match.
+        dice_counts: Dice to roll for each rack bitmask.
+        scores: Final score of each rack bitmask.
+        variant: The RuleVariant the tables were compiled from.
+    """
+
+    __slots__ = ("tiles", "rounds", "dice_counts", "scores", "variant")
+
+    def __init__(
+        self,
+        tiles: int,
+        rounds: int,
+        dice_counts: list[int],
+        scores: list[int],
+        variant: "RuleVariant",
+    ):
+        self.tiles = tiles
+        self.rounds = rounds
+        self.dice_counts = dice_counts
+        self.scores = scores
+        self.variant = variant
+
+
+class RuleVariant:
+    """
+    A set of house rules.
+
+    Args:
+        name: Variant name.
+        scoring: "sum" (sum of upright tiles) or "digits" (upright tiles
+            concatenated in ascending order).
+        dice: Dice rolled until the one-die rule applies.
+        one_die_at: Roll one die once the upright tiles sum to at most this;
+            None for the standard rule (one die once every tile above 6 is
+            down).
+        down_and_out: A rack that is not shut scores the full board.
+        rounds: Rounds per match; a player's score is the total over rounds.
+    """
+
+    __slots__ = (
+        "name",
+        "scoring",
+        "dice",
+        "one_die_at",
+        "down_and_out",
+        "rounds",
+        "_compiled",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        scoring: Scoring = "sum",
+        dice: int = 2,
+        one_die_at: int | None = None,
+        down_and_out: bool = False,
+        rounds: int = 1,
+    ):
+        if scoring not in ("sum", "digits"):
+            raise ValueError(f"Unknown scoring rule: {scoring}")
+        if rounds < 1 or dice < 1:
+            raise ValueError("rounds and dice must be at least 1")
+        self.name = name
+        self.scoring = scoring
+        self.dice = dice
+        self.one_die_at = one_die_at
+        self.down_and_out = down_and_out
+        self.rounds = rounds
+        self._compiled: dict[int, CompiledRules] = {}
+
+    def dice_count(self, mask: int) -> int:
+        """Dice to roll with rack ``mask`` up."""
+        if self.one_die_at is None:
+            return self.dice if mask & HIGH_TILES_MASK else 1
+        return 1 if sum(mask_numbers(mask)) <= self.one_die_at else self.dice
+
+    def score(self, mask: int, tiles: int) -> int:
+        """Final score of rack ``mask`` on a board of ``tiles`` tiles."""
+        if self.down_and_out and mask:
+            mask = (1 << tiles) - 1
+        numbers = mask_numbers(mask)
+        if self.scoring == "digits":
+            return int("".join(map(str, numbers))) if numbers else 0
+        return sum(numbers)
+
+    def compile(self, tiles: int = 9) -> CompiledRules:
+        """The variant's lookup tables for ``tiles`` (built once per size)."""
+        compiled = self._compiled.get(tiles)
+        if compiled is None:
+            masks = range(1 << tiles)
+            compiled = CompiledRules(
+                tiles,
+                self.rounds,
+                [self.dice_count(mask) for mask in masks],
+                [self.score(mask, tiles) for mask in masks],
+                self,
+            )
+            self._compiled[tiles] = compiled
+        return compiled
+
+    @property
+    def cache_key(self) -> str:
+        """
+        The variant in artifact cache keys: a built-in variant's name, else its
+        per-turn rules spelled out (so a custom variant never reads the tables
+        of a built-in one with the same name).
+        """
+        if RULE_VARIANTS.get(self.name) is self:
+            return self.name
+        one_die = "789" if self.one_die_at is None else self.one_die_at
+        return (
+            f"{self.name}[{self.scoring},dice={self.dice},one_die={one_die},"
+            f"down_and_out={int(self.down_and_out)}]"
+        )
+
+    def __repr__(self) -> str:
+        return f"RuleVariant({self.name!r})"
+
+
+STANDARD = RuleVariant("standard")
+
+RULE_VARIANTS: dict[str, RuleVariant] = {
+    "standard": STANDARD,
+    "digits": RuleVariant("digits", scoring="digits"),
+    "one_die_6": RuleVariant("one_die_6", one_die_at=6),
+    "down_and_out": RuleVariant("down_and_out", down_and_out=True),
+    "match_3": RuleVariant("match_3", rounds=3),
+    "three_dice": RuleVariant("three_dice", dice=3),
+}
+
+
+def rule_variant(variant: RuleVariant | str | None) -> RuleVariant:
+    """Resolve a variant or variant name (None: the standard rules)."""
+    if variant is None:
+        return STANDARD
+    if isinstance(variant, RuleVariant):
+        return variant
+    if variant not in RULE_VARIANTS:
+        raise ValueError(f"Unknown rule variant: {variant}")
+    return RULE_VARIANTS[variant]
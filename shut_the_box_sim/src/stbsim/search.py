@@ -0,0 +1,269 @@
+"""
+Successive-halving search over parameterized strategy families.
+
+A weighted strategy scores every valid move by a weighted sum of features
+and flips the best one. The features are:
+    - tiles: number of tiles flipped
+    - max_tile: largest tile flipped
+    - high_sum: sum of the tiles above 6 left up (they decide when one die
+      is rolled)
+The sum of the tiles left up is the same for every move of a roll (it drops
+by the roll), so it cannot rank moves and is not a feature. A family member
+is compiled into a move table with a few array operations over the solver's
+MoveTable and registered in batch form (see strategies.register_batch_strategy).
+It is therefore available to Simulation and to the array TurnEngine alike.
+
+successive_halving() tunes the weights against an opponent. Each round, the
+surviving candidates play the same number of games on a shared dice stream:
+every candidate's turns draw from an RNG with the same seed, and TurnEngine
+gives game ``i`` the same draw at every step, so candidates see the same
+rolls until their boards diverge. The worse half is then
+discarded. Rounds get an equal share of the game budget, so the games per
+candidate double each round and compute concentrates on the contenders.
+Games are played through TurnEngine, and candidates within a round can be
+spread over worker threads.
+
+Example:
+    names = [register_weighted_strategy(w) for w in sample_weights(64, seed=0)]
+    successive_halving(names, opponent="min_tiles", budget=400_000, seed=0)
+"""
+
+import math
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, partial
+
+import numpy as np
+import pandas as pd
+
+from .rules import HIGH_TILES_MASK
+from .solver import shared_move_table
+from .stats import proportion_ci
+from .strategies import (
+    BATCH_STRATEGY_MAP,
+    TARGET_AWARE_STRATEGIES,
+    Array,
+    check_rolls,
+    register_batch_strategy,
+    table_max_roll,
+)
+from .turn_engine import MAX_ROLL, TurnEngine
+
+FEATURES = ("tiles", "max_tile", "high_sum")
+
+Weights = tuple[float, float, float]
+
+
+@cache
+def _move_features(
+    tiles: int, max_roll: int = MAX_ROLL
+) -> tuple[Array, Array, Array, Array]:
+    """
+    (features, cell starts, cell counts, flip per entry) over every entry of
+    the MoveTable for ``tiles`` and ``max_roll``, with cells indexed by rack
+    mask, not rank.
+    """
+    table = shared_move_table(tiles, max_roll)
+    n_masks = 1 << tiles
+    masks = np.repeat(np.arange(n_masks), max_roll)
+    rolls = np.tile(np.arange(max_roll), n_masks)
+    cell = table.rank[masks] * max_roll + rolls
+    start = table.ptr[cell]
+    count = table.ptr[cell + 1] - start
+    entry_mask = np.repeat(
+        np.arange(len(table.ptr) - 1) // max_roll, np.diff(table.ptr)
+    )
+    succ = np.asarray(table.succ, dtype=np.int64)
+    flip = table.order[entry_mask] ^ succ
+    bits = (flip[:, None] >> np.arange(tiles)) & 1
+    features = np.stack(
+        [
+            bits.sum(axis=1),
+            (bits * np.arange(1, tiles + 1)).max(axis=1),
+            table.tile_sum[succ & HIGH_TILES_MASK],
+        ],
+        axis=1,
+    ).astype(np.float64)
+    return features, start, count, flip
+
+
+def weighted_moves(
+    weights: Sequence[float], tiles: int = 9, max_roll: int = MAX_ROLL
+) -> Array:
+    """
+    Move table of the weighted strategy (see compile_moves() for the layout):
+    in every cell, the highest-scoring move, ties going to the first in
+    MoveTable order.
+    """
+    features, start, count, flip = _move_features(tiles, max_roll)
+    score = features @ np.asarray(weights, dtype=np.float64)
+    live = count > 0
+    start, count = start[live], count[live]
+    offsets = np.cumsum(count) - count
+    entry = np.repeat(start - offsets, count) + np.arange(int(count.sum()))
+    entry_score = score[entry]
+    best = np.maximum.reduceat(entry_score, offsets)
+    position = np.where(
+        entry_score == np.repeat(best, count), np.arange(entry.size), entry.size
+    )
+    chosen = entry[np.minimum.reduceat(position, offsets)]
+    moves = np.zeros((1 << tiles) * max_roll, dtype=np.uint16)
+    moves[live] = flip[chosen]
+    return moves
+
+
+def weighted_strategy(
+    weights: Sequence[float],
+) -> Callable[[Array, Array, Array | None], Array]:
+    """Batch strategy flipping the move with the highest weighted feature score."""
+    tables: dict[tuple[int, int], Array] = {}
+
+    def choose(masks: Array, rolls: Array, targets: Array | None) -> Array:
+        masks = np.asarray(masks, dtype=np.int64)
+        rolls = np.asarray(rolls, dtype=np.int64)
+        tiles = max(9, int(masks.max(initial=0)).bit_length())
+        max_roll = table_max_roll(rolls)
+        check_rolls(rolls, max_roll)
+        moves = tables.get((tiles, max_roll))
+        if moves is None:
+            moves = tables[tiles, max_roll] = weighted_moves(weights, tiles, max_roll)
+        return np.asarray(moves[masks * max_roll + rolls - 1], dtype=np.int64)
+
+    return choose
+
+
+def weighted_name(weights: Sequence[float]) -> str:
+    """Strategy name of ``weights`` (exact, so distinct weights never collide)."""
+    return "weighted[" + ",".join(repr(float(w)) for w in weights) + "]"
+
+
+def register_weighted_strategy(
+    weights: Sequence[float], name: str | None = None
+) -> str:
+    """Register a weighted strategy (in STRATEGY_MAP too); return its name."""
+    name = name if name is not None else weighted_name(weights)
+    if name not in BATCH_STRATEGY_MAP:
+        register_batch_strategy(name, weighted_strategy(weights))
+    return name
+
+
+def sample_weights(n: int, seed: int | None = None) -> list[Weights]:
+    """``n`` weight vectors drawn uniformly from [-1, 1] per feature."""
+    rng = np.random.default_rng(seed)
+    return [
+        (float(a), float(b), float(c))
+        for a, b, c in rng.uniform(-1, 1, (n, len(FEATURES)))
+    ]
+
+
+def successive_halving(
+    candidates: Sequence[str],
+    opponent: str = "min_tiles",
+    budget: int = 200_000,
+    keep: int = 1,
+    eta: int = 2,
+    confidence: float = 0.95,
+    seed: int | None = None,
+    workers: int = 1,
+    tiles: int = 9,
+    callback: Callable[[int, pd.DataFrame], None] | None = None,
+) -> pd.DataFrame:
+    """
+    Find the candidates with the best win rate against ``opponent``.
+
+    Each candidate moves first (winning ties, as in Game), and the opponent
+    plays second with the candidate's score as its target.
+
+    Args:
+        candidates: Strategy names (see strategies.STRATEGY_MAP)
+        opponent: Strategy to beat
+        budget: Total games over all rounds and candidates
+        keep: Survivors to stop at
+        eta: Each round keeps the best 1/eta of the candidates
+        confidence: Two-sided confidence level of the win-rate intervals
+        seed: Seed of the shared dice streams
+        workers: Threads evaluating a round's candidates
+        tiles: Number of tiles on the board
+        callback: Called after each round with (round, standings)
+
+    Returns:
+        DataFrame indexed by candidate: games, wins, win_rate, ci_low, ci_high,
+        rounds (rounds played) and survivor; survivors first, then by win rate
+    """
+    if len(set(candidates)) != len(candidates) or not candidates:
+        raise ValueError("candidates must be distinct and non-empty")
+    if keep < 1 or eta < 2:
+        raise ValueError("keep must be at least 1 and eta at least 2")
+    engine = TurnEngine(tiles)
+    n_rounds = max(1, math.ceil(math.log(len(candidates) / keep, eta)))
+    root = np.random.SeedSequence(seed).generate_state(4).tolist()
+    games = dict.fromkeys(candidates, 0)
+    wins = dict.fromkeys(candidates, 0)
+    rounds = dict.fromkeys(candidates, 0)
+    survivors = list(candidates)
+    standings = pd.DataFrame()
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for round_idx in range(n_rounds):
+            n = max(1, budget // n_rounds // len(survivors))
+            seeds = ([*root, round_idx, 0], [*root, round_idx, 1])
+            shared_opponent = None
+            if opponent not in TARGET_AWARE_STRATEGIES:
+                shared_opponent, _ = engine.play(
+                    opponent, None, np.random.default_rng(seeds[1]), n
+                )
+            play = partial(_round_wins, engine, opponent, seeds, n, shared_opponent)
+            for candidate, won in zip(
+                survivors, pool.map(play, survivors), strict=True
+            ):
+                games[candidate] += n
+                wins[candidate] += won
+                rounds[candidate] += 1
+            standings = _standings(candidates, games, wins, rounds, confidence)
+            n_keep = max(keep, math.ceil(len(survivors) / eta))
+            ranked = standings.loc[survivors, "win_rate"].sort_values(
+                ascending=False, kind="stable"
+            )
+            survivors = list(ranked.index[:n_keep])
+            standings["survivor"] = standings.index.isin(survivors)
+            if callback is not None:
+                callback(round_idx + 1, standings)
+    return standings.sort_values(
+        ["survivor", "win_rate"], ascending=False, kind="stable"
+    )
+
+
+def _round_wins(
+    engine: TurnEngine,
+    opponent: str,
+    seeds: tuple[list[int], list[int]],
+    n: int,
+    opponent_scores: Array | None,
+    candidate: str,
+) -> int:
+    """Wins of ``candidate`` over ``n`` games of a round (ties go to it)."""
+    scores, _ = engine.play(candidate, None, np.random.default_rng(seeds[0]), n)
+    if opponent_scores is None:
+        opponent_scores, _ = engine.play(
+            opponent, scores, np.random.default_rng(seeds[1]), n
+        )
+    return int((scores <= opponent_scores).sum())
+
+
+def _standings(
+    candidates: Sequence[str],
+    games: dict[str, int],
+    wins: dict[str, int],
+    rounds: dict[str, int],
+    confidence: float,
+) -> pd.DataFrame:
+    df = pd.DataFrame(
+        {
+            "games": [games[c] for c in candidates],
+            "wins": [wins[c] for c in candidates],
+            "rounds": [rounds[c] for c in candidates],
+        },
+        index=pd.Index(candidates, name="strategy"),
+    )
+    df["win_rate"] = df["wins"] / df["games"].clip(lower=1)
+    df["ci_low"], df["ci_high"] = proportion_ci(df["wins"], df["games"], confidence)
+    return df[["games", "wins", "win_rate", "ci_low", "ci_high", "rounds"]]
@@ -2,14 +2,188 @@
 Batch simulation runner for Shut the Box.
 
 Provides Simulation class for fast batch evaluation of parametric games/strategies.
+Runs can be spread over worker threads, each with its own RNG and game state;
+on a free-threaded (no-GIL) CPython build they run in parallel.
+Simulation.submit() starts a run in the background and returns a
+SimulationHandle (a concurrent.futures.Future that can also be awaited) with
+partial results, batch by batch, while it plays.
 """
 
+import asyncio
+import os
 import random
+import sys
+import threading
+from collections.abc import AsyncIterator, Generator, Iterator, Sequence
+from concurrent.futures import Executor, Future, InvalidStateError, ThreadPoolExecutor
 from typing import Any
 
 from .game import Game
+from .hooks import HookRegistry
 from .loggers import InMemoryEventLogger
 from .player import Player
+from .progress import (
+    DEFAULT_REPORT_EVERY,
+    ProgressCallback,
+    ProgressReport,
+    ProgressTracker,
+)
+from .rules import RuleVariant, rule_variant
+from .stats import calculate_summary_stats, summary_with_ci
+from .strategies import check_strategy
+from .telemetry import StateTelemetry
+
+
+def free_threading_active() -> bool:
+    """True on a free-threaded CPython build running without the GIL."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def default_workers() -> int:
+    """Worker threads for workers=None: one per CPU without the GIL, else 1."""
+    return (os.cpu_count() or 1) if free_threading_active() else 1
+
+
+def _check_setup(
+    p1_strategy: str,
+    p2_strategy: str,
+    variant: RuleVariant,
+    tiles: int,
+    telemetry: StateTelemetry | None,
+) -> None:
+    """Raise ValueError if a run cannot be played as set up (see run())."""
+    rules = variant.compile(tiles)
+    if telemetry is not None:
+        telemetry.check_board(tiles, rules.dice_counts)
+    for strategy in dict.fromkeys((p1_strategy, p2_strategy)):
+        check_strategy(strategy, rules)
+
+
+class SimulationHandle(Future[list[dict[str, Any]]]):
+    """
+    A run started by Simulation.submit(), playing in the background.
+
+    The handle is a concurrent.futures.Future of the run's per-game results
+    (so it works with concurrent.futures.wait() and as_completed()), and can
+    be awaited from asyncio code. While the run plays, finished games are
+    published batch by batch:
+
+        - partial_results() / partial_summary(): games finished so far
+        - iter_batches() / abatches(): each batch as it completes
+        - report: latest ProgressReport (see progress.py)
+
+    stop() ends the run after the current batch, and result() then returns
+    the games played so far; cancel() also ends it, but marks the future
+    cancelled. Either way, no further games are played.
+    """
+
+    def __init__(
+        self,
+        total_games: int,
+        progress: ProgressCallback | None = None,
+        progress_every: int = DEFAULT_REPORT_EVERY,
+    ):
+        super().__init__()
+        self.total_games = total_games
+        self.report: ProgressReport | None = None
+        self._progress = progress
+        self._tracker = ProgressTracker(total_games, self._on_report, progress_every)
+        self._batches: list[list[dict[str, Any]]] = []
+        self._published = threading.Condition()
+        self._started = False
+        self._finished = False
+        self._stop_requested = False
+
+    def _on_report(self, report: ProgressReport) -> None:
+        self.report = report
+        if self._progress is not None:
+            self._progress(report)
+
+    def _start(self) -> bool:
+        """Mark the run as playing; False if it should not play at all."""
+        self._started = True
+        return not self._stop_requested
+
+    def _publish(self, batch: list[dict[str, Any]]) -> bool:
+        """Publish a finished batch; False once the run should end."""
+        with self._published:
+            self._batches.append(batch)
+            self._published.notify_all()
+        self._tracker.advance(len(batch))
+        return not self._stop_requested
+
+    def _finish(self, exc: BaseException | None = None) -> None:
+        self._tracker.finish()
+        with self._published:
+            self._finished = True
+            self._published.notify_all()
+        try:
+            if exc is not None:
+                self.set_exception(exc)
+            else:
+                self.set_result(self.partial_results())
+        except InvalidStateError:
+            pass  # Cancelled while playing.
+
+    def running(self) -> bool:
+        return self._started and not self.done()
+
+    def stop(self) -> None:
+        """End the run after the current batch; result() returns what was played."""
+        self._stop_requested = True
+
+    def cancel(self) -> bool:
+        self._stop_requested = True
+        return super().cancel()
+
+    @property
+    def games_completed(self) -> int:
+        with self._published:
+            return sum(len(batch) for batch in self._batches)
+
+    def partial_results(self) -> list[dict[str, Any]]:
+        """Per-game results of every batch finished so far, in game order."""
+        with self._published:
+            return [result for batch in self._batches for result in batch]
+
+    def partial_summary(self, confidence: float | None = None) -> dict[str, Any]:
+        """
+        calculate_summary_stats() of the games finished so far, plus
+        stats.summary_with_ci() intervals at ``confidence`` if given.
+        """
+        results = self.partial_results()
+        if confidence is None:
+            return calculate_summary_stats(results)
+        return summary_with_ci(results, confidence)
+
+    def _batch(self, index: int) -> list[dict[str, Any]] | None:
+        """Batch ``index``, waiting for it; None if the run ends first."""
+        with self._published:
+            self._published.wait_for(
+                lambda: len(self._batches) > index or self._finished
+            )
+            return self._batches[index] if len(self._batches) > index else None
+
+    def iter_batches(self) -> Iterator[list[dict[str, Any]]]:
+        """Every batch of results, from the first, blocking until each is played."""
+        index = 0
+        while (batch := self._batch(index)) is not None:
+            yield batch
+            index += 1
+
+    async def abatches(self) -> AsyncIterator[list[dict[str, Any]]]:
+        """iter_batches() for asyncio code: waits without blocking the loop."""
+        loop = asyncio.get_running_loop()
+        index = 0
+        while (
+            batch := await loop.run_in_executor(None, self._batch, index)
+        ) is not None:
+            yield batch
+            index += 1
+
+    def __await__(self) -> Generator[Any, None, list[dict[str, Any]]]:
+        return asyncio.wrap_future(self).__await__()
 
 
 class Simulation:
@@ -30,6 +204,14 @@ class Simulation:
         p1_strategy: str,
         p2_strategy: str,
         seed_start: int | None = None,
+        logger: InMemoryEventLogger | None = None,
+        telemetry: StateTelemetry | None = None,
+        progress: ProgressCallback | None = None,
+        progress_every: int = DEFAULT_REPORT_EVERY,
+        hooks: HookRegistry | None = None,
+        workers: int | None = 1,
+        variant: RuleVariant | str | None = None,
+        tiles: int = 9,
     ) -> list[dict[str, Any]]:
         """
         Simulate n_games between two strategies.
@@ -40,29 +222,283 @@ class Simulation:
             p2_strategy (str): Strategy for Player 2.
             seed_start (Optional[int]): Seed for reproducibility; each game seed
                 increments from this value.
+            logger (Optional[InMemoryEventLogger]): Collects the events of every
+                game in the run; by default no events are recorded.
+            telemetry (Optional[StateTelemetry]): Aggregate move counters fed by
+                every turn of the run.
+            progress (Optional[ProgressCallback]): Called with a ProgressReport
+                after every batch of ``progress_every`` games and once at the end.
+            progress_every (int): Games per progress batch.
+            hooks (Optional[HookRegistry]): Event subscribers for every game of
+                the run (see hooks.py); subscribe before calling run(). With
+                several workers, subscribers are called from every worker thread.
+            workers (Optional[int]): Threads to play on; None picks
+                default_workers(). Each worker plays a contiguous range of games
+                with its own RNG, game objects, logger and telemetry, which are
+                merged in game order at the end, so a seeded run gives the same
+                results for any number of workers. Threads only add speed on a
+                free-threaded interpreter.
+            variant (Optional[RuleVariant | str]): House rules (see rules.py);
+                compiled into lookup tables once per run. Scores are totals
+                over the variant's rounds, and ``shut_box`` is True when any
+                turn shut the box.
+            tiles (int): Number of tiles on the board (up to 16 for the
+                solver-backed strategies).
 
         Returns:
             List[Dict]: List of per-game summary stats/metadata for downstream analysis.
+
+        Raises ValueError before any game is played if a strategy cannot play
+        the variant on this board, or the telemetry is laid out for another
+        board or roll range.
         """
-        results = []
-        for game_idx in range(n_games):
-            if seed_start is not None:
-                random.seed(seed_start + game_idx)
-            logger = InMemoryEventLogger()
-            players = [Player("P1"), Player("P2")]
-            game = Game(
-                players=players, tiles=9, sim_id=0, game_id=game_idx, logger=logger
+        rules = rule_variant(variant)
+        _check_setup(p1_strategy, p2_strategy, rules, tiles, telemetry)
+        n_workers = default_workers() if workers is None else max(1, workers)
+        n_workers = min(n_workers, max(1, n_games))
+        tracker = None
+        if progress is not None:
+            tracker = ProgressTracker(n_games, progress, every=progress_every)
+        if n_workers == 1:
+            # Single thread: play on the global ``random`` module as before.
+            results = self._run_range(
+                range(n_games),
+                p1_strategy,
+                p2_strategy,
+                seed_start,
+                logger,
+                telemetry,
+                hooks,
+                tracker,
+                rng=None,
+                variant=rules,
+                tiles=tiles,
             )
-            game.start_game()
-            winner = game.determine_winner()
-            shut_box = any(p.score == 0 for p in players)
-            results.append(
-                {
-                    "game_id": game_idx,
-                    "winner": winner.name if winner else None,
-                    "p1_score": players[0].score,
-                    "p2_score": players[1].score,
-                    "shut_box": shut_box,
-                }
+        else:
+            bounds = [n_games * i // n_workers for i in range(n_workers + 1)]
+
+            def work(
+                start: int, stop: int
+            ) -> tuple[
+                list[dict[str, Any]], InMemoryEventLogger | None, StateTelemetry | None
+            ]:
+                shard_logger = InMemoryEventLogger() if logger is not None else None
+                shard_telemetry = (
+                    StateTelemetry(telemetry.tiles, telemetry.max_roll)
+                    if telemetry is not None
+                    else None
+                )
+                shard = self._run_range(
+                    range(start, stop),
+                    p1_strategy,
+                    p2_strategy,
+                    seed_start,
+                    shard_logger,
+                    shard_telemetry,
+                    hooks,
+                    tracker,
+                    rng=random.Random(),
+                    variant=rules,
+                    tiles=tiles,
+                )
+                return shard, shard_logger, shard_telemetry
+
+            with ThreadPoolExecutor(max_workers=n_workers) as pool:
+                shards = list(pool.map(work, bounds[:-1], bounds[1:]))
+            # Merge once all workers are done, so workers never share state.
+            results = []
+            for shard, shard_logger, shard_telemetry in shards:
+                results.extend(shard)
+                if logger is not None and shard_logger is not None:
+                    logger.events.extend(shard_logger.events)
+                if telemetry is not None and shard_telemetry is not None:
+                    telemetry.merge(shard_telemetry)
+        if tracker is not None:
+            tracker.finish()
+        return results
+
+    def submit(
+        self,
+        n_games: int,
+        p1_strategy: str,
+        p2_strategy: str,
+        seed_start: int | None = None,
+        batch_size: int = DEFAULT_REPORT_EVERY,
+        progress: ProgressCallback | None = None,
+        hooks: HookRegistry | None = None,
+        workers: int | None = 1,
+        variant: RuleVariant | str | None = None,
+        tiles: int = 9,
+        executor: Executor | None = None,
+    ) -> SimulationHandle:
+        """
+        Start run() in the background and return a handle to it at once.
+
+        Games are played in batches of ``batch_size``; each batch is published
+        on the handle as it finishes (see SimulationHandle), and the run can be
+        stopped between batches. A seeded run plays the same games as
+        ``run(n_games, ..., seed_start=seed_start)``. Games draw from their own
+        RNGs, never the global ``random`` module.
+
+        Args:
+            batch_size: Games per published batch (and per progress report).
+            progress: Called with a ProgressReport after every batch.
+            workers: Threads playing each batch (None: default_workers()).
+            executor: Executor to run on (default: a dedicated daemon thread).
+            (Other arguments as for run().)
+
+        Returns:
+            SimulationHandle
+        """
+        rules = rule_variant(variant)
+        _check_setup(p1_strategy, p2_strategy, rules, tiles, None)
+        batch_size = max(1, batch_size)
+        n_workers = default_workers() if workers is None else max(1, workers)
+        n_workers = min(n_workers, batch_size, max(1, n_games))
+        handle = SimulationHandle(n_games, progress, batch_size)
+        rngs = [random.Random() for _ in range(n_workers)]
+
+        def play(game_ids: range, rng: random.Random) -> list[dict[str, Any]]:
+            return self._run_range(
+                game_ids,
+                p1_strategy,
+                p2_strategy,
+                seed_start,
+                None,
+                None,
+                hooks,
+                None,
+                rng=rng,
+                variant=rules,
+                tiles=tiles,
             )
+
+        def work() -> None:
+            if not handle._start():
+                handle._finish()
+                return
+            pool = ThreadPoolExecutor(n_workers) if n_workers > 1 else None
+            try:
+                for start in range(0, n_games, batch_size):
+                    stop = min(n_games, start + batch_size)
+                    if pool is None:
+                        batch = play(range(start, stop), rngs[0])
+                    else:
+                        bounds = [
+                            start + (stop - start) * i // n_workers
+                            for i in range(n_workers + 1)
+                        ]
+                        shards = pool.map(
+                            play,
+                            [
+                                range(a, b)
+                                for a, b in zip(bounds[:-1], bounds[1:], strict=True)
+                            ],
+                            rngs,
+                        )
+                        batch = [result for shard in shards for result in shard]
+                    if not handle._publish(batch):
+                        break
+            except BaseException as exc:
+                handle._finish(exc)
+            else:
+                handle._finish()
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+
+        if executor is not None:
+            executor.submit(work)
+        else:
+            threading.Thread(target=work, name="stbsim-submit", daemon=True).start()
+        return handle
+
+    def run_games(
+        self,
+        game_ids: Sequence[int],
+        p1_strategy: str,
+        p2_strategy: str,
+        seed_start: int,
+        logger: InMemoryEventLogger | None = None,
+        telemetry: StateTelemetry | None = None,
+        hooks: HookRegistry | None = None,
+        variant: RuleVariant | str | None = None,
+        tiles: int = 9,
+    ) -> list[dict[str, Any]]:
+        """
+        Replay selected games of a seeded run: game ``i`` plays exactly as in
+        ``run(n, ..., seed_start=seed_start)`` with the same strategies.
+
+        Returns:
+            List[Dict]: Per-game summaries, in the order of ``game_ids``.
+        """
+        rules = rule_variant(variant)
+        _check_setup(p1_strategy, p2_strategy, rules, tiles, telemetry)
+        return self._run_range(
+            game_ids,
+            p1_strategy,
+            p2_strategy,
+            seed_start,
+            logger,
+            telemetry,
+            hooks,
+            None,
+            rng=None,
+            variant=rules,
+            tiles=tiles,
+        )
+
+    def _run_range(
+        self,
+        game_ids: Sequence[int],
+        p1_strategy: str,
+        p2_strategy: str,
+        seed_start: int | None,
+        logger: InMemoryEventLogger | None,
+        telemetry: StateTelemetry | None,
+        hooks: HookRegistry | None,
+        tracker: ProgressTracker | None,
+        rng: random.Random | None,
+        variant: RuleVariant,
+        tiles: int,
+    ) -> list[dict[str, Any]]:
+        """Play ``game_ids`` on one set of game objects."""
+        results = []
+        # One set of game objects per range; each game just resets them.
+        players = [Player("P1", p1_strategy), Player("P2", p2_strategy)]
+        game = Game(
+            players=players,
+            tiles=tiles,
+            variation=variant,
+            sim_id=0,
+            game_id=0,
+            logger=logger,
+            verbose=False,
+            telemetry=telemetry,
+            hooks=hooks,
+            rng=rng,
+        )
+        p1, p2 = players
+        seed = rng.seed if rng is not None else random.seed
+        batch = tracker.every if tracker is not None else max(1, len(game_ids))
+        # Games run in batches so progress costs nothing per game.
+        for batch_start in range(0, len(game_ids), batch):
+            batch_ids = game_ids[batch_start : batch_start + batch]
+            for game_idx in batch_ids:
+                if seed_start is not None:
+                    seed(seed_start + game_idx)
+                game.reset(game_idx)
+                game.start_game()
+                winner = game.determine_winner()
+                results.append(
+                    {
+                        "game_id": game_idx,
+                        "winner": winner.name,
+                        "p1_score": p1.score,
+                        "p2_score": p2.score,
+                        "shut_box": game.shut_box,
+                    }
+                )
+            if tracker is not None:
+                tracker.advance(len(batch_ids))
         return results
@@ -0,0 +1,306 @@
+"""
+Exact single-turn solver for Shut the Box.
+
+The state of a turn is the rack bitmask (bit n-1 set means tile n is up). A
+move table lists, for every (rack, roll total) cell, the racks reachable by
+flipping a combo that sums to the roll. Values are computed bottom-up in
+layers of equal popcount: every move flips at least one tile, so all
+successors of a layer live in earlier layers and each layer is a few
+vectorized gathers and elementwise maxima over the move table.
+
+Two value tables are produced:
+    - expected[mask]: smallest achievable expected final score.
+    - p_at_most[t, mask]: largest achievable probability of finishing with a
+      score of at most levels[t], for every score level a rack can end on
+      (0..max_score under standard scoring).
+
+Large boards (12-16 tiles, or three dice) are solved in bounded memory: each
+layer is split into chunks of at most ``chunk_size`` cells plus successor
+entries, so a gathered block never exceeds levels x chunk_size values. The
+chunks of a layer only read earlier layers, so they can run on worker threads
+(NumPy releases the GIL inside the gathers and maxima). Tables are float32 by
+default.
+
+solve() memory-maps the tables from the artifact cache (see cache.py), so
+they are computed once per machine rather than once per process.
+
+Example:
+    tables = solve(9)
+    tables.p_at_most[10, 0b111111111]  # P(score <= 10) from a fresh board
+    solve_tables(16, "three_dice", workers=4).expected[-1]
+"""
+
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, partial
+from typing import Any
+
+import numpy as np
+
+from .cache import Arrays, ArtifactCache, register_artifact
+from .rules import HIGH_TILES_MASK, CompiledRules, RuleVariant, rule_variant
+
+DIE_FACES = 6
+# Default bound on cells plus successor entries per layer chunk.
+DEFAULT_CHUNK_SIZE = 1 << 14
+
+
+def dice_total_probs(n_dice: int, faces: int = DIE_FACES) -> np.ndarray[Any, Any]:
+    """Probability of each total 0..n_dice*faces for the sum of fair dice."""
+    probs = np.array([1.0])
+    face = np.r_[0.0, np.full(faces, 1.0 / faces)]
+    for _ in range(n_dice):
+        probs = np.convolve(probs, face)
+    return probs
+
+
+class MoveTable:
+    """
+    CSR move table over every (rack, roll total) cell, stored in layer order.
+
+    Racks are ordered by (popcount, mask); ``rank[mask]`` is a rack's position
+    in that order and ``layer_start[k]`` the first position of popcount k.
+    Cell ``c = rank[mask] * max_roll + (roll - 1)`` has successor racks
+    ``succ[ptr[c]:ptr[c + 1]]`` (empty when the roll busts).
+
+    Args:
+        tiles: Number of tiles on the board.
+        max_roll: Largest possible roll total.
+    """
+
+    def __init__(self, tiles: int = 9, max_roll: int = 12):
+        self.tiles = tiles
+        self.max_roll = max_roll
+        n_masks = 1 << tiles
+        masks = np.arange(n_masks, dtype=np.int64)
+        bits = (masks[:, None] >> np.arange(tiles)) & 1
+        self.popcount = bits.sum(axis=1)
+        self.tile_sum = bits @ np.arange(1, tiles + 1)
+        self.order = np.lexsort((masks, self.popcount))
+        self.rank = np.empty(n_masks, dtype=np.int64)
+        self.rank[self.order] = masks
+        self.layer_start = np.searchsorted(
+            self.popcount[self.order], np.arange(tiles + 2)
+        )
+
+        # Every combo that can match a roll, then every rack that contains it.
+        cells, succs = [], []
+        for sub in np.flatnonzero((self.tile_sum >= 1) & (self.tile_sum <= max_roll)):
+            sup = masks[(masks & sub) == sub]
+            cells.append(self.rank[sup] * max_roll + (self.tile_sum[sub] - 1))
+            succs.append(sup ^ sub)
+        cell = np.concatenate(cells)
+        by_cell = np.argsort(cell, kind="stable")
+        succ_dtype = np.int32 if tiles < 32 else np.int64
+        self.succ = np.concatenate(succs)[by_cell].astype(succ_dtype)
+        counts = np.bincount(cell, minlength=n_masks * max_roll)
+        self.ptr = np.concatenate(([0], np.cumsum(counts)))
+
+    def layer(self, k: int) -> tuple[np.ndarray[Any, Any], int, int]:
+        """Racks of popcount k (in table order) and their cell range."""
+        lo, hi = int(self.layer_start[k]), int(self.layer_start[k + 1])
+        return self.order[lo:hi], lo * self.max_roll, hi * self.max_roll
+
+    def layer_chunks(self, k: int, size: int) -> list[tuple[int, int]]:
+        """
+        Split layer k into consecutive rack ranges [lo, hi) (positions in
+        table order) of at most ``size`` cells plus successor entries each (a
+        single larger rack gets a chunk of its own).
+        """
+        first, hi = int(self.layer_start[k]), int(self.layer_start[k + 1])
+        # Cumulative cells plus successor entries up to the end of each rack.
+        cell_ends = np.arange(first + 1, hi + 1) * self.max_roll
+        ends = self.ptr[cell_ends] + cell_ends
+        chunks = []
+        lo = first
+        while lo < hi:
+            budget = self.ptr[lo * self.max_roll] + lo * self.max_roll + size
+            stop = first + int(np.searchsorted(ends, budget, side="right"))
+            stop = max(stop, lo + 1)
+            chunks.append((lo, stop))
+            lo = stop
+        return chunks
+
+
+@cache
+def shared_move_table(tiles: int = 9, max_roll: int = 2 * DIE_FACES) -> MoveTable:
+    """Shared MoveTable for ``tiles`` and ``max_roll`` (built once per process)."""
+    return MoveTable(tiles, max_roll)
+
+
+def roll_probs(
+    table: MoveTable, rules: CompiledRules | None = None
+) -> np.ndarray[Any, Any]:
+    """
+    (n_masks, max_roll) roll-total probabilities under the standard dice rule, or
+    under the dice counts of ``rules`` (see rules.py).
+    """
+    if rules is None:
+        two_dice = (np.arange(1 << table.tiles) & HIGH_TILES_MASK) != 0
+        dice = np.where(two_dice, 2, 1)
+    else:
+        dice = np.asarray(rules.dice_counts)
+    probs = np.zeros((1 << table.tiles, table.max_roll))
+    for n_dice in np.unique(dice).tolist():
+        totals = dice_total_probs(n_dice)[1 : table.max_roll + 1]
+        probs[dice == n_dice, : len(totals)] = totals
+    return probs
+
+
+def _layer_best(
+    values: np.ndarray[Any, Any],
+    table: MoveTable,
+    lo: int,
+    hi: int,
+    bust: np.ndarray[Any, Any],
+) -> np.ndarray[Any, Any]:
+    """
+    Best successor value for each cell in [lo, hi), maximizing over the racks
+    along the first axis of ``values``; cells without moves take ``bust``
+    (per cell, shaped like the result). Successor slot j of every cell is
+    folded in at once, so each gather and maximum runs over whole rows.
+    """
+    best = np.array(np.broadcast_to(bust, (hi - lo,) + values.shape[1:]))
+    first = table.ptr[lo:hi]
+    count = table.ptr[lo + 1 : hi + 1] - first
+    cells = np.flatnonzero(count)
+    first, count = first[cells], count[cells]
+    # One pass per successor slot, over whole rows of values at a time.
+    if cells.size:
+        best[cells] = values[table.succ[first]]
+    for slot in range(1, int(count.max(initial=0))):
+        more = count > slot
+        cells, first, count = cells[more], first[more], count[more]
+        best[cells] = np.maximum(best[cells], values[table.succ[first + slot]])
+    return best
+
+
+class SolverTables:
+    """
+    Value tables of the exact single-turn solver.
+
+    Attributes:
+        tiles: Number of tiles on the board.
+        levels: Ascending final scores a rack can end on.
+        max_score: Largest possible final score (sum of all tiles by default).
+        expected: (2**tiles,) minimal expected final score per rack.
+        p_at_most: (len(levels), 2**tiles) maximal P(final score <= levels[t]).
+    """
+
+    def __init__(
+        self,
+        tiles: int,
+        expected: np.ndarray[Any, Any],
+        p_at_most: np.ndarray[Any, Any],
+        levels: np.ndarray[Any, Any] | None = None,
+    ):
+        self.tiles = tiles
+        self.levels = np.arange(len(p_at_most)) if levels is None else levels
+        self.max_score = int(self.levels[-1])
+        self.expected = expected
+        self.p_at_most = p_at_most
+        self._level_list: list[int] = self.levels.tolist()
+
+    def win_probability(self, mask: int, target: int) -> float:
+        """P(final score <= target) from ``mask`` under the target-optimal policy."""
+        row = bisect_right(self._level_list, target) - 1
+        if row < 0:
+            return 0.0
+        return float(self.p_at_most[row, mask])
+
+
+def solve_tables(
+    tiles: int = 9,
+    variant: RuleVariant | str | None = None,
+    dtype: Any = np.float32,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> SolverTables:
+    """
+    Compute the expected-score and target-probability tables for ``tiles``.
+
+    Args:
+        tiles: Number of tiles on the board
+        variant: Rule variant whose dice counts and scores to solve (see
+            rules.py; default: the standard rules)
+        dtype: Float type of the value tables
+        workers: Threads solving the chunks of each layer
+        chunk_size: Cells plus successor entries per chunk; temporary memory is
+            about len(levels) * chunk_size values per worker
+
+    Returns:
+        SolverTables
+    """
+    rules = rule_variant(variant).compile(tiles)
+    table = shared_move_table(tiles, DIE_FACES * max(rules.dice_counts))
+    probs = roll_probs(table, rules).astype(dtype)
+    scores = np.asarray(rules.scores)
+    levels = np.unique(scores)
+    n_masks = 1 << tiles
+    # Work on negated expected scores so both tables maximize. The probability
+    # table is built rack-major, so each successor gathers one contiguous row
+    # of levels, and transposed at the end.
+    neg_expected = np.zeros(n_masks, dtype=dtype)
+    p_by_rack = np.zeros((n_masks, len(levels)), dtype=dtype)
+    neg_expected[0] = -scores[0]
+    p_by_rack[0] = scores[0] <= levels
+
+    def solve_chunk(lo: int, hi: int) -> None:
+        racks = table.order[lo:hi]
+        cell_lo, cell_hi = lo * table.max_roll, hi * table.max_roll
+        score = np.repeat(scores[racks], table.max_roll)
+        bust_e = -score.astype(dtype)
+        bust_p = (score[:, None] <= levels).astype(dtype)
+        best_e = _layer_best(neg_expected, table, cell_lo, cell_hi, bust_e)
+        best_p = _layer_best(p_by_rack, table, cell_lo, cell_hi, bust_p)
+        weights = probs[racks]
+        neg_expected[racks] = (best_e.reshape(-1, table.max_roll) * weights).sum(1)
+        p_by_rack[racks] = np.einsum(
+            "rcl,rc->rl", best_p.reshape(len(racks), table.max_roll, -1), weights
+        )
+
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        for k in range(1, tiles + 1):
+            # Chunks of a layer only read earlier layers, so any order works.
+            chunks = table.layer_chunks(k, chunk_size)
+            if workers > 1 and len(chunks) > 1:
+                list(pool.map(lambda chunk: solve_chunk(*chunk), chunks))
+            else:
+                for lo, hi in chunks:
+                    solve_chunk(lo, hi)
+    p_at_most = np.ascontiguousarray(p_by_rack.T)
+    return SolverTables(tiles, -neg_expected, p_at_most, levels)
+
+
+def _solver_arrays(tables: SolverTables) -> Arrays:
+    return {
+        "expected": tables.expected,
+        "p_at_most": tables.p_at_most,
+        "levels": tables.levels,
+    }
+
+
+# 2: float32 tables plus the score levels of the p_at_most rows.
+# 3: boards above 9 tiles keep rolling two dice while any tile above 6 is up.
+@register_artifact("solver", format_version=3)
+def build_solver_arrays(tiles: int, variant: RuleVariant | str | None = None) -> Arrays:
+    """Solver value tables (default standard rules) for the artifact cache."""
+    return _solver_arrays(solve_tables(tiles, variant))
+
+
+@cache
+def solve(tiles: int = 9, variant: RuleVariant | str | None = None) -> SolverTables:
+    """
+    Solver tables for ``tiles`` (under a rule variant, default standard):
+    memory-mapped from the artifact cache, and computed (then cached) only on
+    a miss.
+    """
+    arrays = ArtifactCache().get_or_build(
+        "solver",
+        tiles,
+        partial(build_solver_arrays, tiles, variant),
+        variant=rule_variant(variant).cache_key,
+    )
+    return SolverTables(
+        tiles, arrays["expected"], arrays["p_at_most"], arrays.get("levels")
+    )
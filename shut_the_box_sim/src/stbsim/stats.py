@@ -2,12 +2,56 @@
 Statistic aggregators for Shut the Box batch simulation.
 
 Provides functions to summarize, tabulate, and analyze game result batches for reporting or CLI.
+All aggregation is NumPy-vectorized: results are converted to column arrays once, and interval,
+bootstrap and paired-test helpers operate on those arrays, so 10^7-game batches take seconds.
 """
 
-from typing import Any
+from collections.abc import Mapping, Sequence
+from typing import Any, Literal
 
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+from scipy import stats as sps
 
-def calculate_summary_stats(game_results: list[dict[str, Any]]) -> dict[str, Any]:
+GameResults = Sequence[Mapping[str, Any]] | pd.DataFrame
+IntervalMethod = Literal["wilson", "clopper_pearson"]
+
+
+def results_to_arrays(game_results: GameResults) -> dict[str, npt.NDArray[Any]]:
+    """
+    Convert per-game summaries (see simulation.py) into column arrays.
+
+    Args:
+        game_results: List of per-game dicts, or a DataFrame with the same columns
+
+    Returns:
+        Dict of arrays: p1_score, p2_score (int64), p1_win, p2_win, shut_box (bool)
+    """
+    n = len(game_results)
+    if isinstance(game_results, pd.DataFrame):
+        df = game_results
+
+        def column(name: str, default: Any) -> npt.NDArray[Any]:
+            return df[name].to_numpy() if name in df else np.full(n, default)
+
+    else:
+        rows = game_results
+
+        def column(name: str, default: Any) -> npt.NDArray[Any]:
+            return np.array([g.get(name, default) for g in rows])
+
+    winner = column("winner", None)
+    return {
+        "p1_score": column("p1_score", 0).astype(np.int64).reshape(n),
+        "p2_score": column("p2_score", 0).astype(np.int64).reshape(n),
+        "p1_win": (winner == "P1").reshape(n),
+        "p2_win": (winner == "P2").reshape(n),
+        "shut_box": column("shut_box", False).astype(bool).reshape(n),
+    }
+
+
+def calculate_summary_stats(game_results: GameResults) -> dict[str, Any]:
     """
     Compute win rates, mean scores, shut-box frequency from a set of simulation summaries.
 
@@ -17,19 +61,307 @@ def calculate_summary_stats(game_results: list[dict[str, Any]]) -> dict[str, Any
     Returns:
         Dict with keys: p1_win_rate, p2_win_rate, p1_avg_score, p2_avg_score, shut_box_frequency, total_games
     """
-    if not game_results:
+    if len(game_results) == 0:
         return {}
-    total = len(game_results)
-    p1_wins = sum(1 for g in game_results if g.get("winner") == "P1")
-    p2_wins = sum(1 for g in game_results if g.get("winner") == "P2")
-    p1_scores = [g.get("p1_score", 0) for g in game_results]
-    p2_scores = [g.get("p2_score", 0) for g in game_results]
-    shut_count = sum(1 for g in game_results if g.get("shut_box"))
+    return _summary_from_arrays(results_to_arrays(game_results))
+
+
+def _summary_from_arrays(cols: Mapping[str, npt.NDArray[Any]]) -> dict[str, Any]:
+    """calculate_summary_stats() of results already converted by results_to_arrays()."""
+    total = len(cols["p1_score"])
     return {
-        "p1_win_rate": p1_wins / total,
-        "p2_win_rate": p2_wins / total,
-        "p1_avg_score": sum(p1_scores) / total,
-        "p2_avg_score": sum(p2_scores) / total,
-        "shut_box_frequency": shut_count / total,
+        "p1_win_rate": int(cols["p1_win"].sum()) / total,
+        "p2_win_rate": int(cols["p2_win"].sum()) / total,
+        "p1_avg_score": int(cols["p1_score"].sum()) / total,
+        "p2_avg_score": int(cols["p2_score"].sum()) / total,
+        "shut_box_frequency": int(cols["shut_box"].sum()) / total,
         "total_games": total,
     }
+
+
+def proportion_ci(
+    successes: npt.ArrayLike,
+    n: npt.ArrayLike,
+    confidence: float = 0.95,
+    method: IntervalMethod = "wilson",
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.float64]]:
+    """
+    Confidence interval for binomial proportions, vectorized over arrays of counts.
+
+    Args:
+        successes: Number of successes (scalar or array)
+        n: Number of trials (scalar or array, broadcast against successes)
+        confidence: Two-sided confidence level
+        method: "wilson" (score interval) or "clopper_pearson" (exact)
+
+    Returns:
+        tuple: (lower, upper) bounds as float arrays (NaN where n == 0)
+    """
+    k = np.asarray(successes, dtype=np.float64)
+    n_arr = np.asarray(n, dtype=np.float64)
+    alpha = 1.0 - confidence
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if method == "wilson":
+            z = sps.norm.ppf(1 - alpha / 2)
+            p = k / n_arr
+            denom = 1 + z**2 / n_arr
+            center = (p + z**2 / (2 * n_arr)) / denom
+            half = z * np.sqrt(p * (1 - p) / n_arr + z**2 / (4 * n_arr**2)) / denom
+            lower, upper = center - half, center + half
+        elif method == "clopper_pearson":
+            lower = np.where(k > 0, sps.beta.ppf(alpha / 2, k, n_arr - k + 1), 0.0)
+            upper = np.where(
+                k < n_arr, sps.beta.ppf(1 - alpha / 2, k + 1, n_arr - k), 1.0
+            )
+        else:
+            raise ValueError(f"Unknown interval method: {method}")
+    empty = n_arr == 0
+    lower = np.where(empty, np.nan, np.clip(lower, 0.0, 1.0))
+    upper = np.where(empty, np.nan, np.clip(upper, 0.0, 1.0))
+    return lower, upper
+
+
+def mean_ci(
+    values: npt.ArrayLike, confidence: float = 0.95
+) -> tuple[float, float, float]:
+    """Mean with a normal-approximation (t) confidence interval: (mean, lower, upper)."""
+    x = np.asarray(values, dtype=np.float64)
+    n = len(x)
+    mean = float(x.mean()) if n else float("nan")
+    if n < 2:
+        return mean, float("nan"), float("nan")
+    half = float(sps.t.ppf(0.5 + confidence / 2, n - 1) * x.std(ddof=1) / np.sqrt(n))
+    return mean, mean - half, mean + half
+
+
+def summary_with_ci(
+    game_results: GameResults,
+    confidence: float = 0.95,
+    method: IntervalMethod = "wilson",
+) -> dict[str, Any]:
+    """
+    calculate_summary_stats() plus confidence intervals.
+
+    Adds ``<key>_ci`` (lower, upper) for p1_win_rate, p2_win_rate and
+    shut_box_frequency (binomial intervals) and for the average scores (t intervals).
+    """
+    if len(game_results) == 0:
+        return {}
+    cols = results_to_arrays(game_results)
+    summary = _summary_from_arrays(cols)
+    n = summary["total_games"]
+    counts = np.array(
+        [cols["p1_win"].sum(), cols["p2_win"].sum(), cols["shut_box"].sum()]
+    )
+    lower, upper = proportion_ci(counts, n, confidence, method)
+    for i, key in enumerate(("p1_win_rate", "p2_win_rate", "shut_box_frequency")):
+        summary[f"{key}_ci"] = (float(lower[i]), float(upper[i]))
+    for player in ("p1", "p2"):
+        _, lo, hi = mean_ci(cols[f"{player}_score"], confidence)
+        summary[f"{player}_avg_score_ci"] = (lo, hi)
+    return summary
+
+
+def bootstrap_mean(
+    values: npt.ArrayLike,
+    n_resamples: int = 10_000,
+    confidence: float = 0.95,
+    seed: int | None = None,
+) -> tuple[float, float, float]:
+    """
+    Percentile bootstrap CI for the mean of discrete data (scores, 0/1 outcomes).
+
+    Resampling n values with replacement from their empirical distribution is a
+    multinomial draw over the distinct values, so all resamples are drawn in one
+    (n_resamples, n_distinct) array operation, independent of n.
+
+    Returns:
+        tuple: (mean, lower, upper)
+    """
+    x = np.asarray(values)
+    if x.size == 0:
+        return float("nan"), float("nan"), float("nan")
+    levels, counts = np.unique(x, return_counts=True)
+    rng = np.random.default_rng(seed)
+    draws = rng.multinomial(x.size, counts / x.size, size=n_resamples)
+    means = draws @ levels.astype(np.float64) / x.size
+    alpha = 1.0 - confidence
+    lower, upper = np.quantile(means, [alpha / 2, 1 - alpha / 2])
+    return float(x.mean()), float(lower), float(upper)
+
+
+def paired_difference_test(
+    a: npt.ArrayLike, b: npt.ArrayLike, confidence: float = 0.95
+) -> dict[str, float]:
+    """
+    Paired t-test on per-game differences a - b (e.g. the same seeds played by two
+    strategies).
+
+    Returns:
+        Dict with keys: mean_diff, ci_low, ci_high, t_stat, p_value, n
+    """
+    d = np.asarray(a, dtype=np.float64) - np.asarray(b, dtype=np.float64)
+    n = len(d)
+    mean, lo, hi = mean_ci(d, confidence)
+    sd = float(d.std(ddof=1)) if n > 1 else float("nan")
+    if n < 2:
+        t_stat = p_value = float("nan")
+    elif sd == 0:
+        t_stat = 0.0 if mean == 0 else float(np.copysign(np.inf, mean))
+        p_value = 1.0 if mean == 0 else 0.0
+    else:
+        t_stat = mean / (sd / np.sqrt(n))
+        p_value = float(2 * sps.t.sf(abs(t_stat), n - 1))
+    return {
+        "mean_diff": mean,
+        "ci_low": lo,
+        "ci_high": hi,
+        "t_stat": float(t_stat),
+        "p_value": p_value,
+        "n": n,
+    }
+
+
+def mcnemar_test(
+    a_success: npt.ArrayLike, b_success: npt.ArrayLike
+) -> dict[str, float]:
+    """
+    McNemar test for paired binary outcomes (e.g. wins under two strategies on the
+    same seeds). Uses the exact binomial test on the discordant pairs.
+
+    Returns:
+        Dict with keys: a_only, b_only, rate_diff, p_value
+    """
+    a = np.asarray(a_success, dtype=bool)
+    b = np.asarray(b_success, dtype=bool)
+    a_only = int((a & ~b).sum())
+    b_only = int((b & ~a).sum())
+    discordant = a_only + b_only
+    p_value = (
+        float(sps.binomtest(a_only, discordant, 0.5).pvalue) if discordant else 1.0
+    )
+    return {
+        "a_only": a_only,
+        "b_only": b_only,
+        "rate_diff": (a_only - b_only) / len(a) if len(a) else float("nan"),
+        "p_value": p_value,
+    }
+
+
+def compare_strategies(
+    results_a: GameResults,
+    results_b: GameResults,
+    player: Literal["p1", "p2"] = "p2",
+    confidence: float = 0.95,
+) -> dict[str, dict[str, float]]:
+    """
+    Paired comparison of two runs over the same seeds that differ only in one
+    player's strategy.
+
+    Args:
+        results_a: Per-game results with strategy A for ``player``
+        results_b: Per-game results with strategy B for ``player``, same seeds
+        player: Which player's outcomes to compare
+        confidence: Confidence level for the score-difference interval
+
+    Returns:
+        Dict with "score" (paired_difference_test of A - B scores) and
+        "win" (mcnemar_test of A vs B wins)
+    """
+    a = results_to_arrays(results_a)
+    b = results_to_arrays(results_b)
+    if len(a["p1_score"]) != len(b["p1_score"]):
+        raise ValueError("Paired comparisons need the same number of games")
+    return {
+        "score": paired_difference_test(
+            a[f"{player}_score"], b[f"{player}_score"], confidence
+        ),
+        "win": mcnemar_test(a[f"{player}_win"], b[f"{player}_win"]),
+    }
+
+
+def checkpoint_sizes(
+    n_games: int, stride: int | Literal["log"] = "log", points_per_decade: int = 10
+) -> npt.NDArray[np.int64]:
+    """
+    Prefix sizes at which to evaluate a convergence curve (always ending at n_games).
+
+    Args:
+        n_games: Largest prefix size (games in the run)
+        stride: Evaluate every ``stride`` games, or "log" for log-spaced sizes
+        points_per_decade: Number of log-spaced sizes per factor of 10
+
+    Returns:
+        Sorted unique prefix sizes in 1..n_games
+    """
+    if n_games < 1:
+        return np.zeros(0, dtype=np.int64)
+    if stride == "log":
+        count = max(2, int(np.ceil(np.log10(n_games) * points_per_decade)) + 1)
+        sizes = np.rint(np.geomspace(1, n_games, count)).astype(np.int64)
+    elif isinstance(stride, int) and stride > 0:
+        sizes = np.arange(stride, n_games + 1, stride, dtype=np.int64)
+    else:
+        raise ValueError(f"Invalid checkpoint stride: {stride!r}")
+    return np.unique(np.append(sizes, n_games))
+
+
+def convergence_curve(
+    game_results: GameResults,
+    sizes: Sequence[int] | None = None,
+    stride: int | Literal["log"] = "log",
+    confidence: float = 0.95,
+    method: IntervalMethod = "wilson",
+) -> pd.DataFrame:
+    """
+    Summary statistics and confidence intervals at every prefix of one run.
+
+    Each prefix of a seeded run is itself a run of that size (game i always uses
+    seed seed_start + i), so a single simulation to the largest size replaces one
+    simulation per sample size. All prefixes are evaluated from cumulative sums.
+
+    Args:
+        game_results: Per-game results of the full run, in game order
+        sizes: Prefix sizes to evaluate (default: checkpoint_sizes(len, stride))
+        stride: Checkpoint stride when ``sizes`` is None; "log" for log spacing
+        confidence: Two-sided confidence level
+        method: Interval method for the rates (see proportion_ci)
+
+    Returns:
+        DataFrame with one row per size: n_games, then for each of p1_win_rate,
+        p2_win_rate, shut_box_frequency, p1_avg_score and p2_avg_score the
+        estimate and its ``<key>_ci_low`` / ``<key>_ci_high`` bounds
+    """
+    cols = results_to_arrays(game_results)
+    total = len(cols["p1_score"])
+    n = (
+        checkpoint_sizes(total, stride)
+        if sizes is None
+        else np.asarray(sizes, dtype=np.int64)
+    )
+    if ((n < 1) | (n > total)).any():
+        raise ValueError(f"Prefix sizes must be within 1..{total}")
+    last = n - 1
+    curve: dict[str, npt.NDArray[Any]] = {"n_games": n}
+    for key, col in (
+        ("p1_win_rate", "p1_win"),
+        ("p2_win_rate", "p2_win"),
+        ("shut_box_frequency", "shut_box"),
+    ):
+        successes = np.cumsum(cols[col], dtype=np.int64)[last]
+        lower, upper = proportion_ci(successes, n, confidence, method)
+        curve[key] = successes / n
+        curve[f"{key}_ci_low"], curve[f"{key}_ci_high"] = lower, upper
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for player in ("p1", "p2"):
+            scores = cols[f"{player}_score"]
+            s1 = np.cumsum(scores)[last]
+            s2 = np.cumsum(scores * scores)[last]
+            mean = s1 / n
+            var = (s2 - s1 * mean) / (n - 1)
+            half = sps.t.ppf(0.5 + confidence / 2, n - 1) * np.sqrt(var / n)
+            key = f"{player}_avg_score"
+            curve[key] = mean
+            curve[f"{key}_ci_low"] = np.where(n > 1, mean - half, np.nan)
+            curve[f"{key}_ci_high"] = np.where(n > 1, mean + half, np.nan)
+    return pd.DataFrame(curve)
@@ -1,15 +1,38 @@
 """
 Strategies for Shut the Box
 
-Provides pluggable callable strategy functions (greedy_max_strategy, min_tiles_strategy)
+Provides pluggable callable strategy functions (greedy_max_strategy, min_tiles_strategy,
+beat_target_strategy, learned_strategy)
 that select tile combos to flip for a given dice roll and board state.
 
 Each strategy accepts (roll_total: int, tiles_up: set[int]) and returns a tuple of tile numbers to flip,
-or () if no valid move is possible.
+or () if no valid move is possible. Target-aware strategies (TARGET_AWARE_STRATEGIES) also accept
+the opponent's score, or None when they move first. Rule-aware strategies (RULES_AWARE_STRATEGIES)
+also accept the game's compiled rules (``rules=``, see rules.py) and plan under its variant and board.
+Strategies must be deterministic: the game loop caches each decision per (rack, roll[, target])
+for the callable currently in STRATEGY_MAP (replacing an entry starts a fresh cache), and per
+compiled rules for rule-aware strategies.
+
+Batch strategies (BATCH_STRATEGY_MAP) choose moves for whole arrays of racks at once:
+(masks, roll_totals, targets) -> flip masks, where masks and flips are rack bitmasks
+(bit n-1 for tile n), a flip of 0 means the roll busts, and targets is None or holds the
+opponent's score per entry (NO_TARGET when moving first). batch_strategy() returns every
+strategy in this form, adapting scalar strategies through their tabulated decisions;
+strategy_interfaces() tells which form a strategy implements natively.
 Exported for use in CLI, simulation, or interactive analyses.
 """
 
+from collections.abc import Callable
+from functools import partial
 from itertools import combinations
+from typing import Any
+
+import numpy as np
+
+from .board import mask_combos
+from .learning import load_policy
+from .rules import CompiledRules
+from .solver import DIE_FACES, solve
 
 
 def greedy_max_strategy(roll_total: int, tiles_up: set[int]) -> tuple[int, ...]:
@@ -66,12 +89,240 @@ def min_tiles_strategy(roll_total: int, tiles_up: set[int]) -> tuple[int, ...]:
     return combos[0]
 
 
+def beat_target_strategy(
+    roll_total: int,
+    tiles_up: set[int],
+    opponent_score: int | None = None,
+    rules: CompiledRules | None = None,
+) -> tuple[int, ...]:
+    """
+    Beat-Target strategy: Select the combo that maximizes the probability of beating
+    the opponent's score, using the exact solver tables.
+
+    Ties go to the player who went first, so the score to beat is opponent_score - 1.
+    Equal probabilities are broken by lower expected score. Without an opponent score
+    (moving first) it minimizes the expected final score.
+
+    Args:
+        roll_total: Dice roll total for this move
+        tiles_up: Set of tile numbers available to flip
+        opponent_score: Score to beat, or None if no opponent has played yet
+        rules: The game's compiled rules (default: standard rules on the
+            smallest board of at least 9 tiles holding ``tiles_up``)
+
+    Returns:
+        tuple: The tile numbers to flip, or () if no valid move
+    """
+    mask = 0
+    for tile in tiles_up:
+        mask |= 1 << (tile - 1)
+    combos = mask_combos(mask, roll_total)
+    if not combos:
+        return ()
+    if rules is None:
+        tables = solve(max(9, max(tiles_up)))
+    else:
+        tables = solve(rules.tiles, rules.variant)
+
+    def after(combo: tuple[int, ...]) -> int:
+        rest = mask
+        for tile in combo:
+            rest &= ~(1 << (tile - 1))
+        return rest
+
+    if opponent_score is None:
+        return min(combos, key=lambda c: tables.expected[after(c)])
+    return max(
+        combos,
+        key=lambda c: (
+            tables.win_probability(after(c), opponent_score - 1),
+            -tables.expected[after(c)],
+        ),
+    )
+
+
+def learned_strategy(
+    roll_total: int, tiles_up: set[int], rules: CompiledRules | None = None
+) -> tuple[int, ...]:
+    """
+    Learned strategy: Play the move table learned by batched self-play (see learning.py).
+
+    Args:
+        roll_total: Dice roll total for this move
+        tiles_up: Set of tile numbers available to flip
+        rules: The game's compiled rules (default: standard rules on the
+            smallest board of at least 9 tiles holding ``tiles_up``)
+
+    Returns:
+        tuple: The tile numbers to flip, or () if no valid move
+    """
+    mask = 0
+    for tile in tiles_up:
+        mask |= 1 << (tile - 1)
+    if not mask:
+        return ()
+    if rules is None:
+        return load_policy(max(9, max(tiles_up))).combo(mask, roll_total)
+    return load_policy(rules.tiles, rules.variant).combo(mask, roll_total)
+
+
+StrategyFn = Callable[..., tuple[int, ...]]
+
 # For CLI/factory
-STRATEGY_MAP = {
+STRATEGY_MAP: dict[str, StrategyFn] = {
     "greedy_max": greedy_max_strategy,
     "min_tiles": min_tiles_strategy,
+    "beat_target": beat_target_strategy,
+    "learned": learned_strategy,
+}
+
+# Strategies whose callable takes the opponent's score as a third argument.
+TARGET_AWARE_STRATEGIES: set[str] = {"beat_target"}
+
+# Strategies whose callable takes the game's CompiledRules as ``rules=``, with
+# that callable: a replaced STRATEGY_MAP entry is called without rules.
+RULES_AWARE_STRATEGIES: dict[str, StrategyFn] = {
+    "beat_target": beat_target_strategy,
+    "learned": learned_strategy,
 }
 
+# Cached decisions per (strategy, rules): decision_key() -> index into
+# mask_combos(), stored with the callable they were made by, so replacing a
+# STRATEGY_MAP entry starts a fresh cache. Rules are None unless the strategy
+# is rule-aware.
+_DECISIONS: dict[
+    tuple[str, CompiledRules | None], tuple[StrategyFn, dict[int, int]]
+] = {}
+
+
+def _rules_key(strategy: str, rules: CompiledRules | None) -> CompiledRules | None:
+    """The rules ``strategy``'s decisions depend on (None unless rule-aware)."""
+    aware = RULES_AWARE_STRATEGIES.get(strategy)
+    return rules if aware is not None and aware is STRATEGY_MAP.get(strategy) else None
+
+
+def decision_key(mask: int, roll_total: int, target: int | None = None) -> int:
+    """Cache key of one decision (target is ignored unless given)."""
+    key = mask << 6 | roll_total
+    if target is not None:
+        key |= (target + 2) << 32
+    return key
+
+
+def decision_cache(strategy: str, rules: CompiledRules | None = None) -> dict[int, int]:
+    """
+    The shared decision cache of ``strategy``'s current callable under
+    ``rules`` (see decide()).
+    """
+    fn = STRATEGY_MAP.get(strategy)
+    if fn is None:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    key = (strategy, _rules_key(strategy, rules))
+    entry = _DECISIONS.get(key)
+    if entry is None or entry[0] is not fn:
+        entry = _DECISIONS[key] = (fn, {})
+    return entry[1]
+
+
+def clear_strategy_caches(strategy: str | None = None) -> None:
+    """
+    Drop the cached decisions and move tables of ``strategy`` (default: all).
+    Caches of a replaced STRATEGY_MAP entry are never used again; this frees them.
+    """
+    for key in [k for k in _DECISIONS if strategy is None or k[0] == strategy]:
+        del _DECISIONS[key]
+    for table_key in [k for k in _MOVE_TABLES if strategy is None or k[0] == strategy]:
+        del _MOVE_TABLES[table_key]
+
+
+def decide(
+    strategy: str,
+    mask: int,
+    roll_total: int,
+    target: int | None = None,
+    rules: CompiledRules | None = None,
+) -> int:
+    """
+    Run a strategy on a rack bitmask and return the index of its move in
+    board.mask_combos(mask, roll_total), caching the result. Rule-aware
+    strategies plan under ``rules`` (default: their standard-rules behaviour).
+
+    Raises ValueError for unknown strategies, and if the strategy passes on a
+    roll that has a valid move or picks a combo that is not valid.
+    """
+    cache = decision_cache(strategy, rules)
+    key = decision_key(mask, roll_total, target)
+    rank = cache.get(key)
+    if rank is None:
+        rules = _rules_key(strategy, rules)
+        fn = _DECISIONS[strategy, rules][0]
+        combos = mask_combos(mask, roll_total)
+        tiles_up = {n + 1 for n in range(mask.bit_length()) if mask >> n & 1}
+        args: tuple[Any, ...] = (roll_total, tiles_up)
+        if strategy in TARGET_AWARE_STRATEGIES:
+            args += (target,)
+        if rules is not None:
+            combo = fn(*args, rules=rules)
+        else:
+            combo = fn(*args)
+        combo = tuple(sorted(combo))
+        if combo not in combos:
+            raise ValueError(
+                f"Strategy {strategy} chose invalid combo {combo} "
+                f"for roll {roll_total} with tiles {sorted(tiles_up)}"
+            )
+        rank = combos.index(combo)
+        cache[key] = rank
+    return rank
+
+
+def check_strategy(strategy: str, rules: CompiledRules) -> None:
+    """
+    Raise ValueError unless ``strategy`` exists and moves validly under
+    ``rules``. Its decisions for every opening roll are made (and cached) here,
+    so a strategy that cannot play the variant or board fails before a run
+    rather than in the middle of one.
+    """
+    if strategy not in STRATEGY_MAP:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    full_mask = (1 << rules.tiles) - 1
+    n_dice = rules.dice_counts[full_mask]
+    try:
+        for roll in range(n_dice, DIE_FACES * n_dice + 1):
+            if mask_combos(full_mask, roll):
+                decide(strategy, full_mask, roll, None, rules)
+    except (ValueError, IndexError) as err:
+        raise ValueError(
+            f"Strategy {strategy} cannot play rule variant {rules.variant.name!r} "
+            f"on {rules.tiles} tiles: {err}"
+        ) from err
+
+
+def compile_moves(
+    strategy: str,
+    target: int | None = None,
+    tiles: int = 9,
+    max_roll: int = 2 * DIE_FACES,
+    rules: CompiledRules | None = None,
+) -> np.ndarray[Any, Any]:
+    """
+    Tabulate a strategy's decision for every (rack, roll) cell, for array-based
+    engines (under ``rules`` for rule-aware strategies).
+
+    Returns:
+        (2**tiles * max_roll,) uint16 array: the bitmask of the tiles the
+        strategy flips in cell ``mask * max_roll + roll - 1`` (0 when the roll busts)
+    """
+    target = target if strategy in TARGET_AWARE_STRATEGIES else None
+    moves = np.zeros((1 << tiles) * max_roll, dtype=np.uint16)
+    for mask in range(1, 1 << tiles):
+        for roll in range(1, max_roll + 1):
+            combos = mask_combos(mask, roll)
+            if combos:
+                combo = combos[decide(strategy, mask, roll, target, rules)]
+                moves[mask * max_roll + roll - 1] = sum(1 << (t - 1) for t in combo)
+    return moves
+
 
 def select_combo(strategy: str, roll_total: int, tiles_up: set[int]) -> tuple[int, ...]:
     """
@@ -81,3 +332,191 @@ def select_combo(strategy: str, roll_total: int, tiles_up: set[int]) -> tuple[in
     if strategy not in STRATEGY_MAP:
         raise ValueError(f"Unknown strategy: {strategy}")
     return STRATEGY_MAP[strategy](roll_total, tiles_up)
+
+
+Array = np.ndarray[Any, Any]
+BatchStrategy = Callable[[Array, Array, Array | None], Array]
+
+# Entry of a batch ``targets`` array for racks whose player moves first.
+NO_TARGET = -1
+
+SCALAR = "scalar"
+BATCH = "batch"
+
+
+def table_max_roll(rolls: Array) -> int:
+    """
+    Largest roll a move table needs to cover ``rolls``: a whole number of
+    dice, and at least two (so tables are shared across calls).
+    """
+    n_dice = -(-int(np.max(rolls, initial=0)) // DIE_FACES)
+    return DIE_FACES * max(2, n_dice)
+
+
+def check_rolls(rolls: Array, max_roll: int) -> None:
+    """Raise ValueError unless every roll total is in 1..max_roll."""
+    if rolls.size and (rolls.min() < 1 or rolls.max() > max_roll):
+        raise ValueError(
+            f"Roll totals must be between 1 and {max_roll}, "
+            f"got {int(rolls.min())}..{int(rolls.max())}"
+        )
+
+
+def learned_batch_strategy(
+    masks: Array,
+    rolls: Array,
+    targets: Array | None,
+    rules: CompiledRules | None = None,
+) -> Array:
+    """Batch form of learned_strategy: a lookup in the learned move table."""
+    masks = np.asarray(masks, dtype=np.int64)
+    rolls = np.asarray(rolls, dtype=np.int64)
+    if rules is None:
+        policy = load_policy(max(9, int(masks.max(initial=0)).bit_length()))
+    else:
+        policy = load_policy(rules.tiles, rules.variant)
+    check_rolls(rolls, policy.max_roll)
+    flips: Array = policy.moves[masks * policy.max_roll + rolls - 1]
+    return flips.astype(np.int64)
+
+
+# Strategies with a native batch implementation.
+BATCH_STRATEGY_MAP: dict[str, BatchStrategy] = {
+    "learned": learned_batch_strategy,
+}
+
+# STRATEGY_MAP entry each native batch implementation plays like; once the
+# entry is replaced, the batch form is adapted from the new callable instead.
+_BATCH_PAIRS: dict[str, StrategyFn] = {"learned": learned_strategy}
+
+# Strategies registered in batch form only (their STRATEGY_MAP entry is adapted).
+_BATCH_ONLY: set[str] = set()
+
+# Tabulated decisions (see compile_moves()) per (strategy, target, tiles,
+# max_roll, rules), with the callable they were tabulated from.
+_MOVE_TABLES: dict[
+    tuple[str, int | None, int, int, CompiledRules | None], tuple[StrategyFn, Array]
+] = {}
+
+
+def _native_batch(strategy: str) -> BatchStrategy | None:
+    """The native batch form of ``strategy``, unless its STRATEGY_MAP entry changed."""
+    native = BATCH_STRATEGY_MAP.get(strategy)
+    if native is None:
+        return None
+    scalar = STRATEGY_MAP.get(strategy)
+    if scalar is not None and scalar is not _BATCH_PAIRS.get(strategy):
+        return None
+    return native
+
+
+def strategy_interfaces(strategy: str) -> frozenset[str]:
+    """
+    Interfaces ``strategy`` implements natively: SCALAR (one call per move)
+    and/or BATCH (arrays of racks). Every strategy can be used in both forms;
+    non-native forms are adapted.
+    """
+    if strategy not in STRATEGY_MAP and strategy not in BATCH_STRATEGY_MAP:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    interfaces = set()
+    native = _native_batch(strategy)
+    if strategy in STRATEGY_MAP and (native is None or strategy not in _BATCH_ONLY):
+        interfaces.add(SCALAR)
+    if native is not None:
+        interfaces.add(BATCH)
+    return frozenset(interfaces)
+
+
+def move_table(
+    strategy: str,
+    target: int | None = None,
+    tiles: int = 9,
+    max_roll: int = 2 * DIE_FACES,
+    rules: CompiledRules | None = None,
+) -> Array:
+    """Shared compile_moves() table of a scalar strategy (built on first use)."""
+    if strategy not in TARGET_AWARE_STRATEGIES:
+        target = None
+    fn = STRATEGY_MAP.get(strategy)
+    if fn is None:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    rules = _rules_key(strategy, rules)
+    key = (strategy, target, tiles, max_roll, rules)
+    entry = _MOVE_TABLES.get(key)
+    if entry is None or entry[0] is not fn:
+        moves = compile_moves(strategy, target, tiles, max_roll, rules)
+        entry = _MOVE_TABLES[key] = (fn, moves)
+    return entry[1]
+
+
+def batch_strategy(strategy: str, rules: CompiledRules | None = None) -> BatchStrategy:
+    """
+    ``strategy`` in batch form: its native batch implementation if it has one,
+    else a lookup in its tabulated scalar decisions (tabulated once per target,
+    over enough dice for the largest roll seen). Rule-aware strategies play
+    under ``rules``. Roll totals below 1, or above a native table's range,
+    raise ValueError.
+    """
+    native = _native_batch(strategy)
+    if native is not None:
+        if _rules_key(strategy, rules) is not None:
+            rules_aware: Callable[..., Array] = native
+            return partial(rules_aware, rules=rules)
+        return native
+    if strategy not in STRATEGY_MAP:
+        raise ValueError(f"Unknown strategy: {strategy}")
+
+    def tabulated(masks: Array, rolls: Array, targets: Array | None) -> Array:
+        masks = np.asarray(masks, dtype=np.int64)
+        rolls = np.asarray(rolls, dtype=np.int64)
+        if rules is None:
+            tiles = max(9, int(masks.max(initial=0)).bit_length())
+        else:
+            tiles = rules.tiles
+        max_roll = table_max_roll(rolls)
+        check_rolls(rolls, max_roll)
+        cells = masks * max_roll + rolls - 1
+        if targets is None or strategy not in TARGET_AWARE_STRATEGIES:
+            flips = move_table(strategy, None, tiles, max_roll, rules)[cells]
+        else:
+            levels, row = np.unique(np.asarray(targets), return_inverse=True)
+            flips = np.empty(masks.shape, dtype=np.uint16)
+            for i, level in enumerate(levels.tolist()):
+                target = None if level == NO_TARGET else level
+                at = row.reshape(masks.shape) == i
+                table = move_table(strategy, target, tiles, max_roll, rules)
+                flips[at] = table[cells[at]]
+        return np.asarray(flips, dtype=np.int64)
+
+    return tabulated
+
+
+def register_batch_strategy(
+    name: str, strategy: BatchStrategy, target_aware: bool = False
+) -> None:
+    """
+    Add a strategy implemented in batch form. It also becomes available to the
+    scalar game loop (STRATEGY_MAP) through a one-rack adapter.
+    """
+    clear_strategy_caches(name)
+    BATCH_STRATEGY_MAP[name] = strategy
+    _BATCH_ONLY.add(name)
+    if target_aware:
+        TARGET_AWARE_STRATEGIES.add(name)
+    else:
+        TARGET_AWARE_STRATEGIES.discard(name)
+    RULES_AWARE_STRATEGIES.pop(name, None)
+
+    def scalar(
+        roll_total: int, tiles_up: set[int], opponent_score: int | None = None
+    ) -> tuple[int, ...]:
+        mask = 0
+        for tile in tiles_up:
+            mask |= 1 << (tile - 1)
+        target = NO_TARGET if opponent_score is None else opponent_score
+        targets = np.array([target]) if target_aware else None
+        flip = int(strategy(np.array([mask]), np.array([roll_total]), targets)[0])
+        return tuple(n + 1 for n in range(flip.bit_length()) if flip >> n & 1)
+
+    STRATEGY_MAP[name] = scalar
+    _BATCH_PAIRS[name] = scalar
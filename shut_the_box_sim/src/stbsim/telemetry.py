@@ -0,0 +1,203 @@
+"""
+Aggregate state-visit telemetry for Shut the Box simulations.
+
+StateTelemetry is a cheap alternative to raw event logs: subscribed to a game's
+hooks (see hooks.py), it bumps one fixed-size counter per move, indexed by
+(rack state, roll total, chosen move). Move slot 0 of every (state, roll) cell
+counts busts; slot k counts the k-th combo of board.mask_combos(state, roll).
+Only reachable cells are stored, as uint32 counters behind a uint32 index of
+cell offsets, so a 9-tile board needs 14,016 counters per strategy (~55 KB)
+plus a shared 27 KB index, regardless of how many games are run.
+
+A collector is laid out for one board size and roll range: Game and
+TurnManager reject a board or dice count it cannot index.
+
+Example:
+    telemetry = StateTelemetry()
+    Simulation().run(10_000, "greedy_max", "min_tiles", telemetry=telemetry)
+    df = telemetry.to_df()
+    busts = df[df["bust"]].pivot_table(
+        index="tiles_up", columns="roll_total", values="count", aggfunc="sum"
+    )
+"""
+
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .board import mask_combos, mask_numbers
+from .hooks import HookRegistry
+from .solver import DIE_FACES
+
+# Largest count a cell holds (counters are uint32 and saturate).
+COUNT_MAX = 2**32 - 1
+
+TELEMETRY_COLUMNS = [
+    "strategy",
+    "state",
+    "tiles_up",
+    "roll_total",
+    "move",
+    "bust",
+    "count",
+]
+
+
+class StateTelemetry:
+    """
+    Per-strategy move counters over every (rack state, roll total, move) cell.
+
+    Counters are uint32 and saturate: a cell stops counting at COUNT_MAX
+    (~4.3 billion moves), both when moves are recorded and when collectors
+    are merged. Which (state, roll, move) a counter belongs to is not stored;
+    to_df() derives it from the cell offsets.
+
+    Args:
+        tiles: Number of tiles on the board.
+        max_roll: Largest possible roll total.
+    """
+
+    def __init__(self, tiles: int = 9, max_roll: int = 12):
+        self.tiles = tiles
+        self.max_roll = max_roll
+        self.stride = max_roll + 1
+        n_cells = (1 << tiles) * self.stride
+        # bases[mask * stride + roll] is the flat index of that cell's bust slot.
+        bases = array("I", bytes(4 * n_cells))
+        size = 0
+        for mask in range(1 << tiles):
+            for roll in range(self.stride):
+                bases[mask * self.stride + roll] = size
+                size += len(mask_combos(mask, roll)) + 1
+        self.bases = bases
+        self.size = size
+        self._counts: dict[str, array[int]] = {}
+
+    def check_board(self, tiles: int, dice_counts: Sequence[int]) -> None:
+        """
+        Raise ValueError unless this collector can index a ``tiles``-tile board
+        rolling up to ``max(dice_counts)`` dice.
+        """
+        max_roll = DIE_FACES * max(dice_counts)
+        if tiles != self.tiles or max_roll > self.max_roll:
+            raise ValueError(
+                f"StateTelemetry(tiles={self.tiles}, max_roll={self.max_roll}) "
+                f"cannot count a {tiles}-tile board with rolls up to {max_roll}; "
+                f"use StateTelemetry(tiles={tiles}, max_roll={max_roll})"
+            )
+
+    def counter(self, strategy: str) -> "array[int]":
+        """Flat uint32 counter array for ``strategy`` (allocated on first use)."""
+        counts = self._counts.get(strategy)
+        if counts is None:
+            counts = array("I", bytes(4 * self.size))
+            self._counts[strategy] = counts
+        return counts
+
+    def record(self, strategy: str, mask: int, roll: int, rank: int) -> None:
+        """Count one move: ``rank`` is -1 for a bust, else the combo index."""
+        counts = self.counter(strategy)
+        slot = self.bases[mask * self.stride + roll] + rank + 1
+        try:
+            counts[slot] += 1
+        except OverflowError:
+            pass  # Saturated at COUNT_MAX.
+
+    def subscribe(self, hooks: HookRegistry) -> None:
+        """Count the moves and busts of every game bound to ``hooks`` (see hooks.py)."""
+        bases = self.bases
+        stride = self.stride
+        counter = self.counter
+
+        def on_move(
+            tm: Any, move_idx: int, roll_total: int, combo: tuple[int, ...], rank: int
+        ) -> None:
+            counts = counter(tm.strategy)
+            slot = bases[tm.board.up_mask * stride + roll_total] + rank + 1
+            try:
+                counts[slot] += 1
+            except OverflowError:
+                pass  # Saturated at COUNT_MAX.
+
+        def on_bust(tm: Any, move_idx: int, roll_total: int) -> None:
+            counts = counter(tm.strategy)
+            slot = bases[tm.board.up_mask * stride + roll_total]
+            try:
+                counts[slot] += 1
+            except OverflowError:
+                pass  # Saturated at COUNT_MAX.
+
+        hooks.subscribe("move", on_move)
+        hooks.subscribe("bust", on_bust)
+
+    @property
+    def strategies(self) -> list[str]:
+        return list(self._counts)
+
+    def counts(self, strategy: str) -> np.ndarray[Any, np.dtype[np.uint32]]:
+        """Zero-copy NumPy view of one strategy's flat counters."""
+        return np.frombuffer(self.counter(strategy), dtype=np.uint32)
+
+    def merge(self, other: "StateTelemetry") -> None:
+        """Add another collector's counts (e.g. from a worker shard) into this one."""
+        if (other.tiles, other.max_roll) != (self.tiles, self.max_roll):
+            raise ValueError("Cannot merge telemetry for different board layouts")
+        for strategy in other.strategies:
+            counts = self.counts(strategy)
+            total = counts.astype(np.uint64) + other.counts(strategy)
+            counts[:] = np.minimum(total, COUNT_MAX)
+
+    @classmethod
+    def combine(cls, shards: Iterable["StateTelemetry"]) -> "StateTelemetry":
+        """Merge several shards into a new collector."""
+        shards = list(shards)
+        if not shards:
+            return cls()
+        merged = cls(shards[0].tiles, shards[0].max_roll)
+        for shard in shards:
+            merged.merge(shard)
+        return merged
+
+    def _slots(
+        self, idx: np.ndarray[Any, Any]
+    ) -> tuple[np.ndarray[Any, Any], np.ndarray[Any, Any], np.ndarray[Any, Any]]:
+        """(state, roll total, move slot) of flat counter indices ``idx``."""
+        # Every cell has a bust slot, so cell offsets strictly increase.
+        bases = np.frombuffer(self.bases, dtype=np.uint32)
+        cell = np.searchsorted(bases, idx, side="right") - 1
+        return cell // self.stride, cell % self.stride, idx - bases[cell]
+
+    def to_df(self) -> pd.DataFrame:
+        """
+        Long-form table of the non-zero counters.
+
+        Columns: strategy, state (bitmask), tiles_up, roll_total, move (tuple of
+        tiles flipped, () for a bust), bust, count.
+        """
+        frames = []
+        for strategy in self.strategies:
+            counts = self.counts(strategy)
+            idx = np.flatnonzero(counts)
+            states, rolls, ranks = self._slots(idx)
+            frames.append(
+                pd.DataFrame(
+                    {
+                        "strategy": strategy,
+                        "state": states,
+                        "tiles_up": [mask_numbers(int(m)) for m in states],
+                        "roll_total": rolls,
+                        "move": [
+                            mask_combos(int(m), int(r))[k - 1] if k else ()
+                            for m, r, k in zip(states, rolls, ranks, strict=True)
+                        ],
+                        "bust": ranks == 0,
+                        "count": counts[idx],
+                    }
+                )
+            )
+        if not frames:
+            return pd.DataFrame(columns=TELEMETRY_COLUMNS)
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,476 @@
+"""
+Bit-packed binary game traces.
+
+Under known rules, a game is fully determined by its dice and the moves
+chosen: the rack before every roll, the number of dice, when a turn ends,
+the scores and the winner can all be replayed. A trace therefore stores, per
+step (roll) of every turn, only:
+
+    - the faces rolled, ``(faces - 1).bit_length()`` bits per die (3 for d6)
+    - the chosen move as its rank in board.mask_combos(rack, roll), in just
+      enough bits to tell the valid combos apart (none for a forced move or
+      a bust)
+
+A game is one record, a few bytes long:
+
+    varint game_id | varint payload length | payload (bits, LSB first)
+
+after a file header (magic, version, then a length-prefixed JSON TraceHeader
+with the board size, rule variant name and fields, die faces and players).
+Records are self-delimiting, so runs append to an existing trace file as long
+as the header matches. Since the header spells out the rules, traces of
+custom RuleVariants decode without knowing the variant.
+
+TraceWriter is a hook subscriber (see hooks.py) that streams each game to
+the file as it ends. read_traces() replays the records into GameTrace dicts
+and decode_events() expands them into an InMemoryEventLogger with the same
+events the logger records live, so ``decode_events(path).to_df()`` stands in
+for a logged run. Per-event timestamps are not stored: decoded events carry
+the time the trace file was created.
+
+Example:
+    with TraceWriter("run.stbt") as writer:
+        hooks = HookRegistry()
+        writer.subscribe(hooks)
+        Simulation().run(100_000, "greedy_max", "min_tiles", 0, hooks=hooks)
+    df = decode_events("run.stbt").to_df()
+"""
+
+import datetime
+import json
+import os
+import threading
+from collections.abc import Iterator
+from pathlib import Path
+from types import TracebackType
+from typing import Any, BinaryIO, TypedDict
+
+from .board import mask_combos, mask_numbers
+from .hooks import HookRegistry
+from .loggers import InMemoryEventLogger
+from .rules import RULE_VARIANTS, CompiledRules, RuleVariant, Scoring, rule_variant
+from .solver import DIE_FACES
+
+TRACE_MAGIC = b"STBTRACE"
+TRACE_VERSION = 2
+
+
+class TraceRules(TypedDict):
+    """The fields of the RuleVariant a trace was played under (see RuleVariant)."""
+
+    scoring: Scoring
+    dice: int
+    one_die_at: int | None
+    down_and_out: bool
+    rounds: int
+
+
+class TraceHeader(TypedDict):
+    """What every record of a trace file shares.
+
+    Fields:
+        - tiles: Number of tiles on the board
+        - variant: Rule variant name (see rules.RULE_VARIANTS)
+        - rules: Fields of the rule variant
+        - faces: Faces per die
+        - sim_id: Simulation identifier of the games
+        - players: (name, strategy) of each player, in turn order
+        - created: ISO 8601 time the file was created
+    """
+
+    tiles: int
+    variant: str
+    rules: TraceRules
+    faces: int
+    sim_id: Any
+    players: list[list[str]]
+    created: str
+
+
+class TurnTrace(TypedDict):
+    """One replayed turn.
+
+    Fields:
+        - player_id: Player name
+        - turn_idx: Player index in turn order
+        - rolls: Faces rolled at each step
+        - combos: Tiles flipped at each step (empty for the final bust)
+        - score: Turn score under the trace's rules
+        - shut_box: Whether the turn shut the box
+    """
+
+    player_id: str
+    turn_idx: int
+    rolls: list[tuple[int, ...]]
+    combos: list[tuple[int, ...]]
+    score: int
+    shut_box: bool
+
+
+class GameTrace(TypedDict):
+    """One replayed game: its id and turns, in play order (rounds included)."""
+
+    game_id: int
+    turns: list[TurnTrace]
+
+
+def _write_varint(stream: BinaryIO, value: int) -> None:
+    out = bytearray()
+    while value >= 0x80:
+        out.append(value & 0x7F | 0x80)
+        value >>= 7
+    out.append(value)
+    stream.write(out)
+
+
+def _read_varint(stream: BinaryIO) -> int | None:
+    """The next varint, or None at end of file."""
+    value = shift = 0
+    while True:
+        byte = stream.read(1)
+        if not byte:
+            if shift:
+                raise ValueError("Truncated trace record")
+            return None
+        value |= (byte[0] & 0x7F) << shift
+        if byte[0] < 0x80:
+            return value
+        shift += 7
+
+
+def _read_header(stream: BinaryIO) -> TraceHeader:
+    if stream.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+        raise ValueError("Not a trace file")
+    version = stream.read(1)
+    if not version or version[0] != TRACE_VERSION:
+        raise ValueError(f"Unsupported trace version: {version!r}")
+    size = _read_varint(stream)
+    if size is None:
+        raise ValueError("Truncated trace header")
+    header: TraceHeader = json.loads(stream.read(size).decode("utf-8"))
+    return header
+
+
+def _rule_fields(variant: RuleVariant) -> TraceRules:
+    return TraceRules(
+        scoring=variant.scoring,
+        dice=variant.dice,
+        one_die_at=variant.one_die_at,
+        down_and_out=variant.down_and_out,
+        rounds=variant.rounds,
+    )
+
+
+def _same_rules(header: TraceHeader, variant: RuleVariant) -> bool:
+    return (header["variant"], header["rules"]) == (
+        variant.name,
+        _rule_fields(variant),
+    )
+
+
+def header_variant(header: TraceHeader) -> RuleVariant:
+    """
+    The rules a trace was played under: the built-in variant of that name if
+    its fields match, else a RuleVariant rebuilt from the header.
+    """
+    builtin = RULE_VARIANTS.get(header["variant"])
+    if builtin is not None and _same_rules(header, builtin):
+        return builtin
+    return RuleVariant(header["variant"], **header["rules"])
+
+
+def _rank_bits(n_combos: int) -> int:
+    """Bits needed to store a rank among ``n_combos`` valid moves."""
+    return (n_combos - 1).bit_length()
+
+
+class TraceWriter:
+    """
+    Hook subscriber appending every game played to a trace file.
+
+    The board size and rule variant are taken from the games themselves
+    (``len(game.board.tiles)`` and ``game.variation``). The header is written
+    when the first game starts (it names the players); opening an existing
+    trace appends to it. ValueError is raised if the file's board size, rules
+    or die faces differ from the writer's, and when any game is played on
+    another board, under other rules or by other players than the header's.
+    Games are buffered per game id, so worker threads can share a writer;
+    records then land in the order games end.
+
+    Args:
+        path: Trace file to create or append to.
+        variant: Rules the games must be played under (default: those of the
+            first game).
+        tiles: Number of tiles the board must have (default: that of the
+            first game).
+        faces: Faces per die.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        variant: RuleVariant | str | None = None,
+        tiles: int | None = None,
+        faces: int = DIE_FACES,
+    ):
+        self.path = Path(path)
+        self.variant = rule_variant(variant) if variant is not None else None
+        self.tiles = tiles
+        self.faces = faces
+        self.games_written = 0
+        self._lock = threading.Lock()
+        self._buffers: dict[Any, list[int]] = {}
+        self._header: TraceHeader | None = None
+        # Compiled rules of the games checked so far (see _check_game()).
+        self._rules: CompiledRules | None = None
+        self._stream = open(self.path, "a+b")
+        self._stream.seek(0)
+        if self._stream.read(1):
+            self._stream.seek(0)
+            header = _read_header(self._stream)
+            if (
+                (tiles is not None and header["tiles"] != tiles)
+                or (self.variant is not None and not _same_rules(header, self.variant))
+                or header["faces"] != faces
+            ):
+                self._stream.close()
+                raise ValueError(
+                    f"{self.path} holds games with tiles={header['tiles']}, "
+                    f"variant={header['variant']}, faces={header['faces']}"
+                )
+            self._header = header
+        self._stream.seek(0, os.SEEK_END)
+        self._header_written = False
+
+    def _check_game(self, game: Any) -> None:
+        """Adopt, or check against the writer and file, the rules of ``game``."""
+        tiles, variant = len(game.board.tiles), game.variation
+        if (self.tiles is not None and tiles != self.tiles) or (
+            self.variant is not None
+            and (variant.name, _rule_fields(variant))
+            != (self.variant.name, _rule_fields(self.variant))
+        ):
+            raise ValueError(
+                f"Trace writer for tiles={self.tiles}, variant={self.variant} "
+                f"cannot record a game with tiles={tiles}, variant={variant}"
+            )
+        header = self._header
+        if header is not None and (
+            header["tiles"] != tiles or not _same_rules(header, variant)
+        ):
+            raise ValueError(
+                f"{self.path} holds games with tiles={header['tiles']}, "
+                f"variant={header['variant']}, not tiles={tiles}, "
+                f"variant={variant.name}"
+            )
+        self.tiles, self.variant = tiles, variant
+        if not self._header_written:
+            self._write_header(game)
+        self._rules = game.rules
+
+    def _write_header(self, game: Any) -> None:
+        if self._header is None:
+            assert self.tiles is not None and self.variant is not None
+            self._header = TraceHeader(
+                tiles=self.tiles,
+                variant=self.variant.name,
+                rules=_rule_fields(self.variant),
+                faces=self.faces,
+                sim_id=game.sim_id,
+                players=[[p.name, p.strategy] for p in game.players],
+                created=datetime.datetime.now(datetime.UTC).isoformat(),
+            )
+            raw = json.dumps(self._header).encode("utf-8")
+            self._stream.write(TRACE_MAGIC + bytes([TRACE_VERSION]))
+            _write_varint(self._stream, len(raw))
+            self._stream.write(raw)
+        self._header_written = True
+
+    def subscribe(self, hooks: HookRegistry) -> None:
+        buffers, faces = self._buffers, self.faces
+        face_bits = (faces - 1).bit_length()
+
+        def on_game_start(game: Any) -> None:
+            if game.rules is not self._rules:
+                with self._lock:
+                    if game.rules is not self._rules:
+                        self._check_game(game)
+            assert self._header is not None
+            players = self._header["players"]
+            if [[p.name, p.strategy] for p in game.players] != players:
+                raise ValueError(f"{self.path} holds games between {players}")
+            buffers[game.game_id] = [0, 0]
+
+        def on_dice_roll(tm: Any, roll_values: list[int]) -> None:
+            buf = buffers[tm.game_id]
+            acc, n_bits = buf
+            for value in roll_values:
+                acc |= (value - 1) << n_bits
+                n_bits += face_bits
+            buf[0], buf[1] = acc, n_bits
+
+        def on_move(
+            tm: Any, move_idx: int, roll_total: int, combo: tuple[int, ...], rank: int
+        ) -> None:
+            width = _rank_bits(len(mask_combos(tm.board.up_mask, roll_total)))
+            if width:
+                buf = buffers[tm.game_id]
+                buf[0] |= rank << buf[1]
+                buf[1] += width
+
+        def on_game_end(game: Any, winner: Any) -> None:
+            acc, n_bits = buffers.pop(game.game_id)
+            payload = acc.to_bytes((n_bits + 7) // 8, "little")
+            with self._lock:
+                _write_varint(self._stream, game.game_id)
+                _write_varint(self._stream, len(payload))
+                self._stream.write(payload)
+                self.games_written += 1
+
+        hooks.subscribe("game_start", on_game_start)
+        hooks.subscribe("dice_roll", on_dice_roll)
+        hooks.subscribe("move", on_move)
+        hooks.subscribe("game_end", on_game_end)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._stream.flush()
+
+    def close(self) -> None:
+        self._stream.close()
+
+    def __enter__(self) -> "TraceWriter":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+
+def read_header(path: str | os.PathLike[str]) -> TraceHeader:
+    """The header of a trace file."""
+    with open(path, "rb") as stream:
+        return _read_header(stream)
+
+
+def read_traces(
+    path: str | os.PathLike[str], variant: RuleVariant | None = None
+) -> Iterator[GameTrace]:
+    """
+    Replay every game of a trace file, in file order, under the rules its
+    header spells out (or ``variant``, which must be the one the games were
+    played under).
+    """
+    with open(path, "rb") as stream:
+        header = _read_header(stream)
+        rules = (variant or header_variant(header)).compile(header["tiles"])
+        dice_counts, scores = rules.dice_counts, rules.scores
+        face_bits = (header["faces"] - 1).bit_length()
+        face_mask = (1 << face_bits) - 1
+        full = (1 << header["tiles"]) - 1
+        while (game_id := _read_varint(stream)) is not None:
+            size = _read_varint(stream)
+            payload = stream.read(size or 0)
+            if size is None or len(payload) != size:
+                raise ValueError("Truncated trace record")
+            acc = int.from_bytes(payload, "little")
+            turns: list[TurnTrace] = []
+            for _ in range(rules.rounds):
+                for turn_idx, (name, _strategy) in enumerate(header["players"]):
+                    mask = full
+                    rolls: list[tuple[int, ...]] = []
+                    combos: list[tuple[int, ...]] = []
+                    while True:
+                        faces = []
+                        for _die in range(dice_counts[mask]):
+                            faces.append((acc & face_mask) + 1)
+                            acc >>= face_bits
+                        rolls.append(tuple(faces))
+                        valid = mask_combos(mask, sum(faces))
+                        if not valid:
+                            combos.append(())
+                            break
+                        width = _rank_bits(len(valid))
+                        combo = valid[acc & ((1 << width) - 1)]
+                        acc >>= width
+                        combos.append(combo)
+                        for tile in combo:
+                            mask &= ~(1 << (tile - 1))
+                        if not mask:
+                            break
+                    turns.append(
+                        TurnTrace(
+                            player_id=name,
+                            turn_idx=turn_idx,
+                            rolls=rolls,
+                            combos=combos,
+                            score=scores[mask],
+                            shut_box=not mask,
+                        )
+                    )
+            yield GameTrace(game_id=game_id, turns=turns)
+
+
+def decode_events(
+    path: str | os.PathLike[str], variant: RuleVariant | None = None
+) -> InMemoryEventLogger:
+    """
+    Expand a trace file into the events InMemoryEventLogger records live
+    (see InMemoryEventLogger.subscribe()), game by game in file order.
+    """
+    header = read_header(path)
+    tiles = header["tiles"]
+    sim_id = header["sim_id"]
+    strategies = dict(header["players"])
+    names = list(strategies)
+    created = datetime.datetime.fromisoformat(header["created"])
+    logger = InMemoryEventLogger()
+    for game in read_traces(path, variant):
+        game_id = game["game_id"]
+        totals = dict.fromkeys(names, 0)
+        logger.log_game_start(sim_id, game_id, names, num_dice=2)
+        for turn in game["turns"]:
+            name, turn_idx = turn["player_id"], turn["turn_idx"]
+            mask = (1 << tiles) - 1
+            for move_idx, (roll, combo) in enumerate(
+                zip(turn["rolls"], turn["combos"], strict=True)
+            ):
+                tiles_up = mask_numbers(mask)
+                logger.log_dice_roll(sim_id, game_id, name, turn_idx, roll, tiles_up)
+                if combo:
+                    for tile in combo:
+                        mask &= ~(1 << (tile - 1))
+                logger.log_move_attempt(
+                    sim_id,
+                    game_id,
+                    name,
+                    turn_idx,
+                    move_idx,
+                    strategies[name],
+                    combo,
+                    tiles_up,
+                    sum(roll),
+                    bool(combo),
+                    tiles_flipped=combo or None,
+                    final_tiles_up=mask_numbers(mask) if combo else None,
+                )
+            logger.log_turn_end(
+                sim_id,
+                game_id,
+                name,
+                turn_idx,
+                list(mask_numbers(mask)),
+                turn["score"],
+                turn["shut_box"],
+            )
+            totals[name] += turn["score"]
+        # First player with the lowest total wins, as in Game.determine_winner().
+        winner = min(names, key=totals.__getitem__)
+        logger.log_game_end(sim_id, game_id, winner, totals)
+    for event in logger.events:
+        event["timestamp"] = created
+    return logger
@@ -1,14 +1,47 @@
-from .board import Board
+from itertools import combinations
+
+from .board import Board, mask_combos
 from .dice import DiceManager
+from .hooks import HookRegistry
 from .loggers import InMemoryEventLogger
 from .player import Player
+from .rules import STANDARD, CompiledRules
+from .strategies import TARGET_AWARE_STRATEGIES, decide, decision_cache, decision_key
+from .telemetry import StateTelemetry
 
 
 class TurnManager:
     """
-    Handles a single player's turn: rolls, moves, and logs all events.
+    Handles a single player's turn: rolls, moves, and dispatches events to hooks.
+
+    A Game keeps one TurnManager and calls reset() for each turn, so the turn
+    loop itself allocates nothing beyond the dice roll. Hooks (see hooks.py)
+    are bound once by bind_hooks(); kinds without subscribers cost one local
+    None check per event. A ``logger`` or ``telemetry`` passed directly is
+    subscribed to a private copy of ``hooks``. Turns are scored by looking up
+    the final rack in ``rules.scores`` (default: the standard rules).
     """
 
+    __slots__ = (
+        "player",
+        "board",
+        "dice_manager",
+        "logger",
+        "sim_id",
+        "game_id",
+        "turn_idx",
+        "strategy",
+        "telemetry",
+        "target",
+        "hooks",
+        "rules",
+        "scores",
+        "_on_dice_roll",
+        "_on_move",
+        "_on_bust",
+        "_on_turn_end",
+    )
+
     def __init__(
         self,
         player: Player,
@@ -18,7 +51,11 @@ class TurnManager:
         sim_id: str | int | None = None,
         game_id: str | int | None = None,
         turn_idx: int = 0,
-        strategy: str = "greedy",
+        strategy: str = "min_tiles",
+        telemetry: StateTelemetry | None = None,
+        target: int | None = None,
+        hooks: HookRegistry | None = None,
+        rules: CompiledRules | None = None,
     ):
         self.player = player
         self.board = board
@@ -28,79 +65,89 @@ class TurnManager:
         self.game_id = game_id
         self.turn_idx = turn_idx
         self.strategy = strategy
+        self.telemetry = telemetry
+        self.target = target
+        if rules is None:
+            rules = STANDARD.compile(len(board.tiles))
+        self.rules = rules
+        self.scores = rules.scores
+        if logger is not None or telemetry is not None:
+            hooks = hooks.copy() if hooks is not None else HookRegistry()
+            if logger is not None:
+                logger.subscribe(hooks)
+            if telemetry is not None:
+                telemetry.check_board(len(board.tiles), rules.dice_counts)
+                telemetry.subscribe(hooks)
+        self.bind_hooks(hooks)
+
+    def bind_hooks(self, hooks: HookRegistry | None) -> None:
+        """Resolve the dispatchers the turn loop calls (None = no subscribers)."""
+        self.hooks = hooks
+        if hooks is None:
+            hooks = HookRegistry()
+        self._on_dice_roll = hooks.dispatcher("dice_roll")
+        self._on_move = hooks.dispatcher("move")
+        self._on_bust = hooks.dispatcher("bust")
+        self._on_turn_end = hooks.dispatcher("turn_end")
+
+    def reset(
+        self,
+        player: Player,
+        turn_idx: int,
+        game_id: str | int | None = None,
+        target: int | None = None,
+    ) -> None:
+        """
+        Point this manager at the next turn (and optionally a new game).
+
+        The player's strategy is used for the turn; ``target`` is the score to
+        beat, passed to target-aware strategies.
+        """
+        self.player = player
+        self.strategy = player.strategy
+        self.turn_idx = turn_idx
+        self.target = target
+        if game_id is not None:
+            self.game_id = game_id
 
     def play_turn(self) -> tuple[int, bool]:
         """Runs through a full turn for this player until bust/shut."""
+        board = self.board
+        roll_dice = self.dice_manager.roll
+        on_dice_roll = self._on_dice_roll
+        on_move = self._on_move
+        on_bust = self._on_bust
         move_idx = 0
         shut_box = False
+        strategy = self.strategy
+        rules = self.rules
+        decisions = decision_cache(strategy, rules)
+        target = self.target if strategy in TARGET_AWARE_STRATEGIES else None
         while True:
-            # Dice roll
-            roll_values = self.dice_manager.roll(self.board)
-            if self.logger:
-                self.logger.log_dice_roll(
-                    self.sim_id,
-                    self.game_id,
-                    self.player.name,
-                    self.turn_idx,
-                    roll_values,
-                    [t.number for t in self.board.get_upright_tiles()],
-                )
+            roll_values = roll_dice(board)
+            if on_dice_roll is not None:
+                on_dice_roll(self, roll_values)
             roll_sum = sum(roll_values)
-            tiles_up = [t.number for t in self.board.get_upright_tiles()]
-            # Find possible combos
-            combos = self.find_all_valid_combos(tiles_up, roll_sum)
+            combos = mask_combos(board.up_mask, roll_sum)
             if not combos:
-                if self.logger:
-                    self.logger.log_move_attempt(
-                        self.sim_id,
-                        self.game_id,
-                        self.player.name,
-                        self.turn_idx,
-                        move_idx,
-                        self.strategy,
-                        (),
-                        tiles_up,
-                        roll_sum,
-                        False,
-                    )
+                if on_bust is not None:
+                    on_bust(self, move_idx, roll_sum)
                 break  # No valid move -> turn ends
-            # Greedy pick (just for illustration, can replace)
-            chosen_combo = combos[0]
-            # Log move attempt
-            if self.logger:
-                self.logger.log_move_attempt(
-                    self.sim_id,
-                    self.game_id,
-                    self.player.name,
-                    self.turn_idx,
-                    move_idx,
-                    self.strategy,
-                    chosen_combo,
-                    tiles_up,
-                    roll_sum,
-                    True,
-                    tiles_flipped=chosen_combo,
-                    final_tiles_up=[n for n in tiles_up if n not in chosen_combo],
-                )
-            # Flip those tiles
-            self.board.flip_tiles(list(chosen_combo))
+            # Strategy pick, cached per (rack, roll[, target])
+            rank = decisions.get(decision_key(board.up_mask, roll_sum, target))
+            if rank is None:
+                rank = decide(strategy, board.up_mask, roll_sum, target, rules)
+            chosen_combo = combos[rank]
+            if on_move is not None:
+                on_move(self, move_idx, roll_sum, chosen_combo, rank)
+            board.flip_tiles(chosen_combo)
             move_idx += 1
-            # Check for shut box
-            if self.board.are_all_tiles_down():
+            if board.are_all_tiles_down():
                 shut_box = True
                 break
-        # End of turn: score and log
-        turn_score = self.board.calculate_remaining_sum()
-        if self.logger:
-            self.logger.log_turn_end(
-                self.sim_id,
-                self.game_id,
-                self.player.name,
-                self.turn_idx,
-                [t.number for t in self.board.get_upright_tiles()],
-                turn_score,
-                shut_box,
-            )
+        turn_score = self.scores[board.up_mask]
+        if self._on_turn_end is not None:
+            self._on_turn_end(self, turn_score, shut_box)
         return turn_score, shut_box
 
     @staticmethod
@@ -108,8 +155,6 @@ class TurnManager:
         """
         Find all combinations of tiles that sum to the roll value.
         """
-        from itertools import combinations
-
         result = []
         for r in range(1, len(tiles) + 1):
             for combo in combinations(tiles, r):
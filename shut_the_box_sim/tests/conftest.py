@@ -0,0 +1,10 @@
+import pytest
+
+
+@pytest.fixture(autouse=True, scope="session")
+def isolated_artifact_cache(tmp_path_factory):
+    """Keep tests from reading or writing the user's real artifact cache."""
+    mp = pytest.MonkeyPatch()
+    mp.setenv("STBSIM_CACHE_DIR", str(tmp_path_factory.mktemp("stbsim-cache")))
+    yield
+    mp.undo()
@@ -0,0 +1,101 @@
+import numpy as np
+import pytest
+
+from stbsim.board import mask_combos
+from stbsim.simulation import Simulation
+from stbsim.strategies import (
+    BATCH,
+    BATCH_STRATEGY_MAP,
+    NO_TARGET,
+    SCALAR,
+    STRATEGY_MAP,
+    TARGET_AWARE_STRATEGIES,
+    batch_strategy,
+    clear_strategy_caches,
+    decide,
+    greedy_max_strategy,
+    learned_strategy,
+    min_tiles_strategy,
+    register_batch_strategy,
+    strategy_interfaces,
+)
+
+MASKS = np.repeat(np.arange(1, 512), 12)
+ROLLS = np.tile(np.arange(1, 13), 511)
+
+
+def _scalar_flips(strategy, target=None):
+    flips = []
+    for mask, roll in zip(MASKS.tolist(), ROLLS.tolist(), strict=True):
+        combos = mask_combos(mask, roll)
+        combo = combos[decide(strategy, mask, roll, target)] if combos else ()
+        flips.append(sum(1 << (t - 1) for t in combo))
+    return np.array(flips)
+
+
+@pytest.mark.parametrize("strategy", ["greedy_max", "min_tiles", "learned"])
+def test_batch_form_matches_scalar_decisions(strategy):
+    flips = batch_strategy(strategy)(MASKS, ROLLS, None)
+    assert np.array_equal(flips, _scalar_flips(strategy))
+
+
+def test_target_aware_batch_uses_each_entry_target():
+    targets = np.where(MASKS % 3 == 0, 5, NO_TARGET)
+    flips = batch_strategy("beat_target")(MASKS, ROLLS, targets)
+    at = targets == 5
+    assert np.array_equal(flips[at], _scalar_flips("beat_target", 5)[at])
+    assert np.array_equal(flips[~at], _scalar_flips("beat_target")[~at])
+
+
+def test_interfaces_and_batch_only_registration():
+    assert strategy_interfaces("min_tiles") == {SCALAR}
+    assert strategy_interfaces("learned") == {SCALAR, BATCH}
+    with pytest.raises(ValueError):
+        strategy_interfaces("nope")
+
+    min_tiles = batch_strategy("min_tiles")
+    register_batch_strategy("batch_min_tiles", lambda m, r, t: min_tiles(m, r, None))
+    try:
+        assert strategy_interfaces("batch_min_tiles") == {BATCH}
+        assert STRATEGY_MAP["batch_min_tiles"](8, {1, 2, 3, 4, 5, 6, 7, 8, 9}) == (8,)
+        played = Simulation().run(50, "greedy_max", "batch_min_tiles", seed_start=1)
+        expected = Simulation().run(50, "greedy_max", "min_tiles", seed_start=1)
+        assert played == expected
+    finally:
+        del STRATEGY_MAP["batch_min_tiles"], BATCH_STRATEGY_MAP["batch_min_tiles"]
+        TARGET_AWARE_STRATEGIES.discard("batch_min_tiles")
+
+
+def test_replacing_a_strategy_drops_its_cached_decisions():
+    sim = Simulation()
+    greedy = [g["p1_score"] for g in sim.run(200, "greedy_max", "min_tiles", 0)]
+    sim.run(200, "min_tiles", "learned", seed_start=0)
+    STRATEGY_MAP["min_tiles"] = greedy_max_strategy
+    STRATEGY_MAP["learned"] = greedy_max_strategy
+    try:
+        played = sim.run(200, "min_tiles", "learned", seed_start=0)
+        assert [g["p1_score"] for g in played] == greedy
+        assert np.array_equal(
+            batch_strategy("learned")(MASKS, ROLLS, None), _scalar_flips("greedy_max")
+        )
+        assert strategy_interfaces("learned") == {SCALAR}
+    finally:
+        STRATEGY_MAP["min_tiles"] = min_tiles_strategy
+        STRATEGY_MAP["learned"] = learned_strategy
+        clear_strategy_caches()
+    assert strategy_interfaces("learned") == {SCALAR, BATCH}
+
+
+def test_tabulated_batch_covers_three_dice_rolls():
+    masks = np.repeat(np.arange(1, 1 << 12, 37), 18)
+    rolls = np.tile(np.arange(1, 19), len(masks) // 18)
+    flips = batch_strategy("min_tiles")(masks, rolls, None)
+    for mask, roll, flip in zip(masks.tolist(), rolls.tolist(), flips, strict=True):
+        combos = mask_combos(mask, roll)
+        combo = combos[decide("min_tiles", mask, roll)] if combos else ()
+        assert flip == sum(1 << (t - 1) for t in combo)
+    assert batch_strategy("min_tiles")(np.array([0xFFF]), np.array([15]), None) > 0
+    with pytest.raises(ValueError):
+        batch_strategy("min_tiles")(np.array([0xFF]), np.array([0]), None)
+    with pytest.raises(ValueError):
+        batch_strategy("learned")(np.array([0xFF]), np.array([15]), None)
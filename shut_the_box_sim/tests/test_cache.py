@@ -0,0 +1,98 @@
+import numpy as np
+from typer.testing import CliRunner
+
+from stbsim.cache import (
+    ARTIFACT_BUILDERS,
+    ARTIFACT_FORMATS,
+    ArtifactCache,
+    library_version,
+    warm,
+)
+from stbsim.cli import app
+from stbsim.rules import RuleVariant
+from stbsim.solver import build_solver_arrays, solve_tables
+
+
+def test_put_get_memory_maps_read_only(tmp_path):
+    cache = ArtifactCache(tmp_path)
+    calls = []
+
+    def build():
+        calls.append(1)
+        return {"values": np.arange(10, dtype=np.float32)}
+
+    first = cache.get_or_build("demo", 4, build)
+    second = cache.get_or_build("demo", 4, build)
+    assert calls == [1]
+    assert isinstance(second["values"], np.memmap)
+    assert not second["values"].flags.writeable
+    assert (first["values"] == np.arange(10)).all()
+
+    (entry,) = cache.entries()
+    assert entry["key"] == f"demo-standard-4-f0-v{library_version()}"
+    assert entry["format"] == 0
+    assert entry["nbytes"] == 40
+    assert cache.get("demo", 5) is None
+    assert cache.get("demo", 4, variant="other") is None
+    assert cache.clear("nope") == 0
+    assert cache.clear() == 1
+    assert cache.entries() == []
+
+
+def test_format_version_bump_invalidates_entries(tmp_path, monkeypatch):
+    cache = ArtifactCache(tmp_path)
+    cache.put("solver", 4, {"expected": np.zeros(16)})
+    assert cache.get("solver", 4) is not None
+    monkeypatch.setitem(ARTIFACT_FORMATS, "solver", ARTIFACT_FORMATS["solver"] + 1)
+    assert cache.get("solver", 4) is None
+    rebuilt = cache.get_or_build("solver", 4, lambda: {"expected": np.ones(16)})
+    assert (rebuilt["expected"] == 1).all()
+    assert {e["format"] for e in cache.entries()} == {
+        ARTIFACT_FORMATS["solver"] - 1,
+        ARTIFACT_FORMATS["solver"],
+    }
+
+
+def test_disabled_cache_builds_in_memory(monkeypatch):
+    monkeypatch.setenv("STBSIM_CACHE_DIR", "")
+    cache = ArtifactCache()
+    assert cache.root is None
+    arrays = cache.get_or_build("demo", 3, lambda: {"x": np.ones(3)})
+    assert (arrays["x"] == 1).all()
+    assert cache.entries() == []
+
+
+def test_cache_cli_warm_list_clear(tmp_path, monkeypatch):
+    monkeypatch.setenv("STBSIM_CACHE_DIR", str(tmp_path))
+    runner = CliRunner()
+    assert (
+        "Built: solver" in runner.invoke(app, ["cache", "warm", "--tiles", "6"]).stdout
+    )
+    assert (
+        "Already warm" in runner.invoke(app, ["cache", "warm", "--tiles", "6"]).stdout
+    )
+    listing = runner.invoke(app, ["cache", "list"]).stdout
+    assert "solver-standard-6" in listing
+    assert "learned_policy-standard-6" in listing
+    cached = ArtifactCache(tmp_path).get("solver", 6)
+    assert cached is not None
+    assert np.allclose(cached["expected"], build_solver_arrays(6)["expected"])
+    removed = runner.invoke(app, ["cache", "clear"]).stdout
+    assert f"Removed {len(ARTIFACT_BUILDERS)}" in removed
+
+
+def test_warm_variant_uses_the_solve_cache_key(tmp_path, monkeypatch):
+    monkeypatch.setenv("STBSIM_CACHE_DIR", str(tmp_path))
+    runner = CliRunner()
+    out = runner.invoke(app, ["cache", "warm", "--tiles", "5", "--variant", "digits"])
+    assert "Built: solver" in out.stdout
+    assert "solver-digits-5" in runner.invoke(app, ["cache", "list"]).stdout
+    assert runner.invoke(app, ["cache", "warm", "--variant", "nope"]).exit_code == 1
+
+    custom = RuleVariant("house", one_die_at=5, down_and_out=True)
+    cache = ArtifactCache(tmp_path)
+    assert warm(5, cache, variant=custom) == list(ARTIFACT_BUILDERS)
+    assert warm(5, cache, variant=custom) == []
+    cached = cache.get("solver", 5, custom.cache_key)
+    assert cached is not None
+    assert np.allclose(cached["expected"], solve_tables(5, custom).expected)
@@ -51,10 +51,15 @@ def test_game_can_run_basic(monkeypatch, capsys):
 
     monkeypatch.setattr(DiceManager, "roll", fake_roll)
     p1, p2 = Player("Alice"), Player("Bob")
-    g = Game([p1, p2], tiles=6)
+    g = Game([p1, p2], tiles=6, verbose=True)
     g.start_game()
     assert g.is_game_over()
     assert all(isinstance(p.score, int) for p in g.players)
     # Confirm output mentions winner
     captured = capsys.readouterr().out
     assert "Winner:" in captured
+
+
+def test_game_is_quiet_by_default(capsys):
+    Game([Player("Alice"), Player("Bob")], tiles=6).start_game()
+    assert capsys.readouterr().out == ""
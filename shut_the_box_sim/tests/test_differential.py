@@ -0,0 +1,55 @@
+import numpy as np
+
+from stbsim.differential import record_baseline, resimulate
+from stbsim.simulation import Simulation
+from stbsim.strategies import STRATEGY_MAP
+
+
+def test_run_games_replays_a_subset_of_run():
+    sim = Simulation()
+    full = sim.run(40, "greedy_max", "min_tiles", seed_start=3)
+    ids = [31, 2, 17]
+    assert sim.run_games(ids, "greedy_max", "min_tiles", 3) == [full[i] for i in ids]
+
+
+def test_baseline_trace_covers_every_move():
+    baseline = record_baseline(200, "greedy_max", "min_tiles", seed_start=0)
+    trace = baseline["trace"]
+    assert set(np.unique(trace["game_id"])) <= set(range(200))
+    assert set(np.unique(trace["turn_idx"])) == {0, 1}
+    assert (trace["target"][trace["turn_idx"] == 0] == -1).all()
+
+
+def test_resimulate_matches_a_full_rerun():
+    baseline = record_baseline(400, "greedy_max", "min_tiles", seed_start=7)
+    for p1, p2 in [(None, "beat_target"), ("min_tiles", None)]:
+        update = resimulate(baseline, p1_strategy=p1, p2_strategy=p2)
+        full = Simulation().run(
+            400, p1 or "greedy_max", p2 or "min_tiles", seed_start=7
+        )
+        assert update["results"] == full
+        assert 0 < update["fraction_resimulated"] < 1
+
+
+def test_resimulate_keeps_the_baseline_rules():
+    baseline = record_baseline(
+        200, "greedy_max", "min_tiles", seed_start=1, variant="three_dice", tiles=12
+    )
+    assert baseline["trace"]["roll"].max() > 15
+    update = resimulate(baseline, p2_strategy="beat_target")
+    full = Simulation().run(
+        200, "greedy_max", "beat_target", seed_start=1, variant="three_dice", tiles=12
+    )
+    assert update["results"] == full
+    assert 0 < update["fraction_resimulated"] < 1
+
+
+def test_equivalent_strategy_replays_nothing():
+    STRATEGY_MAP["min_tiles_copy"] = STRATEGY_MAP["min_tiles"]
+    try:
+        baseline = record_baseline(200, "greedy_max", "min_tiles", seed_start=0)
+        update = resimulate(baseline, p2_strategy="min_tiles_copy")
+    finally:
+        del STRATEGY_MAP["min_tiles_copy"]
+    assert update["changed_game_ids"] == []
+    assert update["results"] == baseline["results"]
@@ -0,0 +1,84 @@
+import random
+
+import pandas as pd
+
+from stbsim import Game, Player
+from stbsim.event_store import EventStore
+from stbsim.loggers import InMemoryEventLogger
+
+
+def _logged_events(n_games: int) -> pd.DataFrame:
+    random.seed(7)
+    logger = InMemoryEventLogger()
+    for game_id in range(n_games):
+        g = Game([Player("P1"), Player("P2")], sim_id=3, game_id=game_id, logger=logger)
+        g.start_game()
+    return logger.to_df()
+
+
+def test_query_matches_pandas_filter(tmp_path, capsys):
+    df = _logged_events(30)
+    store = EventStore(tmp_path / "events", chunk_rows=8)
+    assert store.append(df) == len(df)
+
+    got = store.query(event_type="tiles_flipped", game_id=range(10, 20))
+    expected = df[(df["event_type"] == "tiles_flipped") & df["game_id"].between(10, 19)]
+    assert len(got) == len(expected)
+    assert sorted(got["game_id"]) == sorted(expected["game_id"])
+
+    got_p2 = store.query(event_type="turn_end", player_id="P2", game_id=[0, 29])
+    assert list(got_p2["game_id"]) == [0, 29]
+    assert set(got_p2["player_id"]) == {"P2"}
+
+
+def test_plan_prunes_chunks_and_manifest_persists(tmp_path, capsys):
+    df = _logged_events(30)
+    store = EventStore(tmp_path / "events", chunk_rows=8)
+    store.append(df)
+
+    all_flips = store.plan(event_type="tiles_flipped")
+    few = store.plan(event_type="tiles_flipped", game_id=5)
+    assert 0 < len(few) < len(all_flips)
+    assert all(c["game_id_min"] <= 5 <= c["game_id_max"] for c in few)
+    assert store.plan(sim_id=99) == []
+
+    reopened = EventStore(tmp_path / "events")
+    assert reopened.chunk_infos == store.chunk_infos
+    assert len(reopened.query()) == len(df)
+
+
+def test_missing_or_nan_filter_columns_never_match(tmp_path):
+    events = pd.DataFrame(
+        [
+            {"sim_id": 0, "event_type": "note", "game_id": 1, "player_id": "P1"},
+            {"sim_id": 0, "event_type": "note", "game_id": None, "player_id": None},
+            {"sim_id": 0, "event_type": "game_start"},
+        ]
+    )
+    store = EventStore(tmp_path / "events")
+    store.append(events)
+    assert [c["event_type"] for c in store.plan(player_id="P1")] == ["note"]
+    assert [c["event_type"] for c in store.plan(game_id=range(5))] == ["note"]
+    assert list(store.query(player_id="P1")["game_id"]) == [1]
+    assert list(store.query(game_id=range(5))["player_id"]) == ["P1"]
+    assert len(store.query()) == 3
+
+
+def test_chunks_round_trip_without_pickle(tmp_path, capsys):
+    df = _logged_events(5)
+    store = EventStore(tmp_path / "events", chunk_rows=16)
+    store.append(df)
+    assert not list((tmp_path / "events").rglob("*.pkl"))
+    for event_type in ("tiles_flipped", "game_end"):
+        expected = (
+            df[df["event_type"] == event_type]
+            .dropna(axis=1, how="all")
+            .sort_values("game_id", kind="stable")
+            .reset_index(drop=True)
+        )
+        pd.testing.assert_frame_equal(store.query(event_type=event_type), expected)
+    got = store.query(
+        event_type="tiles_flipped", player_id="P2", columns=["tiles_flipped"]
+    )
+    assert list(got.columns) == ["tiles_flipped"]
+    assert all(isinstance(combo, tuple) for combo in got["tiles_flipped"])
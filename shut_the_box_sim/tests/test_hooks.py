@@ -0,0 +1,59 @@
+import pytest
+
+from stbsim.game import Game
+from stbsim.hooks import HookRegistry
+from stbsim.loggers import InMemoryEventLogger
+from stbsim.player import Player
+from stbsim.simulation import Simulation
+
+
+def test_hooks_see_every_event_kind():
+    hooks = HookRegistry()
+    seen = dict.fromkeys(("game_start", "dice_roll", "move", "bust"), 0)
+    scores = []
+    hooks.subscribe("game_start", lambda game: seen.__setitem__("game_start", 1))
+    hooks.subscribe("dice_roll", lambda tm, roll: seen.__setitem__("dice_roll", 1))
+    hooks.subscribe(
+        "move", lambda tm, i, total, combo, rank: seen.__setitem__("move", 1)
+    )
+    hooks.subscribe("bust", lambda tm, i, total: seen.__setitem__("bust", 1))
+    hooks.subscribe("turn_end", lambda tm, score, shut: scores.append(score))
+    results = Simulation().run(20, "greedy_max", "min_tiles", seed_start=0, hooks=hooks)
+    assert all(seen.values())
+    assert scores[::2] == [r["p1_score"] for r in results]
+    assert scores[1::2] == [r["p2_score"] for r in results]
+
+
+def test_logger_via_hooks_matches_logger_argument():
+    direct = InMemoryEventLogger()
+    Simulation().run(10, "greedy_max", "min_tiles", seed_start=4, logger=direct)
+    hooks = HookRegistry()
+    subscribed = InMemoryEventLogger()
+    subscribed.subscribe(hooks)
+    turns = []
+    hooks.subscribe("turn_end", lambda tm, score, shut: turns.append(score))
+    Simulation().run(10, "greedy_max", "min_tiles", seed_start=4, hooks=hooks)
+    a = direct.to_df().drop(columns="timestamp")
+    b = subscribed.to_df().drop(columns="timestamp")
+    assert a.equals(b)
+    assert len(turns) == 20
+
+
+def test_dispatch_binding():
+    hooks = HookRegistry()
+    assert not hooks and hooks.dispatcher("move") is None
+    calls = []
+    first = hooks.subscribe("game_end", lambda game, winner: calls.append(1))
+    assert hooks.dispatcher("game_end") is first
+    game = Game([Player("P1"), Player("P2")], verbose=False, hooks=hooks)
+    hooks.subscribe("game_end", lambda game, winner: calls.append(2))
+    game.start_game()
+    assert calls == [1]  # Bound at construction
+    game.bind_hooks(hooks)
+    game.start_game()
+    assert calls == [1, 1, 2]
+    # A logger passed to Game goes to a copy of the registry.
+    Game([Player("P1")], logger=InMemoryEventLogger(), hooks=hooks)
+    assert hooks.subscribers("move") == ()
+    with pytest.raises(ValueError):
+        hooks.subscribe("nope", print)  # type: ignore[arg-type]
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from stbsim.board import mask_combos
+from stbsim.learning import load_policy, policy_moves, train_policy
+from stbsim.simulation import Simulation
+from stbsim.solver import MoveTable, roll_probs, solve_tables
+from stbsim.strategies import STRATEGY_MAP
+
+
+def _policy_expected_score(moves: np.ndarray, tiles: int) -> float:
+    """Exact expected final score of a fixed move table, by layers."""
+    table = MoveTable(tiles)
+    probs = roll_probs(table)
+    expected = np.zeros(1 << tiles)
+    for k in range(1, tiles + 1):
+        racks, _, _ = table.layer(k)
+        for mask in racks:
+            flips = moves[mask * 12 : mask * 12 + 12]
+            after = np.where(flips > 0, expected[mask ^ flips], table.tile_sum[mask])
+            expected[mask] = probs[mask] @ after
+    return float(expected[-1])
+
+
+def test_training_learns_a_near_optimal_policy():
+    policy, curve = train_policy(9, n_games=100_000, batch_size=10_000, seed=0)
+    assert len(curve) == 10 and curve[-1]["games"] == 100_000
+    assert curve[-1]["epsilon"] == 0.0
+    assert curve[-1]["mean_score"] < curve[0]["mean_score"]
+    optimum = solve_tables(9).expected[-1]
+    assert _policy_expected_score(policy.moves, 9) < optimum + 0.1
+    # Same seed, same policy.
+    again, _ = train_policy(9, n_games=100_000, batch_size=10_000, seed=0)
+    assert np.array_equal(policy.moves, again.moves)
+
+
+def test_move_table_only_holds_valid_moves():
+    table = MoveTable(6)
+    moves = policy_moves(table, np.random.default_rng(0).random(64))
+    for mask in range(64):
+        for roll in range(1, 13):
+            flip = int(moves[mask * 12 + roll - 1])
+            combo = tuple(n + 1 for n in range(6) if flip >> n & 1)
+            assert combo in mask_combos(mask, roll) or (
+                flip == 0 and not mask_combos(mask, roll)
+            )
+    with pytest.raises(ValueError):
+        train_policy(6, n_games=0)
+
+
+def test_training_follows_the_rule_variant():
+    policy, curve = train_policy(
+        9, n_games=2_000, batch_size=1_000, seed=0, variant="three_dice"
+    )
+    assert policy.max_roll == 18 and policy.moves.size == 18 << 9
+    # Three dice can total 13..18: the policy answers those rolls too.
+    assert policy.combo(0b111111111, 17) in mask_combos(0b111111111, 17)
+    assert curve[-1]["mean_score"] > 0
+    # Scores come from the variant too: "digits" racks are read as numbers.
+    _, digits = train_policy(9, n_games=1_000, seed=0, variant="digits")
+    assert digits[-1]["mean_score"] > 100
+
+
+def test_learned_strategy_plays_games():
+    assert "learned" in STRATEGY_MAP
+    policy = load_policy(9)
+    assert policy.combo(0b111111111, 8) in mask_combos(0b111111111, 8)
+    results = Simulation().run(200, "learned", "min_tiles", seed_start=0)
+    assert len(results) == 200
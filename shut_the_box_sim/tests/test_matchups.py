@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from stbsim.matchups import TurnPool, estimate_matchup, matchup_matrix
+from stbsim.simulation import Simulation
+from stbsim.stats import calculate_summary_stats
+
+
+@pytest.mark.parametrize(
+    "p1, p2, method",
+    [
+        ("greedy_max", "min_tiles", "u_statistic"),
+        ("min_tiles", "min_tiles", "u_statistic"),
+        ("min_tiles", "beat_target", "conditional"),
+    ],
+)
+def test_matchup_estimates_agree_with_full_games(p1, p2, method):
+    n_games = 10_000
+    simulated = calculate_summary_stats(Simulation().run(n_games, p1, p2, 0))
+    est = estimate_matchup(p1, p2, n_turns=50_000, seed=1)
+    assert est["method"] == method
+    assert est["p1_win"] + est["p2_win"] == pytest.approx(1.0)
+    assert 0 < est["tie"] < est["p1_win"]
+    game_se = np.sqrt(0.25 / n_games)
+    assert abs(est["p1_win"] - simulated["p1_win_rate"]) < 4 * np.hypot(
+        game_se, est["std_error"]
+    )
+
+
+def test_pool_turns_are_reused_across_matchups():
+    pool = TurnPool(5_000, seed=0)
+    first = pool.scores("min_tiles")
+    matrix = matchup_matrix(["greedy_max", "min_tiles"], pool)
+    assert pool.scores("min_tiles") is first
+    assert matrix.shape == (2, 2)
+    assert matrix.loc["greedy_max", "min_tiles"] == pytest.approx(
+        estimate_matchup("greedy_max", "min_tiles", pool)["p1_win"]
+    )
+    with pytest.raises(ValueError):
+        TurnPool(1)
@@ -0,0 +1,50 @@
+import io
+import json
+import threading
+
+from stbsim.progress import ProgressTracker, fan_out, json_lines_writer
+from stbsim.simulation import Simulation
+
+
+def test_run_reports_progress_per_batch():
+    reports = []
+    Simulation().run(
+        350,
+        "greedy_max",
+        "min_tiles",
+        seed_start=0,
+        progress=reports.append,
+        progress_every=100,
+    )
+    assert [r["games_completed"] for r in reports] == [100, 200, 300, 350]
+    assert [r["done"] for r in reports] == [False, False, False, True]
+    assert all(r["total_games"] == 350 for r in reports)
+    assert reports[0]["eta_seconds"] is not None and reports[0]["eta_seconds"] > 0
+    assert reports[-1]["eta_seconds"] == 0.0
+    assert all(r["moving_avg_games_per_sec"] > 0 for r in reports)
+
+
+def test_tracker_aggregates_concurrent_workers_and_streams_json():
+    stream = io.StringIO()
+    seen = []
+    tracker = ProgressTracker(
+        8 * 500, fan_out(seen.append, json_lines_writer(stream)), every=250
+    )
+
+    def worker():
+        for _ in range(50):
+            tracker.advance(10)
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    tracker.finish()
+    tracker.finish()
+
+    assert tracker.completed == 4000
+    assert seen[-1]["games_completed"] == 4000 and seen[-1]["done"]
+    assert sum(r["done"] for r in seen) == 1
+    lines = [json.loads(line) for line in stream.getvalue().splitlines()]
+    assert lines == seen
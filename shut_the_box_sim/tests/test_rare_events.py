@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from stbsim.rare_events import estimate_shut_box
+from stbsim.solver import MoveTable, roll_probs
+from stbsim.strategies import compile_moves
+
+
+def _exact_shut_probability(strategy: str) -> float:
+    """P(a turn shuts the box) under a fixed strategy, by layers."""
+    table = MoveTable(9)
+    probs = roll_probs(table)
+    moves = compile_moves(strategy)
+    p_shut = np.zeros(512)
+    p_shut[0] = 1.0
+    for k in range(1, 10):
+        racks, _, _ = table.layer(k)
+        for mask in racks:
+            flips = moves[mask * 12 : mask * 12 + 12]
+            p_shut[mask] = probs[mask] @ np.where(flips > 0, p_shut[mask ^ flips], 0)
+    return float(p_shut[511])
+
+
+@pytest.mark.parametrize("method", ["plain", "stratified", "importance"])
+def test_estimators_are_unbiased(method):
+    a = _exact_shut_probability("greedy_max")
+    b = _exact_shut_probability("min_tiles")
+    exact = 1 - (1 - a) * (1 - b)
+    est = estimate_shut_box(40_000, "greedy_max", "min_tiles", method, seed=3)
+    assert abs(est["estimate"] - exact) < 4 * est["std_error"]
+    assert est["ci_low"] < est["estimate"] < est["ci_high"]
+
+
+def test_importance_sampling_reduces_variance():
+    est = estimate_shut_box(20_000, "min_tiles", "beat_target", seed=0)
+    assert est["method"] == "importance"
+    assert est["variance_reduction"] > 4
+    assert est["equivalent_games"] == pytest.approx(
+        est["n_games"] * est["variance_reduction"]
+    )
+    with pytest.raises(ValueError):
+        estimate_shut_box(100, "min_tiles", "min_tiles", "nope")  # type: ignore[arg-type]
+
+
+def test_stratified_is_only_a_cross_check():
+    est = estimate_shut_box(20_000, "greedy_max", "beat_target", "stratified", seed=0)
+    # Opening rolls explain almost none of the variance (see the module docs).
+    assert est["variance_reduction"] < 1.5
@@ -0,0 +1,84 @@
+import random
+from collections import Counter
+
+import numpy as np
+import pytest
+
+from stbsim import Game, Player
+from stbsim.hooks import HookRegistry
+from stbsim.reweighting import (
+    DiceFaceCounts,
+    loaded_die,
+    record_dice,
+    reweight,
+    reweight_sweep,
+)
+from stbsim.simulation import Simulation
+from stbsim.stats import calculate_summary_stats
+
+
+class LoadedRandom(random.Random):
+    """random.Random whose randint draws die faces from ``probs``."""
+
+    def __init__(self, probs, seed):
+        super().__init__(seed)
+        self.cdf = np.cumsum(probs).tolist()
+
+    def randint(self, a, b):
+        u = self.random()
+        return a + next((i for i, c in enumerate(self.cdf) if u < c), b - a)
+
+
+def test_face_counts_cover_every_die_rolled():
+    counter = DiceFaceCounts(50)
+    rolled = Counter()
+    hooks = HookRegistry()
+    counter.subscribe(hooks)
+    hooks.subscribe(
+        "dice_roll",
+        lambda tm, values: rolled.update({tm.game_id: len(values)}),
+    )
+    Simulation().run(50, "greedy_max", "min_tiles", seed_start=0, hooks=hooks)
+    counts = counter.array()
+    assert counts.shape == (50, 6)
+    assert counts.sum(axis=1).tolist() == [rolled[g] for g in range(50)]
+
+
+def test_fair_dice_reproduce_the_recorded_summary():
+    record = record_dice(500, "greedy_max", "min_tiles", seed_start=1)
+    est = reweight(record, np.full(6, 1 / 6))
+    expected = calculate_summary_stats(record["results"])
+    assert est["summary"] == pytest.approx(expected)
+    assert est["ess"] == pytest.approx(500)
+
+
+def test_reweighting_matches_games_played_with_loaded_dice():
+    q = loaded_die(6, 0.3)
+    record = record_dice(20_000, "greedy_max", "min_tiles", seed_start=0)
+    est = reweight(record, q)
+    players = [Player("P1", "greedy_max"), Player("P2", "min_tiles")]
+    game = Game(players, verbose=False, rng=LoadedRandom(q, 0))
+    scores = []
+    for game_id in range(20_000):
+        game.reset(game_id)
+        game.start_game()
+        scores.append(players[0].score)
+    direct = np.mean(scores)
+    se = np.hypot(est["std_error"]["p1_avg_score"], np.std(scores) / np.sqrt(20_000))
+    assert abs(est["summary"]["p1_avg_score"] - direct) < 4 * se
+    assert 0.5 < est["ess_fraction"] < 1
+
+
+def test_sweep_and_validation():
+    record = record_dice(300, "greedy_max", "min_tiles", seed_start=0)
+    sweep = reweight_sweep(record, {"fair": np.full(6, 1 / 6), "six": loaded_die(6, 1)})
+    assert list(sweep.index) == ["fair", "six"]
+    assert sweep.loc["fair", "ess_fraction"] == pytest.approx(1.0)
+    assert sweep.loc["six", "ess"] < 300
+    assert loaded_die(1, 0.5).sum() == pytest.approx(1.0)
+    with pytest.raises(ValueError):
+        reweight(record, [0.5, 0.5])
+    with pytest.raises(ValueError):
+        reweight(record, [1.0, 0, 0, 0, 0, 0])  # no game rolled only ones
+    with pytest.raises(ValueError):
+        loaded_die(7, 0.1)
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from stbsim import Board, DiceManager, Game, Player
+from stbsim.core import TileRack
+from stbsim.rules import RULE_VARIANTS, STANDARD, RuleVariant, rule_variant
+from stbsim.simulation import Simulation
+from stbsim.strategies import STRATEGY_MAP, clear_strategy_caches, decide
+from stbsim.turn_engine import TurnEngine
+
+
+def test_standard_tables_match_the_default_rules():
+    rules = STANDARD.compile(9)
+    board = Board(9)
+    for mask in (0b111111111, 0b000111111, 0b100000000, 0):
+        board.up_mask = mask
+        assert rules.scores[mask] == board.calculate_remaining_sum()
+        assert rules.dice_counts[mask] == (2 if mask >> 6 else 1)
+    assert STANDARD.compile(9) is rules
+
+
+def test_variant_scores_and_dice_counts():
+    rack = 0b1001001  # tiles 1, 4 and 7 up
+    assert RULE_VARIANTS["digits"].compile(9).scores[rack] == 147
+    assert RULE_VARIANTS["down_and_out"].compile(9).scores[rack] == 45
+    assert RULE_VARIANTS["down_and_out"].compile(9).scores[0] == 0
+    one_die = RULE_VARIANTS["one_die_6"].compile(9).dice_counts
+    assert one_die[0b111] == 1 and one_die[0b1000001] == 2
+    assert TileRack({1, 4, 7}).score("digits") == 147
+
+
+def test_tiles_above_nine_keep_every_die_rolling():
+    # Only tile 10 up on a 12-tile board: one die could never reach it.
+    rack = 1 << 9
+    assert STANDARD.compile(12).dice_counts[rack] == 2
+    assert RULE_VARIANTS["three_dice"].compile(12).dice_counts[rack] == 3
+    assert STANDARD.compile(12).dice_counts[0b111111] == 1
+
+
+def test_unknown_variants_are_rejected():
+    with pytest.raises(ValueError):
+        rule_variant("no_such_rules")
+    with pytest.raises(ValueError):
+        RuleVariant("bad", rounds=0)
+
+
+def test_dice_manager_rolls_the_compiled_dice_count():
+    board = Board(9)
+    mgr = DiceManager(dice_counts=RULE_VARIANTS["one_die_6"].compile(9).dice_counts)
+    board.flip_tiles([4, 5, 6, 7, 8, 9])
+    assert len(mgr.roll(board)) == 1
+
+
+def test_standard_variant_reproduces_the_default_run():
+    sim = Simulation()
+    default = sim.run(200, "greedy_max", "beat_target", seed_start=3)
+    assert sim.run(200, "greedy_max", "beat_target", 3, variant="standard") == default
+
+
+def test_match_scores_total_every_round():
+    players = [Player("P1", "greedy_max"), Player("P2", "min_tiles")]
+    game = Game(players, variation="match_3", verbose=False)
+    scores = []
+    game.turn_manager.hooks.subscribe(
+        "turn_end", lambda tm, score, shut: scores.append(score)
+    )
+    game.bind_hooks(game.turn_manager.hooks)
+    game.start_game()
+    assert len(scores) == 6
+    assert [p.score for p in players] == [sum(scores[0::2]), sum(scores[1::2])]
+    assert game.shut_box == (0 in scores)
+
+
+def test_turn_engine_uses_variant_scores():
+    rules = RULE_VARIANTS["down_and_out"].compile(9)
+    scores, _ = TurnEngine(9, rules).play(
+        "min_tiles", None, np.random.default_rng(0), 2_000
+    )
+    assert set(np.unique(scores)) <= {0, 45}
+
+
+def test_rule_aware_strategies_plan_under_the_game_variant():
+    digits = RULE_VARIANTS["digits"].compile(9)
+    # Rolling 3 with 1, 2 and 3 up: flip 3 when scoring sums, leave 3 (not 12)
+    # when scoring digits.
+    assert decide("beat_target", 0b111, 3) == 0
+    assert decide("beat_target", 0b111, 3, None, digits) == 1
+    results = Simulation().run(
+        50, "learned", "beat_target", seed_start=0, variant="three_dice", tiles=12
+    )
+    assert len(results) == 50
+
+
+def test_runs_reject_unsupported_setups_up_front():
+    STRATEGY_MAP["two_dice_only"] = lambda roll, tiles_up: (
+        STRATEGY_MAP["min_tiles"](roll, tiles_up) if roll <= 12 else ()
+    )
+    sim = Simulation()
+    try:
+        with pytest.raises(ValueError, match="cannot play rule variant 'three_dice'"):
+            sim.run(10, "two_dice_only", "min_tiles", variant="three_dice", tiles=12)
+        with pytest.raises(ValueError, match="cannot play"):
+            sim.submit(10, "min_tiles", "two_dice_only", variant="three_dice")
+        assert len(sim.run(10, "two_dice_only", "min_tiles", tiles=12)) == 10
+    finally:
+        del STRATEGY_MAP["two_dice_only"]
+        clear_strategy_caches("two_dice_only")
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from stbsim.board import mask_combos
+from stbsim.search import (
+    register_weighted_strategy,
+    sample_weights,
+    successive_halving,
+    weighted_moves,
+)
+from stbsim.simulation import Simulation
+from stbsim.strategies import decide
+from stbsim.turn_engine import TurnEngine
+
+
+def test_weighted_moves_are_valid_best_moves():
+    weights = (0.3, -0.7, 0.5)
+    moves = weighted_moves(weights)
+    for mask in range(1, 1 << 9):
+        for roll in range(1, 13):
+            combos = mask_combos(mask, roll)
+            flip = int(moves[mask * 12 + roll - 1])
+            if not combos:
+                assert flip == 0
+                continue
+            chosen = tuple(n + 1 for n in range(9) if flip >> n & 1)
+            assert chosen in combos
+
+            def score(combo, mask=mask):
+                rest = mask & ~sum(1 << (t - 1) for t in combo)
+                high = sum(t for t in (7, 8, 9) if rest >> (t - 1) & 1)
+                return np.dot(weights, (len(combo), max(combo), high))
+
+            assert score(chosen) == pytest.approx(max(map(score, combos)))
+
+
+def test_registered_weighted_strategy_plays_in_games():
+    name = register_weighted_strategy((-1.0, 0.0, 0.0))
+    assert register_weighted_strategy((-1.0, 0.0, 0.0)) == name
+    assert mask_combos(0b111111111, 9)[decide(name, 0b111111111, 9)] == (9,)
+    results = Simulation().run(200, name, "min_tiles", seed_start=0)
+    assert len(results) == 200
+
+
+def test_weighted_names_are_exact():
+    assert register_weighted_strategy((0.1234, 0.0, 0.0)) != register_weighted_strategy(
+        (0.12341, 0.0, 0.0)
+    )
+
+
+def test_paired_candidates_share_dice():
+    engine = TurnEngine(9)
+    a = register_weighted_strategy((-1.0, 0.0, 0.0))
+    b = register_weighted_strategy((-1.0, 0.1, 0.0))
+    x, _ = engine.play(a, None, np.random.default_rng(0), 20_000)
+    y, _ = engine.play(b, None, np.random.default_rng(0), 20_000)
+    # Turns only drift apart once the racks differ, whatever the batch does.
+    assert (x == y).mean() > 0.4
+
+
+def test_successive_halving_keeps_the_best():
+    names = [register_weighted_strategy(w) for w in sample_weights(16, seed=0)]
+    rounds = []
+    results = successive_halving(
+        names,
+        budget=40_000,
+        keep=2,
+        seed=1,
+        callback=lambda r, standings: rounds.append(standings["survivor"].sum()),
+    )
+    assert rounds == [8, 4, 2]
+    survivors = results[results["survivor"]]
+    assert len(survivors) == 2
+    assert survivors["games"].min() > results[~results["survivor"]]["games"].min()
+    assert (results["ci_low"] <= results["win_rate"]).all()
+    assert (results["win_rate"] <= results["ci_high"]).all()
+    assert results.iloc[0]["win_rate"] > results.iloc[-1]["win_rate"]
+    again = successive_halving(names, budget=40_000, keep=2, seed=1, workers=2)
+    assert again.equals(results)
+    with pytest.raises(ValueError):
+        successive_halving([names[0], names[0]])
@@ -0,0 +1,135 @@
+import asyncio
+import gc
+import threading
+
+from stbsim.hooks import HookRegistry
+from stbsim.loggers import InMemoryEventLogger
+from stbsim.simulation import Simulation, default_workers
+from stbsim.telemetry import StateTelemetry
+
+
+def test_run_is_reproducible_and_silent(capsys):
+    sim = Simulation()
+    a = sim.run(50, "greedy_max", "min_tiles", seed_start=5)
+    b = sim.run(50, "greedy_max", "min_tiles", seed_start=5)
+    assert a == b
+    assert [g["game_id"] for g in a] == list(range(50))
+    assert capsys.readouterr().out == ""
+
+
+def test_run_collects_events_into_one_logger():
+    logger = InMemoryEventLogger()
+    Simulation().run(5, "greedy_max", "min_tiles", seed_start=1, logger=logger)
+    df = logger.to_df()
+    assert sorted(df.loc[df["event_type"] == "game_end", "game_id"]) == list(range(5))
+
+
+def test_game_loop_keeps_gc_tracked_allocations_near_zero():
+    sim = Simulation()
+    sim.run(500, "greedy_max", "min_tiles", seed_start=0)  # warm move caches
+    n_games = 2000
+    gc.collect()
+    gc.disable()
+    try:
+        before = gc.get_count()[0]
+        results = sim.run(n_games, "greedy_max", "min_tiles", seed_start=0)
+        allocated = gc.get_count()[0] - before
+    finally:
+        gc.enable()
+    assert len(results) == n_games
+    # Net GC-tracked objects per game: essentially just the result row.
+    assert allocated / n_games < 4
+
+
+def test_run_plays_each_players_strategy_on_a_fresh_rack():
+    sim = Simulation()
+    same = sim.run(200, "min_tiles", "min_tiles", seed_start=0)
+    greedy = sim.run(200, "greedy_max", "min_tiles", seed_start=0)
+    # P1 always moves first from a full rack, so only its strategy matters to it.
+    assert [g["p1_score"] for g in same] != [g["p1_score"] for g in greedy]
+    # P2 gets its own full rack rather than P1's leftovers.
+    assert sum(g["p2_score"] for g in same) / 200 > 10
+
+
+def test_worker_threads_reproduce_the_serial_run():
+    sim = Simulation()
+    serial_log, threaded_log = InMemoryEventLogger(), InMemoryEventLogger()
+    serial_tel, threaded_tel = StateTelemetry(), StateTelemetry()
+    serial = sim.run(300, "greedy_max", "beat_target", 7, serial_log, serial_tel)
+    reports = []
+    threaded = sim.run(
+        300,
+        "greedy_max",
+        "beat_target",
+        7,
+        threaded_log,
+        threaded_tel,
+        progress=reports.append,
+        progress_every=50,
+        workers=4,
+    )
+    assert threaded == serial
+    assert (
+        serial_log.to_df()
+        .drop(columns="timestamp")
+        .equals(threaded_log.to_df().drop(columns="timestamp"))
+    )
+    assert serial_tel.to_df().equals(threaded_tel.to_df())
+    assert reports[-1]["done"] and reports[-1]["games_completed"] == 300
+    assert default_workers() >= 1
+
+
+def test_run_plays_larger_boards():
+    hooks = HookRegistry()
+    sizes = set()
+    hooks.subscribe("turn_end", lambda tm, score, shut: sizes.add(len(tm.board.tiles)))
+    results = Simulation().run(
+        20, "greedy_max", "beat_target", seed_start=0, hooks=hooks, tiles=10
+    )
+    assert sizes == {10}
+    assert all(0 <= r["p1_score"] <= 55 and 0 <= r["p2_score"] <= 55 for r in results)
+
+
+def test_submit_publishes_batches_and_matches_run():
+    sim = Simulation()
+    expected = sim.run(2_500, "greedy_max", "min_tiles", seed_start=3)
+    handle = sim.submit(
+        2_500, "greedy_max", "min_tiles", seed_start=3, batch_size=1_000, workers=2
+    )
+    assert [len(batch) for batch in handle.iter_batches()] == [1_000, 1_000, 500]
+    assert handle.result(timeout=30) == expected
+    assert handle.partial_results() == expected
+    assert handle.report is not None and handle.report["done"]
+    summary = handle.partial_summary(confidence=0.95)
+    assert summary["total_games"] == 2_500
+    lo, hi = summary["p1_win_rate_ci"]
+    assert lo < summary["p1_win_rate"] < hi
+
+    async def consume():
+        handle = sim.submit(2_000, "greedy_max", "min_tiles", 3, batch_size=500)
+        batches = [batch async for batch in handle.abatches()]
+        return batches, await handle
+
+    batches, results = asyncio.run(consume())
+    assert len(batches) == 4
+    assert results == expected[:2_000]
+
+
+def test_submit_stops_and_cancels_between_batches():
+    sim = Simulation()
+    release = threading.Event()
+    hooks = HookRegistry()
+    hooks.subscribe("game_end", lambda game, winner: release.wait())
+    handle = sim.submit(100_000, "greedy_max", "min_tiles", batch_size=10, hooks=hooks)
+    handle.stop()
+    release.set()
+    results = handle.result(timeout=30)
+    assert len(results) == handle.games_completed <= 10
+    assert not handle.cancelled()
+
+    release.clear()
+    handle = sim.submit(100_000, "greedy_max", "min_tiles", batch_size=10, hooks=hooks)
+    assert handle.cancel() and handle.cancelled()
+    release.set()
+    batches = list(handle.iter_batches())
+    assert sum(map(len, batches)) == handle.games_completed <= 10
@@ -0,0 +1,133 @@
+from functools import cache
+
+import numpy as np
+import pytest
+
+from stbsim.board import mask_combos, mask_numbers
+from stbsim.rules import RULE_VARIANTS, RuleVariant
+from stbsim.solver import (
+    dice_total_probs,
+    roll_probs,
+    shared_move_table,
+    solve,
+    solve_tables,
+)
+from stbsim.strategies import beat_target_strategy, decide
+
+ONE, TWO, THREE = dice_total_probs(1), dice_total_probs(2), dice_total_probs(3)
+
+
+def _probs(mask: int) -> np.ndarray:
+    return TWO if mask & (0b111 << 6) else ONE
+
+
+def _after(mask: int, combo: tuple[int, ...]) -> int:
+    return mask & ~sum(1 << (t - 1) for t in combo)
+
+
+@cache
+def _p_at_most(mask: int, target: int) -> float:
+    """Reference recursion: best P(final score <= target) from mask."""
+    if mask == 0:
+        return 1.0 if target >= 0 else 0.0
+    total = 0.0
+    for roll, p in enumerate(_probs(mask)):
+        combos = mask_combos(mask, roll)
+        if p == 0:
+            continue
+        if not combos:
+            total += p * (sum(mask_numbers(mask)) <= target)
+        else:
+            total += p * max(_p_at_most(_after(mask, c), target) for c in combos)
+    return total
+
+
+@cache
+def _expected(mask: int) -> float:
+    if mask == 0:
+        return 0.0
+    total = 0.0
+    for roll, p in enumerate(_probs(mask)):
+        combos = mask_combos(mask, roll)
+        if p == 0:
+            continue
+        if not combos:
+            total += p * sum(mask_numbers(mask))
+        else:
+            total += p * min(_expected(_after(mask, c)) for c in combos)
+    return total
+
+
+@pytest.mark.parametrize("tiles", [6, 9])
+def test_layered_solver_matches_recursion(tiles):
+    tables = solve_tables(tiles)
+    for mask in range(1 << tiles):
+        assert tables.expected[mask] == pytest.approx(_expected(mask))
+        for target in (0, 3, 10, 20):
+            assert tables.win_probability(mask, target) == pytest.approx(
+                _p_at_most(mask, target)
+            )
+
+
+def test_chunked_threaded_float32_solve_matches_float64():
+    exact = solve_tables(9, dtype=np.float64)
+    chunked = solve_tables(9, workers=3, chunk_size=64)
+    assert chunked.expected.dtype == np.float32
+    assert np.allclose(chunked.expected, exact.expected, rtol=1e-5)
+    assert np.allclose(chunked.p_at_most, exact.p_at_most, atol=1e-5)
+
+
+def test_three_dice_variant_matches_recursion():
+    tables = solve_tables(9, "three_dice", dtype=np.float64)
+    probs = roll_probs(shared_move_table(9, 18), RULE_VARIANTS["three_dice"].compile(9))
+    assert np.allclose(probs.sum(axis=1), 1.0)
+    expected = {0: 0.0}
+    for mask in range(1, 1 << 9):  # every successor is a smaller mask
+        dist = THREE if mask & (0b111 << 6) else ONE
+        total = 0.0
+        for roll, p in enumerate(dist):
+            combos = mask_combos(mask, roll)
+            if p and not combos:
+                total += p * sum(mask_numbers(mask))
+            elif p:
+                total += p * min(expected[_after(mask, c)] for c in combos)
+        expected[mask] = total
+        assert tables.expected[mask] == pytest.approx(total)
+
+
+def test_variant_scoring_sets_the_score_levels():
+    tables = solve_tables(9, "down_and_out", dtype=np.float64)
+    assert tables.levels.tolist() == [0, 45]
+    standard = solve_tables(9, dtype=np.float64)
+    # P(score <= 0) is the probability of shutting the box under both scorings.
+    assert np.allclose(tables.p_at_most[0], standard.p_at_most[0])
+    assert tables.win_probability(0b111, 44) == tables.win_probability(0b111, 0)
+
+
+def test_custom_variants_do_not_share_built_in_tables(tmp_path, monkeypatch):
+    monkeypatch.setenv("STBSIM_CACHE_DIR", str(tmp_path))
+    custom = RuleVariant("standard", dice=3)
+    assert RULE_VARIANTS["standard"].cache_key == "standard"
+    assert custom.cache_key != "standard"
+    standard, three = solve(9, "standard"), solve(9, custom)
+    assert three.expected[-1] != pytest.approx(standard.expected[-1])
+    expected = solve_tables(9, custom).expected
+    assert np.allclose(three.expected, expected)
+
+
+def test_beat_target_maximizes_win_probability():
+    tables = solve(9)
+    tiles_up = set(range(1, 10))
+    for opponent_score in (1, 5, 12, 30):
+        combo = beat_target_strategy(8, tiles_up, opponent_score)
+        best = max(
+            tables.win_probability(_after(0b111111111, c), opponent_score - 1)
+            for c in mask_combos(0b111111111, 8)
+        )
+        chosen = tables.win_probability(_after(0b111111111, combo), opponent_score - 1)
+        assert chosen == best
+    assert beat_target_strategy(8, {1, 2}, 3) == ()
+    # Decisions depend on the target, and are cached per target.
+    assert decide("beat_target", 0b111111111, 8, 1) == decide(
+        "beat_target", 0b111111111, 8, 1
+    )
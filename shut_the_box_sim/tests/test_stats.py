@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from stbsim import stats
+from stbsim.simulation import Simulation
+from stbsim.stats import (
+    bootstrap_mean,
+    calculate_summary_stats,
+    checkpoint_sizes,
+    compare_strategies,
+    convergence_curve,
+    mcnemar_test,
+    mean_ci,
+    paired_difference_test,
+    proportion_ci,
+    summary_with_ci,
+)
+
+
+def test_summary_stats_accepts_dicts_or_dataframe():
+    results = Simulation().run(200, "greedy_max", "min_tiles", seed_start=0)
+    assert calculate_summary_stats(results) == calculate_summary_stats(
+        pd.DataFrame(results)
+    )
+    assert calculate_summary_stats([]) == {}
+    summary = summary_with_ci(results, method="clopper_pearson")
+    for key in ("p1_win_rate", "p2_win_rate", "shut_box_frequency", "p1_avg_score"):
+        lo, hi = summary[f"{key}_ci"]
+        assert lo <= summary[key] <= hi
+    assert summary_with_ci([]) == {}
+
+
+def test_summary_with_ci_converts_results_once(monkeypatch):
+    results = Simulation().run(50, "greedy_max", "min_tiles", seed_start=0)
+    calls = []
+    convert = stats.results_to_arrays
+    monkeypatch.setattr(
+        stats, "results_to_arrays", lambda r: calls.append(1) or convert(r)
+    )
+    summary = summary_with_ci(results)
+    assert len(calls) == 1
+    assert {k: summary[k] for k in calculate_summary_stats(results)} == (
+        calculate_summary_stats(results)
+    )
+
+
+def test_proportion_intervals_are_vectorized_and_correct():
+    lo, hi = proportion_ci(50, 100)
+    assert lo == pytest.approx(0.4038, abs=1e-4)
+    assert hi == pytest.approx(0.5962, abs=1e-4)
+    lo, hi = proportion_ci([0, 5, 10], [10, 10, 10], method="clopper_pearson")
+    assert lo[0] == 0.0 and hi[2] == 1.0
+    assert hi[0] == pytest.approx(1 - 0.025 ** (1 / 10))
+    assert np.isnan(proportion_ci(0, 0)[0])
+    with pytest.raises(ValueError):
+        proportion_ci(1, 2, method="nope")
+
+
+def test_bootstrap_mean_matches_t_interval():
+    values = np.random.default_rng(0).integers(0, 46, 100_000)
+    mean, lo, hi = bootstrap_mean(values, n_resamples=4000, seed=1)
+    _, t_lo, t_hi = mean_ci(values)
+    assert lo < mean < hi
+    assert lo == pytest.approx(t_lo, abs=0.01)
+    assert hi == pytest.approx(t_hi, abs=0.01)
+    assert bootstrap_mean(values, 100, seed=3) == bootstrap_mean(values, 100, seed=3)
+
+
+def test_paired_tests():
+    a = np.array([3, 5, 7, 9, 11])
+    res = paired_difference_test(a, a - 1)
+    assert res["mean_diff"] == 1 and res["p_value"] == 0.0
+    assert paired_difference_test(a, a)["p_value"] == 1.0
+    mc = mcnemar_test([1, 1, 1, 0, 0], [0, 0, 0, 0, 1])
+    assert (mc["a_only"], mc["b_only"]) == (3, 1)
+    assert mc["rate_diff"] == pytest.approx(0.4)
+
+
+def test_compare_strategies_on_shared_seeds():
+    base = Simulation().run(300, "greedy_max", "min_tiles", seed_start=0)
+    same = compare_strategies(base, base)
+    assert same["score"]["mean_diff"] == 0 and same["win"]["p_value"] == 1.0
+    other = Simulation().run(300, "greedy_max", "beat_target", seed_start=0)
+    diff = compare_strategies(other, base)
+    assert diff["score"]["n"] == 300
+    with pytest.raises(ValueError):
+        compare_strategies(base, base[:10])
+
+
+def test_convergence_curve_matches_separate_runs():
+    sim = Simulation()
+    full = sim.run(500, "greedy_max", "min_tiles", seed_start=777)
+    curve = convergence_curve(full, sizes=[50, 100, 500])
+    for _, row in curve.iterrows():
+        n = int(row["n_games"])
+        separate = summary_with_ci(sim.run(n, "greedy_max", "min_tiles", 777))
+        for key in ("p1_win_rate", "shut_box_frequency", "p2_avg_score"):
+            assert row[key] == pytest.approx(separate[key])
+            assert row[f"{key}_ci_low"] == pytest.approx(separate[f"{key}_ci"][0])
+            assert row[f"{key}_ci_high"] == pytest.approx(separate[f"{key}_ci"][1])
+
+
+def test_checkpoint_sizes():
+    assert checkpoint_sizes(10, stride=3).tolist() == [3, 6, 9, 10]
+    log_sizes = checkpoint_sizes(10_000, points_per_decade=2)
+    assert log_sizes.tolist() == [1, 3, 10, 32, 100, 316, 1000, 3162, 10000]
+    assert len(convergence_curve([], stride=5)) == 0
+    with pytest.raises(ValueError):
+        checkpoint_sizes(10, stride=0)
@@ -0,0 +1,77 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from stbsim.loggers import InMemoryEventLogger
+from stbsim.simulation import Simulation
+from stbsim.telemetry import COUNT_MAX, StateTelemetry
+
+
+def test_telemetry_matches_event_log():
+    telemetry = StateTelemetry()
+    logger = InMemoryEventLogger()
+    Simulation().run(
+        40, "greedy_max", "min_tiles", seed_start=3, logger=logger, telemetry=telemetry
+    )
+    events = logger.to_df()
+    df = telemetry.to_df()
+
+    n_moves = events["event_type"].isin(["tiles_flipped", "no_valid_moves"]).sum()
+    assert df["count"].sum() == n_moves
+    assert (
+        df.loc[df["bust"], "count"].sum()
+        == (events["event_type"] == "no_valid_moves").sum()
+    )
+    flips = df[~df["bust"]]
+    assert all(
+        sum(m) == r for m, r in zip(flips["move"], flips["roll_total"], strict=False)
+    )
+    assert all(
+        set(m) <= set(t) for m, t in zip(flips["move"], flips["tiles_up"], strict=False)
+    )
+
+
+def test_telemetry_shards_merge_to_single_run():
+    whole = StateTelemetry()
+    Simulation().run(30, "greedy_max", "min_tiles", seed_start=0, telemetry=whole)
+    shards = []
+    for start in (0, 10, 20):
+        shard = StateTelemetry()
+        Simulation().run(
+            10, "greedy_max", "min_tiles", seed_start=start, telemetry=shard
+        )
+        shards.append(pickle.loads(pickle.dumps(shard)))
+    merged = StateTelemetry.combine(shards)
+    assert merged.strategies == whole.strategies
+    for strategy in whole.strategies:
+        assert (merged.counts(strategy) == whole.counts(strategy)).all()
+
+
+def test_telemetry_rejects_boards_it_cannot_index():
+    telemetry = StateTelemetry()
+    assert telemetry.counts("greedy_max").dtype == np.uint32
+    with pytest.raises(ValueError, match="max_roll=18"):
+        Simulation().run(
+            1, "greedy_max", "min_tiles", variant="three_dice", telemetry=telemetry
+        )
+    with pytest.raises(ValueError, match="tiles=12"):
+        Simulation().run(1, "greedy_max", "min_tiles", tiles=12, telemetry=telemetry)
+    wide = StateTelemetry(tiles=9, max_roll=18)
+    Simulation().run(
+        5, "greedy_max", "min_tiles", variant="three_dice", seed_start=0, telemetry=wide
+    )
+    assert wide.to_df()["roll_total"].max() > 0
+
+
+def test_counters_saturate():
+    telemetry = StateTelemetry()
+    slot = telemetry.bases[0b111111111 * telemetry.stride + 9] + 1
+    telemetry.counts("greedy_max")[slot] = COUNT_MAX - 1
+    telemetry.record("greedy_max", 0b111111111, 9, 0)
+    telemetry.record("greedy_max", 0b111111111, 9, 0)
+    assert telemetry.counts("greedy_max")[slot] == COUNT_MAX
+    telemetry.merge(telemetry)
+    assert telemetry.counts("greedy_max")[slot] == COUNT_MAX
+    row = telemetry.to_df().iloc[0]
+    assert (row["state"], row["roll_total"], row["move"]) == (0b111111111, 9, (9,))
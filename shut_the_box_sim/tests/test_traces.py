@@ -0,0 +1,111 @@
+import pandas as pd
+import pytest
+
+from stbsim.hooks import HookRegistry
+from stbsim.loggers import InMemoryEventLogger
+from stbsim.rules import RuleVariant
+from stbsim.simulation import Simulation
+from stbsim.traces import TraceWriter, decode_events, read_header, read_traces
+
+
+def _traced_run(path, n_games, seed_start, logger=None, workers=1, **kwargs):
+    hooks = HookRegistry()
+    with TraceWriter(path, **kwargs) as writer:
+        writer.subscribe(hooks)
+        results = Simulation().run(
+            n_games,
+            "greedy_max",
+            "beat_target",
+            seed_start,
+            logger=logger,
+            hooks=hooks,
+            workers=workers,
+            **kwargs,
+        )
+    return results, writer
+
+
+@pytest.mark.parametrize(
+    "kwargs", [{}, {"variant": "match_3"}, {"variant": "three_dice", "tiles": 12}]
+)
+def test_decoded_events_match_logged_events(tmp_path, kwargs):
+    path = tmp_path / "run.stbt"
+    logger = InMemoryEventLogger()
+    results, writer = _traced_run(path, 200, 0, logger=logger, **kwargs)
+    assert writer.games_written == 200
+    assert path.stat().st_size < 40 * 200
+    live = logger.to_df().drop(columns="timestamp")
+    decoded = decode_events(path).to_df().drop(columns="timestamp")
+    pd.testing.assert_frame_equal(decoded, live)
+    for game, result in zip(read_traces(path), results, strict=True):
+        assert game["game_id"] == result["game_id"]
+        assert any(t["shut_box"] for t in game["turns"]) == result["shut_box"]
+
+
+def test_runs_append_to_a_trace_file(tmp_path):
+    path = tmp_path / "run.stbt"
+    _traced_run(path, 50, 0)
+    header = read_header(path)
+    _traced_run(path, 50, 0, workers=2)
+    assert read_header(path) == header
+    games = list(read_traces(path))
+    assert sorted(g["game_id"] for g in games[50:]) == list(range(50))
+    first = {g["game_id"]: g for g in games[:50]}
+    assert all(first[g["game_id"]] == g for g in games[50:])
+    with pytest.raises(ValueError):
+        TraceWriter(path, variant="digits")
+
+
+def test_writer_takes_the_rules_from_the_games(tmp_path):
+    path = tmp_path / "run.stbt"
+    logger = InMemoryEventLogger()
+    hooks = HookRegistry()
+    with TraceWriter(path) as writer:
+        writer.subscribe(hooks)
+        Simulation().run(
+            50,
+            "greedy_max",
+            "min_tiles",
+            0,
+            logger=logger,
+            hooks=hooks,
+            variant="one_die_6",
+        )
+    assert read_header(path)["variant"] == "one_die_6"
+    live = logger.to_df().drop(columns="timestamp")
+    decoded = decode_events(path).to_df().drop(columns="timestamp")
+    pd.testing.assert_frame_equal(decoded, live)
+    # Appending a standard-rules run to the one_die_6 trace.
+    hooks = HookRegistry()
+    with TraceWriter(path) as writer, pytest.raises(ValueError, match="holds games"):
+        writer.subscribe(hooks)
+        Simulation().run(1, "greedy_max", "min_tiles", 0, hooks=hooks)
+    hooks = HookRegistry()
+    with TraceWriter(tmp_path / "other.stbt", tiles=12) as writer:
+        writer.subscribe(hooks)
+        with pytest.raises(ValueError, match="cannot record"):
+            Simulation().run(1, "greedy_max", "min_tiles", 0, hooks=hooks)
+
+
+def test_every_game_is_checked_against_the_header(tmp_path):
+    hooks = HookRegistry()
+    with TraceWriter(tmp_path / "run.stbt") as writer:
+        writer.subscribe(hooks)
+        Simulation().run(5, "greedy_max", "min_tiles", 0, hooks=hooks)
+        with pytest.raises(ValueError, match="holds games between"):
+            Simulation().run(5, "greedy_max", "beat_target", 0, hooks=hooks)
+        assert writer.games_written == 5
+
+
+def test_custom_rules_decode_from_the_header(tmp_path):
+    path = tmp_path / "run.stbt"
+    custom = RuleVariant("house", dice=3, one_die_at=4, down_and_out=True, rounds=2)
+    logger = InMemoryEventLogger()
+    _traced_run(path, 100, 0, logger=logger, variant=custom)
+    assert read_header(path)["rules"]["one_die_at"] == 4
+    live = logger.to_df().drop(columns="timestamp")
+    decoded = decode_events(path).to_df().drop(columns="timestamp")
+    pd.testing.assert_frame_equal(decoded, live)
+    # Same name, other rules: not the trace's variant.
+    with pytest.raises(ValueError):
+        TraceWriter(path, variant=RuleVariant("house"))